@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: extracting a zip of many small files.
+
+Compares the per-member ``mkdir(parents=True)`` + default-buffer loop that
+``safe_extract`` used to run with the shared engine in ``client.extract``.
+
+Usage:
+    python benchmarks/bench_extract.py [--files 5000] [--dirs 200] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from client.extract import extract_zip  # noqa: E402
+
+
+def naive_extract(zip_path: Path, dest_dir: Path) -> None:
+    """The previous implementation, kept here as the baseline."""
+    with zipfile.ZipFile(zip_path) as zf:
+        for member in zf.infolist():
+            member_path = Path(member.filename)
+            if member_path.is_absolute() or ".." in member_path.parts:
+                continue
+            out_path = dest_dir / member.filename
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            with zf.open(member) as src, open(out_path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+
+
+def build(path: Path, files: int, dirs: int) -> None:
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i in range(files):
+            zf.writestr(f"skill/node_modules/pkg{i % dirs}/lib/f{i}.js", f"module.exports={i};\n")
+
+
+def bench(fn, archive: Path, root: Path, repeat: int) -> float:
+    best = float("inf")
+    for i in range(repeat):
+        dest = root / f"{fn.__name__}-{i}"
+        start = time.perf_counter()
+        fn(archive, dest)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--dirs", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        archive = root / "many.zip"
+        build(archive, args.files, args.dirs)
+        old = bench(naive_extract, archive, root, args.repeat)
+        new = bench(extract_zip, archive, root, args.repeat)
+    print(f"{args.files} files in {args.dirs} dirs")
+    print(f"  naive loop:   {old * 1000:8.1f} ms")
+    print(f"  extract_zip:  {new * 1000:8.1f} ms  ({old / new:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Benchmark SkillHubClient.get_skill latency as the registry grows.
+
+Each lookup uses a fresh client, the way a single ``skillhub info`` invocation
+would, so the number reflects cold in-process cost.
+
+Usage:
+    python benchmarks/bench_get_skill.py [--sizes 10 100 1000 10000] [--repeat 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from client.client import SkillHubClient  # noqa: E402
+
+
+def make_registry(root: Path, n: int) -> None:
+    for i in range(n):
+        d = root / f"skill-{i:05d}"
+        d.mkdir()
+        (d / "SKILL.md").write_text(
+            f"---\nname: skill-{i:05d}\nversion: \"1.0.0\"\ndescription: bench\n"
+            f"author: bench\nentrypoint: run.py\ntags: [bench]\n---\n\nbody\n",
+            encoding="utf-8",
+        )
+
+
+def bench(n: int, repeat: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_registry(root, n)
+        SkillHubClient(root).list_skills()  # warm the metadata cache
+        target = f"skill-{n // 2:05d}"
+        start = time.perf_counter()
+        for _ in range(repeat):
+            assert SkillHubClient(root).get_skill(target) is not None
+        return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'skills':>8}  {'get_skill (ms)':>14}")
+    for n in args.sizes:
+        print(f"{n:>8}  {bench(n, args.repeat) * 1000:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
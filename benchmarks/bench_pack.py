@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Compare pack time, artifact size and extract time across compression modes.
+
+Runs over the real skills in skills/ (or --skills-dir) and prints one row per
+skill and mode. zstd rows are skipped when the optional zstandard package is
+not installed.
+
+Usage:
+    python benchmarks/bench_pack.py [--repeat 5] [--modes auto stored deflate:1 deflate:9 zstd:3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from client.client import safe_extract  # noqa: E402
+
+_spec = importlib.util.spec_from_file_location("pack_skill", REPO_ROOT / "scripts" / "pack_skill.py")
+pack_skill = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(pack_skill)
+
+DEFAULT_MODES = ["auto", "stored", "deflate:1", "deflate:6", "deflate:9", "zstd:3", "zstd:19"]
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--skills-dir", type=Path, default=REPO_ROOT / "skills")
+    parser.add_argument("--modes", nargs="+", default=DEFAULT_MODES)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    has_zstd = importlib.util.find_spec("zstandard") is not None
+    skills = sorted(d for d in args.skills_dir.iterdir() if (d / "SKILL.md").exists())
+    print(f"{'skill':<20} {'mode':<10} {'bytes':>10} {'pack ms':>9} {'extract ms':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp)
+        for skill in skills:
+            for mode in args.modes:
+                if mode.startswith("zstd") and not has_zstd:
+                    continue
+                mode_dir = out / mode.replace(":", "-")
+                pack_ms = timed(lambda: pack_skill.pack(skill, mode_dir, mode), args.repeat) * 1000
+                archive = pack_skill.archive_path(skill, mode_dir, pack_skill.parse_compression(mode)[0])
+                counter = iter(range(10**9))
+                extract_ms = timed(
+                    lambda: safe_extract(archive, out / "x" / str(next(counter))), args.repeat
+                ) * 1000
+                size = archive.stat().st_size
+                print(f"{skill.name:<20} {mode:<10} {size:>10} {pack_ms:>9.2f} {extract_ms:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Benchmark search-index build, load and query latency for synthetic catalogs.
+
+Skill text is drawn from a Zipf-distributed vocabulary, like real prose:
+"head" queries use the most frequent words (long posting lists, the worst
+case), "typical" queries use mid-frequency words.
+
+Usage:
+    python benchmarks/bench_search.py [--sizes 100 1000 10000] [--repeat 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from client.search import SearchIndex, build_search_index  # noqa: E402
+
+WORDS = (
+    "github review image gemini erp invoice pdf slack calendar email translate summarize "
+    "python javascript docker kubernetes sql report chart audio video search scrape lint "
+    "test deploy backup monitor alert schedule crm inventory trading workflow schema"
+).split()
+TAGS = WORDS[:16]
+VOCAB = WORDS + [f"w{i}" for i in range(20000)]
+CUM_WEIGHTS = list(itertools.accumulate(1 / (r + 1) for r in range(len(VOCAB))))
+HEAD_QUERIES = ["github review", "image", "erp invoice report", "docker deploy monitor", "summarize pdf email"]
+TYPICAL_QUERIES = ["w100 w2500", "w400", "w60 w900 w5000", "w1200 w3000", "w250"]
+
+
+def make_docs(n: int, rng: random.Random) -> list[dict]:
+    docs = []
+    for i in range(n):
+        words = rng.choices(VOCAB, cum_weights=CUM_WEIGHTS, k=60)
+        docs.append({
+            "slug": f"skill-{i:05d}",
+            "name": f"{words[0]} {words[1]} {i}",
+            "version": "1.0.0",
+            "description": " ".join(words[:15]),
+            "tags": rng.sample(TAGS, 3),
+            "body": " ".join(words),
+        })
+    return docs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    for n in args.sizes:
+        docs = make_docs(n, rng)
+        start = time.perf_counter()
+        data = build_search_index(docs)
+        built = time.perf_counter() - start
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "search-index.json"
+            path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+            size = path.stat().st_size
+            start = time.perf_counter()
+            index = SearchIndex.load(path)
+            loaded = time.perf_counter() - start
+
+        p50 = {}
+        for label, queries in (("head", HEAD_QUERIES), ("typical", TYPICAL_QUERIES)):
+            latencies = []
+            for i in range(args.repeat):
+                tags = [TAGS[i % len(TAGS)]] if i % 2 else []
+                start = time.perf_counter()
+                index.search(queries[i % len(queries)], tags)
+                latencies.append(time.perf_counter() - start)
+            p50[label] = statistics.median(latencies) * 1000
+        print(
+            f"{n:>6} skills  build {built * 1000:7.1f} ms  load {loaded * 1000:6.1f} ms  "
+            f"{size / 1024:6.0f} KiB  query p50: head {p50['head']:6.3f} ms  typical {p50['typical']:6.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Load-test the SkillHub server and report requests/sec per endpoint.
+
+Starts ``uvicorn server.main:app`` on a free port unless --url is given, then
+keeps --concurrency requests in flight for --duration seconds per scenario.
+Exits 1 if any scenario falls below --target requests/sec.
+
+Usage:
+    python benchmarks/bench_server.py [--url http://127.0.0.1:8000] [--concurrency 32]
+                                      [--duration 5] [--target 0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# (label, path, extra headers)
+SCENARIOS = [
+    ("list", "/skills/", {}),
+    ("list gzip", "/skills/", {"Accept-Encoding": "gzip"}),
+    ("list 304", "/skills/", {"If-None-Match": None}),
+    ("page", "/skills/?limit=2&fields=name,version", {}),
+    ("index.json", "/index.json", {"Accept-Encoding": "gzip"}),
+]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(skills_dir: Path, index: Path) -> tuple[subprocess.Popen, str]:
+    port = free_port()
+    env = dict(
+        os.environ,
+        PYTHONPATH=str(REPO_ROOT),
+        SKILLHUB_SKILLS_DIR=str(skills_dir),
+        SKILLHUB_INDEX=str(index),
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url + "/skills/", timeout=1).raise_for_status()
+            return proc, url
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise SystemExit("server did not start")
+
+
+async def hammer(url: str, path: str, headers: dict, concurrency: int, duration: float) -> tuple[int, int]:
+    """Return (completed, errors) for *duration* seconds of *concurrency* workers."""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=10) as client:
+        if None in headers.values():
+            etag = (await client.get(path)).headers["etag"]
+            headers = {k: etag if v is None else v for k, v in headers.items()}
+        done = errors = 0
+        deadline = time.perf_counter() + duration
+
+        async def worker() -> None:
+            nonlocal done, errors
+            while time.perf_counter() < deadline:
+                r = await client.get(path, headers=headers)
+                if r.status_code >= 400:
+                    errors += 1
+                done += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return done, errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Benchmark a running server instead of starting one.")
+    parser.add_argument("--skills-dir", type=Path, default=REPO_ROOT / "skills")
+    parser.add_argument("--index", type=Path, default=REPO_ROOT / "index.json")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--target", type=float, default=0.0, help="Minimum requests/sec per scenario.")
+    args = parser.parse_args()
+
+    proc = None
+    url = args.url
+    if url is None:
+        proc, url = start_server(args.skills_dir, args.index)
+    failed = False
+    try:
+        for label, path, headers in SCENARIOS:
+            done, errors = asyncio.run(hammer(url, path, headers, args.concurrency, args.duration))
+            rps = done / args.duration
+            below = rps < args.target
+            failed |= below or errors > 0
+            note = "  BELOW TARGET" if below else ""
+            print(f"{label:<12} {rps:9.0f} req/s  ({done} requests, {errors} errors){note}")
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
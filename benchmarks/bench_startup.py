@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Measure cold start of the skillhub CLI with ``python -X importtime``.
+
+Runs each command in a fresh interpreter, prints the median wall time and
+the modules with the largest cumulative import time for the last run.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat 10] [--top 15] [--skills-dir skills]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+COMMANDS = [["--help"], ["list"], ["info", "pr-reviewer"]]
+
+
+def run(cmd: list[str], skills_dir: Path) -> tuple[float, str]:
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    argv = [sys.executable, "-X", "importtime", "-m", "client.client", "--skills-dir", str(skills_dir), *cmd]
+    start = time.perf_counter()
+    proc = subprocess.run(argv, env=env, capture_output=True, text=True)
+    return time.perf_counter() - start, proc.stderr
+
+
+def top_imports(stderr: str, n: int) -> list[tuple[int, str]]:
+    """Return the *n* slowest top-level imports as (cumulative µs, module)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # nested imports are indented past the single separating space
+        if not name[1:].startswith(" "):
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:n]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--skills-dir", type=Path, default=REPO_ROOT / "skills")
+    args = parser.parse_args()
+
+    for cmd in COMMANDS:
+        times, stderr = [], ""
+        for _ in range(args.repeat):
+            elapsed, stderr = run(cmd, args.skills_dir)
+            times.append(elapsed)
+        print(f"skillhub {' '.join(cmd):<20} median {statistics.median(times) * 1000:7.1f} ms")
+        for us, name in top_imports(stderr, args.top):
+            print(f"    {us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,12 @@
 """SkillHub client package — local skill registry utilities for CTOS."""
 
-from client.models import Skill  # noqa: F401
-
 __version__ = "0.1.0"
+
+
+def __getattr__(name: str):
+    # pydantic is the heaviest import in the package; load it on first use only
+    if name == "Skill":
+        from client.models import Skill
+
+        return Skill
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
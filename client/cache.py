@@ -0,0 +1,87 @@
+"""On-disk metadata cache for parsed SKILL.md frontmatter (.skillhub-cache)."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+CACHE_FILENAME = ".skillhub-cache"
+CACHE_VERSION = 1
+
+
+def stat_key(st: os.stat_result) -> list[int]:
+    """Return the (mtime_ns, size, inode) triple used to detect SKILL.md changes."""
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+class MetadataCache:
+    """Parsed skill records keyed by SKILL.md path and stat triple.
+
+    The cache is advisory: a missing, corrupt or foreign-version cache file is
+    treated as empty, and failures to write it back are ignored.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return
+        entries = data.get("entries")
+        if isinstance(entries, dict):
+            self._entries = entries
+
+    def get(self, key: str, stamp: list[int]) -> tuple[bool, Optional[dict]]:
+        """Return ``(hit, record)``; *record* may be None for cached non-skills."""
+        entry = self._entries.get(key)
+        if not isinstance(entry, dict) or entry.get("stat") != stamp:
+            return False, None
+        record = entry.get("record")
+        if record is not None and not isinstance(record, dict):
+            return False, None
+        return True, record
+
+    def put(self, key: str, stamp: list[int], record: Optional[dict]) -> None:
+        """Store *record* for *key* at *stamp*."""
+        self._entries[key] = {"stat": stamp, "record": record}
+        self._dirty = True
+
+    def prune(self, live: set[str]) -> None:
+        """Drop entries whose keys are not in *live* (deleted skills)."""
+        stale = [k for k in self._entries if k not in live]
+        for k in stale:
+            del self._entries[k]
+        if stale:
+            self._dirty = True
+
+    def save(self) -> None:
+        """Atomically write the cache back if it changed."""
+        if not self._dirty:
+            return
+        import tempfile  # only needed on a write, which a warm `skillhub list` skips
+
+        payload = json.dumps({"version": CACHE_VERSION, "entries": self._entries})
+        try:
+            fd, tmp = tempfile.mkstemp(prefix=CACHE_FILENAME, dir=self.path.parent)
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp, self.path)
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return
+        self._dirty = False
@@ -3,108 +3,315 @@
 from __future__ import annotations
 
 import argparse
+import fnmatch
 import json
+import os
 import sys
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+
+# Only light modules at import time: the CLI is started very often, so pydantic,
+# the network stack and archive handling are imported where they are used.
+from client.cache import CACHE_FILENAME, MetadataCache, stat_key
+from client.defaults import DEFAULT_INDEX_URL, DEFAULT_MAX_AGE, default_cache_dir
+from client.frontmatter import FrontmatterError, load_frontmatter
+from client.record import SkillRecord
+
+if TYPE_CHECKING:
+    from client.models import Skill
 
-import urllib.request
-import hashlib
-import zipfile
-import tempfile
-import shutil
-import os
-import yaml
 
-from client.models import Skill
+def __getattr__(name: str):
+    if name == "safe_extract":  # public re-export, kept lazy
+        from client.extract import safe_extract
+
+        return safe_extract
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def _parse_frontmatter(skill_md: Path) -> Optional[dict]:
-    """Extract YAML frontmatter from a SKILL.md file using PyYAML for robustness.
+    """Extract YAML frontmatter from a SKILL.md file without reading its body.
 
-    Returns the parsed dict or None if frontmatter is missing.
+    Returns the parsed dict or None if frontmatter is missing or malformed.
     """
-    text = skill_md.read_text(encoding="utf-8")
-    if not text.startswith("---"):
-        return None
-    parts = text.split("---", 2)
-    if len(parts) < 3:
-        return None
-    fm_text = parts[1]
     try:
-        data = yaml.safe_load(fm_text)
-        if isinstance(data, dict):
-            return data
-        return None
-    except Exception:
+        return load_frontmatter(skill_md)
+    except FrontmatterError:
         return None
 
 
-def safe_extract(zip_path: str | Path, dest_dir: str | Path) -> list[str]:
-    """Safely extract zip archive to dest_dir, skipping absolute or traversal paths.
+def _normalize_meta(meta: dict) -> dict:
+    """Coerce frontmatter fields that may be emitted as simple strings."""
+    if 'dependencies' in meta and isinstance(meta['dependencies'], str):
+        s = meta['dependencies'].strip()
+        if s in ('[]', ''):
+            meta['dependencies'] = []
+        else:
+            try:
+                meta['dependencies'] = json.loads(s)
+            except Exception:
+                meta['dependencies'] = []
+    if 'ctos' in meta and isinstance(meta['ctos'], str):
+        s = meta['ctos'].strip()
+        if s in ('{}', ''):
+            meta['ctos'] = {}
+        else:
+            try:
+                meta['ctos'] = json.loads(s)
+            except Exception:
+                meta['ctos'] = {}
+    # handle naive block-parsing that produced a list for nested mappings
+    if 'ctos' in meta and isinstance(meta['ctos'], list):
+        meta['ctos'] = {}
+    return meta
+
+
+def _read_meta(skill_md: Path) -> Optional[dict]:
+    """Parse and normalize one SKILL.md (module-level so process pools can pickle it)."""
+    meta = _parse_frontmatter(skill_md)
+    return _normalize_meta(meta) if meta else None
 
-    Returns list of extracted relative paths.
-    """
-    dest_dir = Path(dest_dir)
-    extracted: list[str] = []
-    with zipfile.ZipFile(zip_path) as zf:
-        for member in zf.infolist():
-            member_path = Path(member.filename)
-            if member_path.is_absolute() or ".." in member_path.parts:
-                continue
-            out_path = dest_dir / member.filename
-            out_path.parent.mkdir(parents=True, exist_ok=True)
-            with zf.open(member) as src, open(out_path, "wb") as dst:
-                shutil.copyfileobj(src, dst)
-            extracted.append(str(member.filename))
-    return extracted
+
+POOLS = ("thread", "process")
+# marks cache records written by validate=False: the validated path must not trust them
+UNVALIDATED = "_unvalidated"
 
 
 class SkillHubClient:
-    """Lightweight client that reads skills from a local directory."""
+    """Lightweight client that reads skills from a local directory.
+
+    Parsed frontmatter is cached in ``skills_dir/.skillhub-cache`` keyed on each
+    SKILL.md's (mtime_ns, size, inode); pass ``use_cache=False`` to always re-parse.
+    With ``workers > 1`` cache misses are parsed on a thread pool (I/O-bound,
+    e.g. network mounts) or, with ``pool="process"``, a process pool (CPU-bound YAML).
+    """
 
-    def __init__(self, skills_dir: str | Path = "skills") -> None:
+    def __init__(
+        self,
+        skills_dir: str | Path = "skills",
+        use_cache: bool = True,
+        workers: int = 0,
+        pool: str = "thread",
+    ) -> None:
+        if pool not in POOLS:
+            raise ValueError(f"pool must be one of {POOLS}, got {pool!r}")
         self.skills_dir = Path(skills_dir)
+        self.use_cache = use_cache
+        self.workers = workers
+        self.pool = pool
+        # name -> directory name, valid while skills_dir's mtime equals _index_stamp
+        self._name_index: dict[str, str] = {}
+        self._index_stamp: Optional[int] = None
+
+    def _dir_stamp(self) -> Optional[int]:
+        try:
+            return self.skills_dir.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _open_cache(self) -> Optional[MetadataCache]:
+        if not self.use_cache:
+            return None
+        return MetadataCache(self.skills_dir / CACHE_FILENAME)
+
+    @staticmethod
+    def _convert(record: dict, validate: bool) -> tuple[bool, Optional[Skill | SkillRecord]]:
+        """Turn a cached record into a Skill/SkillRecord; ``(False, None)`` if corrupt.
+
+        A record cached by an unvalidated listing is a miss for ``validate=True``,
+        so it is re-parsed and validated rather than trusted.
+        """
+        if not validate:
+            return True, SkillRecord.from_meta(record)
+        if record.get(UNVALIDATED):
+            return False, None
+        from pydantic import ValidationError
+
+        from client.models import Skill
+
+        try:
+            return True, Skill(**record)
+        except ValidationError:
+            return False, None
+
+    @classmethod
+    def _from_cache(
+        cls, cache: MetadataCache, key: str, stamp: list[int], validate: bool = True
+    ) -> tuple[bool, Optional[Skill | SkillRecord]]:
+        hit, record = cache.get(key, stamp)
+        if not hit or record is None:
+            return hit, None
+        return cls._convert(record, validate)  # a corrupt record counts as a miss
 
-    def list_skills(self) -> list[Skill]:
-        """Scan skills_dir for sub-directories containing SKILL.md and return models."""
-        results: list[Skill] = []
-        if not self.skills_dir.is_dir():
-            return results
-        for child in sorted(self.skills_dir.iterdir()):
-            skill_md = child / "SKILL.md"
-            if child.is_dir() and skill_md.exists():
-                meta = _parse_frontmatter(skill_md)
-                if meta:
-                    # Normalize frontmatter fields that may be emitted as simple strings
-                    if 'dependencies' in meta and isinstance(meta['dependencies'], str):
-                        s = meta['dependencies'].strip()
-                        if s in ('[]', ''):
-                            meta['dependencies'] = []
-                        else:
-                            try:
-                                meta['dependencies'] = json.loads(s)
-                            except Exception:
-                                meta['dependencies'] = []
-                    if 'ctos' in meta and isinstance(meta['ctos'], str):
-                        s = meta['ctos'].strip()
-                        if s in ('{}', ''):
-                            meta['ctos'] = {}
-                        else:
-                            try:
-                                meta['ctos'] = json.loads(s)
-                            except Exception:
-                                meta['ctos'] = {}
-                    # handle naive block-parsing that produced a list for nested mappings
-                    if 'ctos' in meta and isinstance(meta['ctos'], list):
-                        meta['ctos'] = {}
-                    results.append(Skill(**meta))
-        return results
+    @staticmethod
+    def _build(
+        cache: Optional[MetadataCache],
+        key: str,
+        stamp: Optional[list[int]],
+        meta: Optional[dict],
+        validate: bool = True,
+    ) -> Optional[Skill | SkillRecord]:
+        if not meta:
+            skill, record = None, None
+        elif validate:
+            from client.models import Skill
+
+            skill = Skill(**meta)
+            record = skill.model_dump()
+        else:
+            skill = SkillRecord.from_meta(meta)
+            record = {**skill._asdict(), UNVALIDATED: True}
+        if cache is not None and stamp is not None:
+            cache.put(key, stamp, record)
+        return skill
+
+    def _load_skill(self, skill_md: Path, cache: Optional[MetadataCache]) -> Optional[Skill]:
+        """Return the Skill for *skill_md*, consulting and filling *cache*."""
+        key = skill_md.parent.name
+        stamp = None
+        if cache is not None:
+            stamp = stat_key(skill_md.stat())
+            hit, skill = self._from_cache(cache, key, stamp)
+            if hit:
+                return skill
+        return self._build(cache, key, stamp, _read_meta(skill_md))
+
+    @contextmanager
+    def _parsing(self, paths: list[Path]) -> Iterator[Iterator[Optional[dict]]]:
+        """Yield a lazy iterator parsing *paths* in order, on a pool when configured."""
+        if self.workers <= 1 or len(paths) < 2:
+            yield map(_read_meta, paths)
+            return
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        if self.pool == "process":
+            ex = ProcessPoolExecutor(max_workers=self.workers)
+            parsed = ex.map(_read_meta, paths, chunksize=max(1, len(paths) // (self.workers * 4)))
+        else:
+            ex = ThreadPoolExecutor(max_workers=self.workers)
+            parsed = ex.map(_read_meta, paths)
+        try:
+            yield parsed
+        finally:
+            # a consumer that stops early should not wait for the rest to parse
+            ex.shutdown(cancel_futures=True)
+
+    def iter_skills(
+        self,
+        names: Optional[Iterable[str]] = None,
+        tags: Optional[Iterable[str]] = None,
+        pattern: Optional[str] = None,
+        validate: bool = True,
+    ) -> Iterator[Skill | SkillRecord]:
+        """Yield skills in directory-name order as they are read.
+
+        *names* and *pattern* (an fnmatch glob) are matched against directory
+        names before anything is parsed, so excluded skills are never opened;
+        *tags* keeps skills that carry every listed tag. The directory is
+        listed with one ``os.scandir`` and each SKILL.md is stat'ed once, that
+        stat serving as both the existence check and the cache key; without a
+        worker pool it happens only when the scan reaches that skill.
+        ``validate=False`` yields :class:`SkillRecord` tuples, as in
+        :meth:`list_skills`.
+        """
+        try:
+            with os.scandir(self.skills_dir) as it:
+                # skip .skillhub-cache and in-flight .staging-* work dirs
+                entries = sorted((e.name for e in it if not e.name.startswith(".")))
+        except (FileNotFoundError, NotADirectoryError):
+            return
+        wanted = set(names) if names is not None else None
+        required = set(tags) if tags else None
+        full_scan = wanted is None and pattern is None
+        cache = self._open_cache()
+
+        def scan() -> Iterator[tuple[str, Path, Optional[list[int]], bool, Optional[dict]]]:
+            for name in entries:
+                if wanted is not None and name not in wanted:
+                    continue
+                if pattern is not None and not fnmatch.fnmatchcase(name, pattern):
+                    continue
+                skill_md = self.skills_dir / name / "SKILL.md"
+                try:
+                    st = os.stat(skill_md)
+                except OSError:
+                    continue  # a plain file, or a directory without SKILL.md
+                stamp, hit, record = None, False, None
+                if cache is not None:
+                    stamp = stat_key(st)
+                    hit, record = cache.get(name, stamp)
+                yield name, skill_md, stamp, hit, record
+
+        # serially each entry is stat'ed just before it is yielded; a pool needs
+        # its work list up front, so then every entry is stat'ed first
+        lazy = self.workers <= 1
+        found = scan() if lazy else list(scan())
+        keys: list[str] = []
+        index: dict[str, str] = {}
+        complete = False
+        with self._parsing([] if lazy else [md for _, md, _, hit, _ in found if not hit]) as parsed:
+            try:
+                for key, skill_md, stamp, hit, record in found:
+                    keys.append(key)
+                    skill = None
+                    if not hit:
+                        meta = _read_meta(skill_md) if lazy else next(parsed)
+                        skill = self._build(cache, key, stamp, meta, validate)
+                    elif record is not None:
+                        ok, skill = self._convert(record, validate)
+                        if not ok:
+                            skill = self._build(cache, key, stamp, _read_meta(skill_md), validate)
+                    if skill is None:
+                        continue
+                    index.setdefault(skill.name, key)
+                    if required is None or required.issubset(skill.tags):
+                        yield skill
+                complete = True
+            finally:
+                if cache is not None:
+                    if complete and full_scan:
+                        cache.prune(set(keys))
+                    cache.save()
+        if complete and full_scan:
+            # stamp after saving: writing .skillhub-cache itself bumps the directory mtime
+            self._name_index = index
+            self._index_stamp = self._dir_stamp()
+
+    def list_skills(self, validate: bool = True) -> list[Skill] | list[SkillRecord]:
+        """Scan skills_dir for sub-directories containing SKILL.md and return models.
+
+        With ``validate=False`` pydantic is skipped entirely and lightweight
+        :class:`SkillRecord` tuples are returned instead; call ``to_skill()`` on
+        the ones that need a full model. See :meth:`iter_skills` to stream.
+        """
+        return list(self.iter_skills(validate=validate))
+
+    def _skill_at(self, dirname: str) -> Optional[Skill]:
+        """Parse skills_dir/<dirname>/SKILL.md directly, or None if absent."""
+        skill_md = self.skills_dir / dirname / "SKILL.md"
+        if not skill_md.is_file():
+            return None
+        return self._load_skill(skill_md, None)
 
     def get_skill(self, name: str) -> Optional[Skill]:
-        """Return a single skill by name, or None."""
-        for skill in self.list_skills():
-            if skill.name == name:
+        """Return a single skill by name, or None.
+
+        Tries ``skills_dir/<name>/SKILL.md`` first; only when the directory name
+        and frontmatter ``name`` disagree does it consult the name index, which is
+        rebuilt by a full scan whenever skills_dir's mtime changes.
+        """
+        skill = self._skill_at(name)
+        if skill is not None and skill.name == name:
+            return skill
+        for attempt in range(2):
+            if attempt or self._index_stamp is None or self._index_stamp != self._dir_stamp():
+                self.list_skills(validate=False)
+            dirname = self._name_index.get(name)
+            if dirname is None:
+                return None
+            skill = self._skill_at(dirname)
+            if skill is not None and skill.name == name:
                 return skill
         return None
 
@@ -117,16 +324,51 @@ class SkillHubClient:
         return report
 
 
+def _artifact_store(args: argparse.Namespace):
+    from client.store import ArtifactStore
+
+    root = Path(args.cache_dir) if args.cache_dir else default_cache_dir()
+    return ArtifactStore(root / "artifacts")
+
+
 def main() -> None:
     """CLI entrypoint for skillhub."""
     parser = argparse.ArgumentParser(
         prog="skillhub",
         description="SkillHub client — list and inspect CTOS skills.",
     )
+    parser.add_argument(
+        "--skills-dir", default="skills", help="Local skills directory (default: ./skills)."
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse every SKILL.md instead of using skills/.skillhub-cache.",
+    )
+    parser.add_argument(
+        "--parse-jobs",
+        dest="workers",
+        type=int,
+        default=0,
+        help="Parse SKILL.md files with N parallel workers (default: serial).",
+    )
+    parser.add_argument(
+        "--pool",
+        choices=POOLS,
+        default="thread",
+        help="Worker pool for --parse-jobs: thread (I/O-bound stores) or process (CPU-bound YAML).",
+    )
     sub = parser.add_subparsers(dest="command")
 
     # list
-    sub.add_parser("list", help="List all skills in the local skills/ directory.")
+    list_p = sub.add_parser("list", help="List all skills in the local skills/ directory.")
+    list_p.add_argument(
+        "--name", action="append", dest="names", metavar="DIR", help="Only this skill directory (repeatable)."
+    )
+    list_p.add_argument(
+        "--tag", action="append", dest="tags", metavar="TAG", help="Only skills with this tag (repeatable)."
+    )
+    list_p.add_argument("--glob", metavar="PATTERN", help="Only skill directories matching this glob.")
 
     # validate
     sub.add_parser("validate", help="Validate that installed skills have their entrypoints.")
@@ -136,88 +378,252 @@ def main() -> None:
     info_p.add_argument("name", help="Skill name.")
 
     # remote index and install
+    parser.add_argument(
+        "--index-url", default=DEFAULT_INDEX_URL, help="URL of the remote index.json."
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Download cache directory (default: $SKILLHUB_CACHE_DIR or ~/.cache/skillhub).",
+    )
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        default=DEFAULT_MAX_AGE,
+        help="Seconds a cached index.json is used before revalidating (0: always revalidate).",
+    )
+    parser.add_argument(
+        "--offline", action="store_true", help="Use the cached index.json without any network."
+    )
     sub.add_parser("list-remote", help="List remote skills from index.json")
-    install_p = sub.add_parser("install", help="Install skill by slug from remote index")
-    install_p.add_argument("slug", help="Skill slug to install")
+    search_p = sub.add_parser("search", help="Search remote skills by text and tags (BM25).")
+    search_p.add_argument("query", nargs="*", help="Words to match; may be empty with --tag.")
+    search_p.add_argument(
+        "--tag", action="append", dest="tags", default=[], metavar="TAG", help="Require this tag (repeatable)."
+    )
+    search_p.add_argument("--limit", type=int, default=10, help="Show at most N results (default: 10).")
+    search_p.add_argument(
+        "--search-index",
+        default=None,
+        metavar="PATH",
+        help="Local search-index.json (default: the one next to --index-url).",
+    )
+    install_p = sub.add_parser("install", help="Install skills by slug from remote index")
+    install_p.add_argument("slugs", nargs="*", metavar="slug", help="Skill slugs to install")
+    install_p.add_argument("--all", action="store_true", help="Install every skill in the index")
+    install_p.add_argument(
+        "--jobs",
+        dest="download_jobs",
+        type=int,
+        default=4,
+        help="Concurrent downloads (default: 4).",
+    )
+    install_p.add_argument(
+        "--lockfile",
+        default="skills-lock.json",
+        help="Lockfile to record installs in (.sqlite/.db for the SQLite backend).",
+    )
+    install_p.add_argument(
+        "--max-size-mb",
+        type=float,
+        default=512,
+        help="Refuse artifacts larger than this many MiB (default: 512).",
+    )
+
+    update_p = sub.add_parser(
+        "update", help="Update installed skills whose index version or checksum changed"
+    )
+    update_p.add_argument("slugs", nargs="*", metavar="slug", help="Limit to these skills")
+    update_p.add_argument("--dry-run", action="store_true", help="Only show what would change")
+    update_p.add_argument(
+        "--jobs", dest="download_jobs", type=int, default=4, help="Concurrent downloads (default: 4)."
+    )
+    update_p.add_argument(
+        "--lockfile", default="skills-lock.json", help="Lockfile listing installed skills."
+    )
+
+    lock_p = sub.add_parser("lockfile", help="Convert between JSON and SQLite lockfiles.")
+    lock_sub = lock_p.add_subparsers(dest="lock_command")
+    convert_p = lock_sub.add_parser(
+        "convert", help="Copy all entries from SRC to DEST (format chosen by DEST's suffix)."
+    )
+    convert_p.add_argument("src", help="Existing lockfile, e.g. skills-lock.json")
+    convert_p.add_argument("dest", help="Lockfile to write, e.g. skills-lock.sqlite")
+
+    # artifact cache
+    cache_p = sub.add_parser("cache", help="Inspect or prune the downloaded artifact cache.")
+    cache_sub = cache_p.add_subparsers(dest="cache_command")
+    cache_sub.add_parser("stats", help="Show artifact cache size and entry count.")
+    gc_p = cache_sub.add_parser("gc", help="Evict least-recently-used artifacts.")
+    gc_p.add_argument(
+        "--max-mb",
+        type=float,
+        default=None,
+        help="Shrink the cache to this many MiB (default: the configured cap).",
+    )
 
     args = parser.parse_args()
-    client = SkillHubClient()
+    client = SkillHubClient(
+        args.skills_dir, use_cache=not args.no_cache, workers=args.workers, pool=args.pool
+    )
 
     if args.command == "list":
-        skills = client.list_skills()
-        if not skills:
+        found = False
+        for s in client.iter_skills(args.names, args.tags, args.glob, validate=False):
+            print(f"  {s.name}  v{s.version}  — {s.description}", flush=True)
+            found = True
+        if not found:
             print("No skills found.")
-            return
-        for s in skills:
-            print(f"  {s.name}  v{s.version}  — {s.description}")
 
     elif args.command == "list-remote":
-        index_url = "https://raw.githubusercontent.com/yazelin/ching-tech-os-skillhub/main/index.json"
+        from client.remote import IndexCache, open_index
+
         try:
-            with urllib.request.urlopen(index_url) as r:
-                idx = json.loads(r.read().decode())
+            skills = open_index(
+                args.index_url,
+                cache=IndexCache(args.cache_dir),
+                max_age=args.max_age,
+                offline=args.offline,
+            ).entries()
         except Exception as e:
             print("Failed to fetch index:", e)
             sys.exit(1)
-        skills = idx.get("skills", [])
         if not skills:
             print("No remote skills found.")
             return
         for s in skills:
             print(f"  {s['slug']}  {s.get('name','')}  v{s.get('version','')}  — {s.get('description','')}")
 
+    elif args.command == "search":
+        from client.search import SearchIndex, build_search_index
+
+        if not args.query and not args.tags:
+            search_p.error("give a query or at least one --tag")
+        if args.search_index:
+            index = SearchIndex.load(args.search_index)
+        else:
+            from client.remote import IndexCache, fetch_index, open_index
+
+            fetch = dict(cache=IndexCache(args.cache_dir), max_age=args.max_age, offline=args.offline)
+            try:
+                remote = open_index(args.index_url, **fetch)
+            except Exception as e:
+                print("Failed to fetch index:", e)
+                sys.exit(1)
+            try:
+                index = SearchIndex(fetch_index(remote.search_index_url(), **fetch))
+            except Exception:
+                # hub without a prebuilt search index: index the catalog in memory
+                index = SearchIndex(build_search_index(remote.entries()))
+        hits = index.search(" ".join(args.query), args.tags, args.limit)
+        if not hits:
+            print("No matching skills.")
+            return
+        for h in hits:
+            print(f"  {h.slug}  v{h.version}  ({h.score:.2f})  — {h.description}")
+
     elif args.command == "install":
-        index_url = "https://raw.githubusercontent.com/yazelin/ching-tech-os-skillhub/main/index.json"
+        from client.lockfile import open_lockfile
+        from client.remote import IndexCache, install_many, open_index
+
+        if not args.slugs and not args.all:
+            install_p.error("give at least one slug or --all")
         try:
-            with urllib.request.urlopen(index_url) as r:
-                idx = json.loads(r.read().decode())
+            remote = open_index(
+                args.index_url,
+                cache=IndexCache(args.cache_dir),
+                max_age=args.max_age,
+                offline=args.offline,
+            )
+            # a sharded index fetches only the shards holding these slugs
+            found = remote.entries(None if args.all else args.slugs)
         except Exception as e:
             print("Failed to fetch index:", e)
             sys.exit(1)
-        skill = next((s for s in idx.get("skills", []) if s["slug"] == args.slug), None)
-        if not skill:
-            print(f"Skill '{args.slug}' not found in index.")
-            sys.exit(1)
-        url = skill["download_url"]
-        expected = skill.get("sha256")
-        tmpf = tempfile.NamedTemporaryFile(delete=False)
+        if args.all:
+            entries = found
+        else:
+            by_slug = {e["slug"]: e for e in found}
+            entries = []
+            for slug in dict.fromkeys(args.slugs):
+                if slug not in by_slug:
+                    print(f"Skill '{slug}' not found in index.")
+                    sys.exit(1)
+                entries.append(by_slug[slug])
+        results = install_many(
+            entries,
+            client.skills_dir,
+            jobs=args.download_jobs,
+            store=_artifact_store(args),
+            max_bytes=int(args.max_size_mb * 2**20),
+        )
+        for r in results:
+            if r.ok:
+                print(f"Installed {r.slug} -> {r.path}")
+            else:
+                print(f"FAILED {r.slug}: {r.error}")
+        open_lockfile(args.lockfile).add_entries(
+            {r.slug: {"version": r.version, "checksum": r.sha256} for r in results if r.ok}
+        )
+        sys.exit(0 if all(r.ok for r in results) else 1)
+
+    elif args.command == "update":
+        from client.lockfile import open_lockfile
+        from client.remote import IndexCache, open_index
+        from client.update import UpdateError, apply_updates, plan_updates
+
+        lockfile = open_lockfile(args.lockfile)
+        installed = lockfile.list_installed()
         try:
-            urllib.request.urlretrieve(url, tmpf.name)
+            remote = open_index(
+                args.index_url,
+                cache=IndexCache(args.cache_dir),
+                max_age=args.max_age,
+                offline=args.offline,
+            )
+            idx = {"skills": remote.entries(args.slugs or installed)}
         except Exception as e:
-            print("Download failed:", e)
+            print("Failed to fetch index:", e)
             sys.exit(1)
-        h = hashlib.sha256()
-        with open(tmpf.name, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                h.update(chunk)
-        if expected and h.hexdigest() != expected:
-            print("SHA256 mismatch: expected", expected, "got", h.hexdigest())
+        plan = plan_updates(installed, idx, args.slugs or None)
+        if not plan:
+            print(f"All {len(installed)} installed skill(s) are up to date.")
+            return
+        for item in plan:
+            print(f"  {item.slug}: {item.installed_version} -> {item.remote_version} ({item.reason})")
+        if args.dry_run:
+            return
+        try:
+            apply_updates(
+                plan, client.skills_dir, lockfile, _artifact_store(args), jobs=args.download_jobs
+            )
+        except UpdateError as e:
+            print("Update failed, nothing changed:", e)
             sys.exit(1)
-        tmpdir = tempfile.mkdtemp()
-        with zipfile.ZipFile(tmpf.name) as zf:
-            # safe extraction: skip absolute paths and any paths containing '..'
-            safe_entries = []
-            for member in zf.infolist():
-                member_path = Path(member.filename)
-                if member_path.is_absolute() or ".." in member_path.parts:
-                    # skip potentially dangerous entries
-                    continue
-                dest_path = Path(tmpdir) / member.filename
-                dest_path.parent.mkdir(parents=True, exist_ok=True)
-                with zf.open(member) as src, open(dest_path, "wb") as dst:
-                    shutil.copyfileobj(src, dst)
-                safe_entries.append(member.filename.split("/")[0])
-            entries = sorted(set([e for e in safe_entries if e]))
-        target_dir = client.skills_dir / args.slug
-        if target_dir.exists():
-            shutil.rmtree(target_dir)
-        if len(entries) == 1 and entries[0] == args.slug:
-            shutil.move(os.path.join(tmpdir, entries[0]), str(target_dir))
+        print(f"Updated {len(plan)} skill(s).")
+
+    elif args.command == "cache":
+        store = _artifact_store(args)
+        if args.cache_command == "stats":
+            st = store.stats()
+            print(f"  path:    {st.root}")
+            print(f"  entries: {st.count}")
+            print(f"  size:    {st.total_bytes / 2**20:.1f} MiB (cap {st.max_bytes / 2**20:.0f} MiB)")
+        elif args.cache_command == "gc":
+            max_bytes = None if args.max_mb is None else int(args.max_mb * 2**20)
+            evicted = store.gc(max_bytes)
+            print(f"Evicted {len(evicted)} artifact(s).")
         else:
-            os.makedirs(target_dir, exist_ok=True)
-            for item in entries:
-                shutil.move(os.path.join(tmpdir, item), str(target_dir))
-        print(f"Installed {args.slug} -> {target_dir}")
+            cache_p.print_help()
+
+    elif args.command == "lockfile":
+        from client.lockfile import convert_lockfile
+
+        if args.lock_command != "convert":
+            lock_p.print_help()
+            return
+        count = convert_lockfile(args.src, args.dest)
+        print(f"Copied {count} entr{'y' if count == 1 else 'ies'} from {args.src} to {args.dest}.")
 
     elif args.command == "validate":
         report = client.validate_install()
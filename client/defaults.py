@@ -0,0 +1,18 @@
+"""Default locations and timeouts, kept import-free so the CLI can start fast."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+DEFAULT_INDEX_URL = "https://raw.githubusercontent.com/yazelin/ching-tech-os-skillhub/main/index.json"
+DEFAULT_MAX_AGE = 300
+
+
+def default_cache_dir() -> Path:
+    """Return $SKILLHUB_CACHE_DIR, else $XDG_CACHE_HOME/skillhub, else ~/.cache/skillhub."""
+    env = os.environ.get("SKILLHUB_CACHE_DIR")
+    if env:
+        return Path(env)
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    return (Path(xdg) if xdg else Path.home() / ".cache") / "skillhub"
@@ -0,0 +1,161 @@
+"""Delta upgrades: fetch only changed zip members using the per-file manifest.
+
+``scripts/pack_skill.py`` writes ``<skill>.manifest.json`` next to each zip,
+recording for every file its SHA-256, size, mode and the byte span of its
+local zip record. Given an installed tree, only members whose digest or
+mode differ are fetched, with HTTP Range requests against the same zip.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import struct
+import tempfile
+import urllib.request
+import zipfile
+import zlib
+from pathlib import Path
+from typing import Optional
+
+MANIFEST_VERSION = 1
+# beyond this fraction of changed bytes a full download is cheaper than many ranges
+MAX_DELTA_RATIO = 0.5
+
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_LOCAL_MAGIC = b"PK\x03\x04"
+
+
+class DeltaUnavailable(Exception):
+    """Raised when a delta upgrade cannot be used; callers fall back to a full install."""
+
+
+def fetch_manifest(url: str, expected_sha256: Optional[str] = None) -> dict:
+    """Download and verify a skill manifest."""
+    with urllib.request.urlopen(url) as r:
+        body = r.read()
+    if expected_sha256 and hashlib.sha256(body).hexdigest() != expected_sha256:
+        raise DeltaUnavailable(f"manifest checksum mismatch for {url}")
+    manifest = json.loads(body.decode())
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise DeltaUnavailable(f"unsupported manifest version {manifest.get('version')!r}")
+    for rel in manifest.get("files", {}):
+        parts = Path(rel).parts
+        if not parts or Path(rel).is_absolute() or ".." in parts:
+            raise DeltaUnavailable(f"unsafe path in manifest: {rel!r}")
+    return manifest
+
+
+def _file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def changed_files(manifest: dict, tree: Path) -> list[str]:
+    """Return manifest paths whose content or exec bit differs in *tree*."""
+    changed = []
+    for rel, info in manifest["files"].items():
+        local = tree / rel
+        try:
+            st = local.lstat()
+        except FileNotFoundError:
+            changed.append(rel)
+            continue
+        if (
+            not stat.S_ISREG(st.st_mode)
+            or st.st_size != info["size"]
+            or bool(st.st_mode & 0o111) != bool(info["mode"] & 0o111)
+            or _file_digest(local) != info["sha256"]
+        ):
+            changed.append(rel)
+    return changed
+
+
+def _fetch_range(url: str, start: int, end: int) -> bytes:
+    req = urllib.request.Request(url, headers={"Range": f"bytes={start}-{end - 1}"})
+    with urllib.request.urlopen(req) as r:
+        if r.status != 206:
+            raise DeltaUnavailable(f"{url} does not support range requests")
+        data = r.read()
+    if len(data) != end - start:
+        raise DeltaUnavailable(f"short range response from {url}")
+    return data
+
+
+def _decode_member(record: bytes, info: dict) -> bytes:
+    sig, *_rest, name_len, extra_len = _LOCAL_HEADER.unpack_from(record)
+    if sig != _LOCAL_MAGIC:
+        raise DeltaUnavailable("manifest offsets do not match the archive")
+    start = _LOCAL_HEADER.size + name_len + extra_len
+    raw = record[start:start + info["compress_size"]]
+    if info["compress_type"] == zipfile.ZIP_STORED:
+        data = raw
+    elif info["compress_type"] == zipfile.ZIP_DEFLATED:
+        data = zlib.decompressobj(-zlib.MAX_WBITS).decompress(raw)
+    else:
+        raise DeltaUnavailable(f"unsupported compression {info['compress_type']}")
+    if len(data) != info["size"] or hashlib.sha256(data).hexdigest() != info["sha256"]:
+        raise DeltaUnavailable(f"member {info['member']} failed verification")
+    return data
+
+
+def fetch_members(url: str, manifest: dict, paths: list[str]) -> dict[str, bytes]:
+    """Fetch and verify *paths* from the zip at *url*, coalescing adjacent spans."""
+    infos = sorted((manifest["files"][p] | {"path": p} for p in paths), key=lambda i: i["offset"])
+    runs: list[list[dict]] = []
+    for info in infos:
+        if runs and runs[-1][-1]["offset"] + runs[-1][-1]["length"] == info["offset"]:
+            runs[-1].append(info)
+        else:
+            runs.append([info])
+    out: dict[str, bytes] = {}
+    for run in runs:
+        base = run[0]["offset"]
+        blob = _fetch_range(url, base, run[-1]["offset"] + run[-1]["length"])
+        for info in run:
+            rel = info["offset"] - base
+            out[info["path"]] = _decode_member(blob[rel:rel + info["length"]], info)
+    return out
+
+
+def stage_delta(
+    download_url: str, manifest: dict, current: Path, skills_dir: Path, slug: str
+) -> tuple[Path, Path]:
+    """Build the upgraded tree for *slug* in a work dir, reusing unchanged files.
+
+    Unchanged files are hard-linked from *current* (copied where links are not
+    possible); changed ones come from range requests. Files no longer in the
+    manifest are simply left out. Returns ``(workdir, tree)``.
+    """
+    changed = changed_files(manifest, current)
+    total = sum(i["size"] for i in manifest["files"].values()) or 1
+    if sum(manifest["files"][p]["size"] for p in changed) / total > MAX_DELTA_RATIO:
+        raise DeltaUnavailable("too much changed for a delta upgrade")
+    fetched = fetch_members(download_url, manifest, changed) if changed else {}
+
+    workdir = Path(tempfile.mkdtemp(prefix=f".staging-{slug}-", dir=skills_dir))
+    try:
+        tree = workdir / "delta"
+        dirs = {tree} | {(tree / rel).parent for rel in manifest["files"]}
+        for d in sorted(dirs):
+            d.mkdir(parents=True, exist_ok=True)
+        for rel, info in manifest["files"].items():
+            dest = tree / rel
+            if rel in fetched:
+                dest.write_bytes(fetched[rel])
+                os.chmod(dest, info["mode"] & 0o777)
+                continue
+            try:
+                os.link(current / rel, dest)
+            except OSError:
+                shutil.copy2(current / rel, dest)
+    except BaseException:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise
+    return workdir, tree
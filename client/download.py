@@ -0,0 +1,124 @@
+"""Streaming artifact downloads: hash while writing, resume with HTTP Range."""
+
+from __future__ import annotations
+
+import hashlib
+import http.client
+import re
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Optional
+
+CHUNK_SIZE = 1024 * 1024
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_RETRIES = 3
+DEFAULT_TIMEOUT = 30.0
+
+_CONTENT_RANGE_RE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+
+class DownloadError(Exception):
+    """Raised when a download fails, exceeds its size limit or fails verification."""
+
+
+def _hash_existing(path: Path) -> tuple["hashlib._Hash", int]:
+    h = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                h.update(chunk)
+                size += len(chunk)
+    except FileNotFoundError:
+        pass
+    return h, size
+
+
+def download(
+    url: str,
+    dest: str | Path,
+    *,
+    expected_sha256: Optional[str] = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    retries: int = DEFAULT_RETRIES,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> str:
+    """Stream *url* into *dest* in one pass and return its SHA-256 hex digest.
+
+    If *dest* already holds a partial download it is resumed with a ``Range``
+    request; a server that answers 200 instead, or 206 for some other range,
+    restarts from scratch. Dropped
+    connections are retried up to *retries* times, keeping the bytes received
+    so far. The transfer is aborted as soon as it would exceed *max_bytes*. On
+    a digest mismatch *dest* is deleted.
+    """
+    dest = Path(dest)
+    h, offset = _hash_existing(dest)
+    if offset > max_bytes:
+        dest.unlink()
+        h, offset = hashlib.sha256(), 0
+    attempt = 0
+    while True:
+        req = urllib.request.Request(url)
+        if offset:
+            req.add_header("Range", f"bytes={offset}-")
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as r:
+                if r.status == 206:
+                    m = _CONTENT_RANGE_RE.match(r.headers.get("Content-Range", ""))
+                    if not m or int(m.group(1)) != offset:
+                        # not the range we asked for: drop the partial file and fetch it whole,
+                        # or every later run would send the same Range and fail the same way
+                        dest.unlink(missing_ok=True)
+                        h, offset = hashlib.sha256(), 0
+                        attempt += 1
+                        if attempt > retries:
+                            raise DownloadError(f"unexpected Content-Range from {url}")
+                        continue
+                    mode = "ab"
+                else:
+                    # full body: either a fresh download or the server ignored Range
+                    h, offset, mode = hashlib.sha256(), 0, "wb"
+                length = r.headers.get("Content-Length")
+                end = offset + int(length) if length is not None else None
+                if end is not None and end > max_bytes:
+                    dest.unlink(missing_ok=True)
+                    raise DownloadError(f"{url} is larger than the {max_bytes}-byte limit")
+                with open(dest, mode) as f:
+                    while True:
+                        chunk = r.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        offset += len(chunk)
+                        if offset > max_bytes:
+                            f.close()
+                            dest.unlink(missing_ok=True)
+                            raise DownloadError(f"{url} is larger than the {max_bytes}-byte limit")
+                        f.write(chunk)
+                        h.update(chunk)
+                # http.client reports a peer that closes early as a clean EOF
+                if end is not None and offset != end:
+                    raise http.client.IncompleteRead(b"", end - offset)
+            break
+        except urllib.error.HTTPError as e:
+            if e.code == 416 and offset:
+                # our partial file is not a prefix the server recognises: start over
+                dest.unlink(missing_ok=True)
+                h, offset = hashlib.sha256(), 0
+            elif e.code < 500:
+                raise DownloadError(f"Download failed: HTTP {e.code} for {url}") from e
+            attempt += 1
+            if attempt > retries:
+                raise DownloadError(f"Download failed: {e}") from e
+        except (OSError, http.client.HTTPException) as e:
+            attempt += 1
+            if attempt > retries:
+                raise DownloadError(f"Download failed after {retries} retries: {e}") from e
+            # resume from whatever actually reached the disk
+            h, offset = _hash_existing(dest)
+    digest = h.hexdigest()
+    if expected_sha256 and digest != expected_sha256:
+        dest.unlink(missing_ok=True)
+        raise DownloadError(f"SHA256 mismatch: expected {expected_sha256} got {digest}")
+    return digest
@@ -0,0 +1,180 @@
+"""Safe, fast extraction of skill artifacts (zip, and .tar.zst when zstandard is installed)."""
+
+from __future__ import annotations
+
+import os
+import posixpath
+import shutil
+import stat
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Iterable
+
+COPY_BUFFER = 1024 * 1024
+MAX_TOTAL_BYTES = 1024 * 1024 * 1024
+MAX_MEMBERS = 100_000
+MAX_RATIO = 200
+# members smaller than this may have any ratio (a few KiB of zeros is not a bomb)
+RATIO_MIN_SIZE = 1024 * 1024
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+class UnsafeArchiveError(ValueError):
+    """Raised for archives that exceed size, count or compression-ratio limits."""
+
+
+def _clean_name(name: str) -> str | None:
+    """Return the normalised relative POSIX path for *name*, or None if unsafe."""
+    name = name.replace("\\", "/")
+    if name.startswith("/") or (len(name) > 1 and name[1] == ":"):
+        return None
+    parts = name.split("/")
+    if ".." in parts:
+        return None
+    clean = posixpath.normpath(name)
+    if clean in (".", ""):
+        return None
+    return clean
+
+
+def _make_dirs(dest: Path, names: Iterable[str]) -> None:
+    """Create every parent directory of *names* exactly once."""
+    dirs = {posixpath.dirname(n) for n in names}
+    dirs.discard("")
+    for d in sorted(dirs):
+        os.makedirs(dest / d, exist_ok=True)
+
+
+def _open_out(path: Path, executable: bool) -> int:
+    return os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755 if executable else 0o644)
+
+
+def _write(path: Path, src: BinaryIO, executable: bool) -> None:
+    with os.fdopen(_open_out(path, executable), "wb") as dst:
+        shutil.copyfileobj(src, dst, COPY_BUFFER)
+
+
+def _write_bytes(path: Path, data: bytes, executable: bool) -> None:
+    fd = _open_out(path, executable)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _check_totals(count: int, total: int, max_members: int, max_total: int) -> None:
+    if count > max_members:
+        raise UnsafeArchiveError(f"archive has {count} members (limit {max_members})")
+    if total > max_total:
+        raise UnsafeArchiveError(f"archive expands to {total} bytes (limit {max_total})")
+
+
+def extract_zip(
+    archive: str | Path,
+    dest_dir: str | Path,
+    *,
+    max_total: int = MAX_TOTAL_BYTES,
+    max_members: int = MAX_MEMBERS,
+    max_ratio: float = MAX_RATIO,
+) -> list[str]:
+    """Extract a zip into *dest_dir* and return the extracted member names.
+
+    Absolute, traversal and symlink members are skipped. Archives whose
+    declared sizes exceed *max_total* / *max_members*, or with a member whose
+    compression ratio exceeds *max_ratio*, are refused before anything is
+    written; zipfile itself stops reading each member at its declared size.
+    Unix exec bits are preserved.
+    """
+    dest = Path(dest_dir)
+    with zipfile.ZipFile(archive) as zf:
+        members: list[tuple[str, zipfile.ZipInfo]] = []
+        total = 0
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            mode = info.external_attr >> 16
+            if stat.S_ISLNK(mode):
+                continue
+            name = _clean_name(info.filename)
+            if name is None:
+                continue
+            if info.file_size > RATIO_MIN_SIZE and info.file_size > max_ratio * max(
+                info.compress_size, 1
+            ):
+                raise UnsafeArchiveError(
+                    f"{info.filename}: compression ratio exceeds {max_ratio}:1"
+                )
+            total += info.file_size
+            members.append((name, info))
+        _check_totals(len(members), total, max_members, max_total)
+
+        _make_dirs(dest, (n for n, _ in members))
+        for name, info in members:
+            executable = info.create_system == 3 and bool((info.external_attr >> 16) & 0o111)
+            if info.file_size <= COPY_BUFFER:
+                # small members: one read, one unbuffered write, no file object
+                _write_bytes(dest / name, zf.read(info), executable)
+            else:
+                with zf.open(info) as src:
+                    _write(dest / name, src, executable)
+    return [info.filename for _, info in members]
+
+
+def extract_tar_zst(
+    archive: str | Path,
+    dest_dir: str | Path,
+    *,
+    max_total: int = MAX_TOTAL_BYTES,
+    max_members: int = MAX_MEMBERS,
+) -> list[str]:
+    """Stream-extract a .tar.zst artifact, keeping only regular files.
+
+    The tar is read in a single pass, so limits are enforced as members arrive.
+    """
+    try:
+        import zstandard
+    except ImportError as e:
+        raise RuntimeError(
+            "this artifact is zstd-compressed; install the optional dependency: "
+            "pip install 'ching-tech-os-skillhub[zstd]'"
+        ) from e
+    import tarfile
+
+    dest = Path(dest_dir)
+    made: set[str] = set()
+    extracted: list[str] = []
+    total = 0
+    with open(archive, "rb") as raw, zstandard.ZstdDecompressor().stream_reader(raw) as stream:
+        with tarfile.open(fileobj=stream, mode="r|") as tf:
+            for member in tf:
+                if not member.isfile():
+                    continue
+                name = _clean_name(member.name)
+                if name is None:
+                    continue
+                total += member.size
+                _check_totals(len(extracted) + 1, total, max_members, max_total)
+                parent = posixpath.dirname(name)
+                if parent and parent not in made:
+                    os.makedirs(dest / parent, exist_ok=True)
+                    made.add(parent)
+                src = tf.extractfile(member)
+                with src:
+                    _write(dest / name, src, bool(member.mode & 0o111))
+                extracted.append(member.name)
+    return extracted
+
+
+def safe_extract(archive: str | Path, dest_dir: str | Path) -> list[str]:
+    """Extract a skill artifact into *dest_dir*, detecting zip or .tar.zst by magic.
+
+    Returns the list of extracted member names.
+    """
+    with open(archive, "rb") as f:
+        magic = f.read(4)
+    if magic == ZSTD_MAGIC:
+        return extract_tar_zst(archive, dest_dir)
+    return extract_zip(archive, dest_dir)
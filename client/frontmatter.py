@@ -0,0 +1,69 @@
+"""Streaming SKILL.md frontmatter extraction shared by the client and scripts/."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+
+DELIMITER = b"---"
+MAX_FRONTMATTER_BYTES = 1024 * 1024
+
+
+class FrontmatterError(ValueError):
+    """Raised when a SKILL.md has no, or malformed, YAML frontmatter."""
+
+
+def read_frontmatter_text(skill_md: str | Path) -> str:
+    """Return the raw YAML between the opening and closing ``---`` lines.
+
+    Reads line by line and stops at the closing delimiter, so the markdown body
+    is never loaded.
+    """
+    skill_md = Path(skill_md)
+    with open(skill_md, "rb") as f:
+        first = f.readline()
+        if not first.startswith(DELIMITER):
+            raise FrontmatterError(f"{skill_md}: missing YAML frontmatter delimiter.")
+        lines: list[bytes] = [first[len(DELIMITER):]]
+        size = 0
+        for line in f:
+            if line.rstrip() == DELIMITER:
+                return b"".join(lines).decode("utf-8")
+            size += len(line)
+            if size > MAX_FRONTMATTER_BYTES:
+                break
+            lines.append(line)
+    raise FrontmatterError(f"{skill_md}: malformed frontmatter.")
+
+
+@lru_cache(maxsize=None)
+def _yaml():
+    # imported on first parse: a warm metadata cache never needs PyYAML
+    import yaml
+
+    # libyaml's C loader is several times faster; fall back to pure Python when absent.
+    return yaml, getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def load_frontmatter(skill_md: str | Path) -> dict:
+    """Parse the frontmatter of *skill_md* into a mapping."""
+    text = read_frontmatter_text(skill_md)
+    yaml, loader = _yaml()
+    try:
+        data = yaml.load(text, Loader=loader)
+    except yaml.YAMLError as e:
+        raise FrontmatterError(f"{skill_md}: invalid YAML frontmatter: {e}") from e
+    if not isinstance(data, dict):
+        raise FrontmatterError(f"{skill_md}: frontmatter did not parse to a mapping")
+    return data
+
+
+def read_body(skill_md: str | Path) -> str:
+    """Return the markdown after the closing ``---`` line (empty if there is none)."""
+    with open(skill_md, "rb") as f:
+        if not f.readline().startswith(DELIMITER):
+            return ""
+        for line in f:
+            if line.rstrip() == DELIMITER:
+                return f.read().decode("utf-8", errors="replace")
+    return ""
@@ -1,41 +1,146 @@
-"""Skill installer — copies a skill folder to a target directory and updates the lockfile."""
+"""Skill installer — places a skill folder in a target directory and updates the lockfile."""
 
 from __future__ import annotations
 
+import errno
+import os
 import shutil
+import tempfile
 from pathlib import Path
+from typing import TYPE_CHECKING, Optional
 
-from client.lockfile import LockFile
-from client.models import Skill
+from client.defaults import default_cache_dir
+from client.lockfile import open_lockfile
+from client.store import TreeStore
+from client.swap import fsync_tree, remove_later, swap_dir, sweep_stale
+
+if TYPE_CHECKING:
+    from client.models import Skill
+
+STRATEGIES = ("copy", "hardlink", "reflink", "symlink")
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+# errors meaning "this filesystem/pair of paths can't share blocks", not real failures
+_NO_SHARE = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.ENOSYS}
+
+
+def _reflink(src: str, dst: str) -> None:
+    """Clone *src* to *dst* with FICLONE, falling back to a plain copy."""
+    try:
+        import fcntl
+    except ImportError:
+        shutil.copyfile(src, dst)
+        return
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+            return
+        except OSError as e:
+            if e.errno not in _NO_SHARE:
+                raise
+        shutil.copyfileobj(s, d, 1024 * 1024)
+
+
+def _hardlink(src: str, dst: str) -> None:
+    try:
+        os.link(src, dst)
+    except OSError as e:
+        if e.errno not in _NO_SHARE:
+            raise
+        shutil.copy2(src, dst)
+
+
+def _writable_copy(clone):
+    """Wrap *clone* so the tenant's copy gets owner-writable permissions back."""
+
+    def copy(src: str, dst: str) -> None:
+        clone(src, dst)
+        os.chmod(dst, os.stat(src).st_mode & 0o777 | 0o200)
+
+    return copy
+
+
+def _remove(path: Path) -> None:
+    if path.is_symlink() or path.is_file():
+        path.unlink()
+    elif path.exists():
+        shutil.rmtree(path)
 
 
 class SkillInstaller:
-    """Installs a skill by copying its directory to a target location."""
+    """Installs a skill into a target directory using one of :data:`STRATEGIES`.
+
+    ``copy`` copies the source tree directly. The other strategies first
+    ingest the source into a shared, read-only :class:`TreeStore` (once per
+    distinct tree) and install from there: ``hardlink`` links every file (the
+    installed files are then read-only), ``reflink`` clones them copy-on-write
+    where the filesystem supports it and copies otherwise, and ``symlink``
+    points the install directory at the stored tree. Hard links and reflinks
+    fall back to copies across filesystems.
+    """
 
     def __init__(
         self,
         target_dir: str | Path = "installed_skills",
         lockfile_path: str | Path = "skills-lock.json",
+        strategy: str = "copy",
+        store_dir: Optional[str | Path] = None,
     ) -> None:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"unknown install strategy {strategy!r}; expected one of {STRATEGIES}")
         self.target_dir = Path(target_dir)
-        self.lockfile = LockFile(lockfile_path)
+        self.lockfile = open_lockfile(lockfile_path)
+        self.strategy = strategy
+        if store_dir is None and strategy != "copy":
+            store_dir = default_cache_dir() / "trees"
+        self.store = TreeStore(store_dir) if store_dir is not None else None
 
     def install(self, skill: Skill, source_dir: Path) -> Path:
-        """Copy *source_dir* into target_dir/<skill.name> and record in lockfile.
+        """Install *source_dir* as target_dir/<skill.name> and record in lockfile.
 
-        Returns the destination path.
+        The new tree is built and fsynced in a hidden work dir next to the
+        destination, then exchanged into place, so the destination never
+        disappears or shows a half-written tree. The displaced tree is
+        removed in the background. Returns the destination path.
         """
         dest = self.target_dir / skill.name
         self.target_dir.mkdir(parents=True, exist_ok=True)
-        if dest.exists():
-            shutil.rmtree(dest)
-        shutil.copytree(source_dir, dest)
-        self.lockfile.add(skill)
+        sweep_stale(self.target_dir)
+        workdir = Path(tempfile.mkdtemp(prefix=f".staging-{skill.name}-", dir=self.target_dir))
+        try:
+            staged = workdir / "new"
+            self._build(Path(source_dir), staged)
+            fsync_tree(staged)
+            backup = swap_dir(staged, dest, workdir / "previous")
+            try:
+                self.lockfile.add(skill)
+            except BaseException:
+                if backup is not None:
+                    swap_dir(backup, dest, workdir / "discarded")
+                else:
+                    os.rename(dest, workdir / "discarded")
+                raise
+        except BaseException:
+            shutil.rmtree(workdir, ignore_errors=True)
+            raise
+        remove_later(workdir)
         return dest
 
+    def _build(self, source_dir: Path, staged: Path) -> None:
+        if self.strategy == "copy":
+            shutil.copytree(source_dir, staged)
+            return
+        tree = self.store.ingest(source_dir)
+        if self.strategy == "symlink":
+            os.symlink(tree.resolve(), staged, target_is_directory=True)
+        elif self.strategy == "hardlink":
+            shutil.copytree(tree, staged, copy_function=_hardlink)
+        else:
+            shutil.copytree(tree, staged, copy_function=_writable_copy(_reflink))
+
     def uninstall(self, name: str) -> bool:
         """Remove an installed skill by name. Returns True if removed."""
-        dest = self.target_dir / name
-        if dest.exists():
-            shutil.rmtree(dest)
+        _remove(self.target_dir / name)
         return self.lockfile.remove(name)
@@ -1,45 +1,242 @@
-"""Lockfile management for installed skills (skills-lock.json)."""
+"""Lockfile management for installed skills (skills-lock.json, or SQLite for large installs)."""
 
 from __future__ import annotations
 
 import json
+import os
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Iterator, Mapping, Optional
 
-from client.models import Skill
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: only in-process locking
+    fcntl = None
+
+if TYPE_CHECKING:
+    from client.models import Skill
 
 
 class LockFile:
-    """Read/write a simple JSON lockfile that tracks installed skills."""
+    """Read/write a simple JSON lockfile that tracks installed skills.
+
+    Every mutation is a locked read-modify-write: an ``fcntl`` advisory lock
+    on a sibling ``.<name>.lock`` file serialises writers across processes,
+    and the new content replaces the old with a temp file + rename. Group
+    many mutations into one read and one write with :meth:`batch`.
+    """
 
     def __init__(self, path: str | Path = "skills-lock.json") -> None:
         self.path = Path(path)
+        self._mutex = threading.RLock()
+        self._depth = 0
+        self._pending: Optional[dict[str, Any]] = None
+        self._dirty = False
 
     def _read(self) -> dict[str, Any]:
+        if self._pending is not None:
+            return self._pending
         if self.path.exists():
             return json.loads(self.path.read_text(encoding="utf-8"))
         return {"skills": {}}
 
     def _write(self, data: dict[str, Any]) -> None:
-        self.path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+        # write to a sibling temp file and rename so readers never see a partial file
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{self.path.name}.", dir=self.path.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(json.dumps(data, indent=2) + "\n")
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.parent / f".{self.path.name}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @contextmanager
+    def batch(self) -> Iterator["LockFile"]:
+        """Hold the lock, read once, and write once on exit if anything changed.
+
+        Mutations inside the block only touch the in-memory copy; if the block
+        raises, nothing is written. Nested batches join the outermost one.
+        """
+        with self._mutex:
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield self
+                finally:
+                    self._depth -= 1
+                return
+            with self._locked():
+                self._pending = self._read()
+                self._pending.setdefault("skills", {})
+                self._dirty = False
+                self._depth = 1
+                try:
+                    yield self
+                    if self._dirty:
+                        self._write(self._pending)
+                finally:
+                    self._depth = 0
+                    self._pending = None
 
     def add(self, skill: Skill) -> None:
         """Record a skill in the lockfile."""
-        data = self._read()
-        data["skills"][skill.name] = {
-            "version": skill.version,
-            "checksum": skill.checksum,
-        }
-        self._write(data)
+        self.add_entries({skill.name: {"version": skill.version, "checksum": skill.checksum}})
+
+    def add_entries(self, entries: Mapping[str, dict[str, str]]) -> None:
+        """Record many ``name -> {version, checksum}`` entries with a single write."""
+        if not entries:
+            return
+        with self.batch():
+            self._pending["skills"].update(entries)
+            self._dirty = True
 
     def remove(self, name: str) -> bool:
         """Remove a skill entry. Returns True if it existed."""
-        data = self._read()
-        removed = data["skills"].pop(name, None) is not None
-        if removed:
-            self._write(data)
+        with self.batch():
+            removed = self._pending["skills"].pop(name, None) is not None
+            self._dirty |= removed
         return removed
 
+    def get(self, name: str) -> Optional[dict[str, str]]:
+        """Return the entry for *name*, or None if it is not installed."""
+        return self.list_installed().get(name)
+
     def list_installed(self) -> dict[str, dict[str, str]]:
         """Return the dict of installed skills."""
-        return self._read().get("skills", {})
+        with self._mutex:
+            return dict(self._read().get("skills", {}))
+
+
+SQLITE_MAGIC = b"SQLite format 3\x00"
+SQLITE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+
+
+class SqliteLockFile(LockFile):
+    """A :class:`LockFile` backed by SQLite, for lockfiles with very many entries.
+
+    Point lookups (:meth:`get`) and single-entry updates touch one row instead
+    of parsing and rewriting the whole file. SQLite's own locking replaces the
+    ``fcntl`` lock; :meth:`batch` is one ``BEGIN IMMEDIATE`` transaction.
+    """
+
+    def __init__(self, path: str | Path = "skills-lock.sqlite") -> None:
+        super().__init__(path)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=60, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS skills ("
+                "name TEXT PRIMARY KEY, version TEXT NOT NULL, checksum TEXT NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._mutex:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @contextmanager
+    def batch(self) -> Iterator["SqliteLockFile"]:
+        """Run the block as one transaction, rolled back if it raises."""
+        with self._mutex:
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield self
+                finally:
+                    self._depth -= 1
+                return
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            self._depth = 1
+            try:
+                yield self
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            else:
+                db.execute("COMMIT")
+            finally:
+                self._depth = 0
+
+    def add_entries(self, entries: Mapping[str, dict[str, str]]) -> None:
+        """Record many ``name -> {version, checksum}`` entries in one transaction."""
+        if not entries:
+            return
+        with self.batch():
+            self._db().executemany(
+                "INSERT OR REPLACE INTO skills (name, version, checksum) VALUES (?, ?, ?)",
+                ((name, e.get("version", ""), e.get("checksum", "")) for name, e in entries.items()),
+            )
+
+    def remove(self, name: str) -> bool:
+        """Remove a skill entry. Returns True if it existed."""
+        with self.batch():
+            return self._db().execute("DELETE FROM skills WHERE name = ?", (name,)).rowcount > 0
+
+    def get(self, name: str) -> Optional[dict[str, str]]:
+        """Return the entry for *name*, or None if it is not installed."""
+        with self._mutex:
+            row = self._db().execute(
+                "SELECT version, checksum FROM skills WHERE name = ?", (name,)
+            ).fetchone()
+        return {"version": row[0], "checksum": row[1]} if row else None
+
+    def list_installed(self) -> dict[str, dict[str, str]]:
+        """Return the dict of installed skills."""
+        with self._mutex:
+            rows = self._db().execute("SELECT name, version, checksum FROM skills ORDER BY name")
+            return {name: {"version": v, "checksum": c} for name, v, c in rows}
+
+
+def open_lockfile(path: str | Path) -> LockFile:
+    """Open *path* with the backend matching its content (or, if new, its suffix)."""
+    path = Path(path)
+    try:
+        with open(path, "rb") as f:
+            is_sqlite = f.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+    except FileNotFoundError:
+        is_sqlite = path.suffix in SQLITE_SUFFIXES
+    return SqliteLockFile(path) if is_sqlite else LockFile(path)
+
+
+def convert_lockfile(src: str | Path, dest: str | Path) -> int:
+    """Copy every entry from lockfile *src* into *dest*, in *dest*'s format.
+
+    Migrates JSON to SQLite (``skills-lock.json`` -> ``skills-lock.sqlite``)
+    and exports back. Returns the number of entries copied.
+    """
+    entries = open_lockfile(src).list_installed()
+    target = open_lockfile(dest)
+    with target.batch():
+        for name in target.list_installed():
+            if name not in entries:
+                target.remove(name)
+        target.add_entries(entries)
+    return len(entries)
@@ -0,0 +1,52 @@
+"""Compact, unvalidated skill records for bulk listings that skip pydantic."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from client.models import Skill
+
+
+class SkillRecord(NamedTuple):
+    """The fields of :class:`client.models.Skill` as a plain tuple.
+
+    Built straight from frontmatter (or the metadata cache) with the model's
+    defaults filled in but no validation, so for valid input ``to_skill()``
+    equals the model ``list_skills()`` would have built.
+    """
+
+    name: str
+    version: str
+    description: str
+    author: str
+    tags: list[str]
+    entrypoint: str
+    files: list[str]
+    license: str
+    checksum: str
+    dependencies: list[dict]
+    ctos: Optional[dict]
+
+    @classmethod
+    def from_meta(cls, meta: dict[str, Any]) -> "SkillRecord":
+        get = meta.get
+        return cls(
+            get("name", ""),
+            get("version", ""),
+            get("description", ""),
+            get("author", ""),
+            list(get("tags") or []),
+            get("entrypoint", ""),
+            list(get("files") or []),
+            get("license", "MIT"),
+            get("checksum", ""),
+            list(get("dependencies") or []),
+            get("ctos"),
+        )
+
+    def to_skill(self) -> "Skill":
+        """Validate this record into a full pydantic model."""
+        from client.models import Skill
+
+        return Skill(**self._asdict())
@@ -0,0 +1,334 @@
+"""A long-lived, incrementally updated view of a skills directory.
+
+:class:`SkillRegistry` loads the registry once and then follows changes to
+``SKILL.md`` files — via inotify on Linux, otherwise by polling stat — by
+re-reading only the skill directories that changed. Readers get an immutable
+:class:`RegistrySnapshot`; a reload builds a new snapshot and swaps the
+reference, so readers never wait for it.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import errno
+import os
+import select
+import struct
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Iterable, Iterator, Mapping, Optional
+
+from client.cache import stat_key
+from client.client import SkillHubClient
+
+if TYPE_CHECKING:
+    from client.models import Skill
+    from client.record import SkillRecord
+
+DEFAULT_POLL_INTERVAL = 1.0
+# let a burst of events (an extract, an atomic swap) settle before reloading
+DEBOUNCE_SECONDS = 0.05
+
+# <sys/inotify.h>
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+_ROOT_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_ATTRIB | IN_ONLYDIR
+_SKILL_MASK = (
+    IN_CLOSE_WRITE | IN_MODIFY | IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_ATTRIB | IN_DELETE_SELF | IN_ONLYDIR
+)
+_EVENT = struct.Struct("iIII")
+
+
+@dataclass(frozen=True)
+class RegistrySnapshot:
+    """An immutable view of the registry at one *generation*.
+
+    *skills* maps skill name to model (or :class:`SkillRecord` when the
+    registry was created with ``validate=False``); *errors* maps directory
+    name to the reason a present SKILL.md could not be loaded.
+    """
+
+    generation: int
+    skills: Mapping[str, "Skill | SkillRecord"] = field(default_factory=lambda: MappingProxyType({}))
+    errors: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+
+    def get(self, name: str) -> Optional["Skill | SkillRecord"]:
+        return self.skills.get(name)
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def __iter__(self) -> Iterator["Skill | SkillRecord"]:
+        return iter(self.skills.values())
+
+
+class _Inotify:
+    """Just enough of inotify(7), through ctypes, to watch a skills directory."""
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._add = libc.inotify_add_watch
+        self._add.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def add(self, path: Path, mask: int) -> Optional[int]:
+        wd = self._add(self.fd, os.fsencode(path), mask)
+        return wd if wd >= 0 else None
+
+    def read(self, timeout: float) -> Optional[list[tuple[int, int, str]]]:
+        """Return ``(wd, mask, name)`` events, [] on timeout, None once closed."""
+        try:
+            ready, _, _ = select.select([self.fd], [], [], timeout)
+            if not ready:
+                return []
+            data = os.read(self.fd, 64 * 1024)
+        except (OSError, ValueError) as e:
+            if isinstance(e, OSError) and e.errno == errno.EAGAIN:
+                return []
+            return None
+        events, pos = [], 0
+        while pos + _EVENT.size <= len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, pos)
+            pos += _EVENT.size
+            name = os.fsdecode(data[pos:pos + length].rstrip(b"\0"))
+            pos += length
+            events.append((wd, mask, name))
+        return events
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class SkillRegistry:
+    """Keep the skills in *skills_dir* loaded and current for a long-running process.
+
+    Use as a context manager (or call :meth:`start` / :meth:`stop`) and read
+    :attr:`snapshot` whenever needed. ``use_inotify=False`` forces mtime
+    polling every *poll_interval* seconds, which is also the fallback when
+    inotify is unavailable. :meth:`refresh` reloads synchronously.
+    """
+
+    def __init__(
+        self,
+        skills_dir: str | Path = "skills",
+        *,
+        validate: bool = True,
+        use_cache: bool = True,
+        use_inotify: bool = True,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        self.skills_dir = Path(skills_dir)
+        self.validate = validate
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.mode: Optional[str] = None  # "inotify" or "poll" once started
+        self._client = SkillHubClient(self.skills_dir, use_cache=use_cache)
+        # dirname -> (SKILL.md stat key, skill or None, error or None)
+        self._dirs: dict[str, tuple[list[int], Optional[object], Optional[str]]] = {}
+        self._snapshot = RegistrySnapshot(0)
+        self._lock = threading.Lock()
+        self._changed = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._inotify: Optional[_Inotify] = None
+        self._watches: dict[int, str] = {}
+        self._root_wd: Optional[int] = None
+
+    @property
+    def snapshot(self) -> RegistrySnapshot:
+        """The current snapshot; never blocks."""
+        return self._snapshot
+
+    @property
+    def generation(self) -> int:
+        return self._snapshot.generation
+
+    # -- loading -----------------------------------------------------------
+
+    def _stat(self, name: str) -> Optional[list[int]]:
+        try:
+            return stat_key(os.stat(self.skills_dir / name / "SKILL.md"))
+        except OSError:
+            return None
+
+    def _listdir(self) -> list[str]:
+        try:
+            with os.scandir(self.skills_dir) as it:
+                return [e.name for e in it if not e.name.startswith(".")]
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+
+    def _load(self, names: list[str]) -> dict[str, tuple[Optional[object], Optional[str]]]:
+        """Parse *names* through the client (and its metadata cache)."""
+        loaded: dict[str, tuple[Optional[object], Optional[str]]] = {n: (None, None) for n in names}
+        if not names:
+            return loaded
+        try:
+            by_name = list(self._client.iter_skills(names=names, validate=self.validate))
+        except Exception:
+            by_name = None
+        if by_name is not None and len(names) == len(by_name):
+            return dict(zip(sorted(names), ((s, None) for s in by_name)))
+        # a skill failed validation, or some dir isn't a skill: load one at a time
+        for name in names:
+            try:
+                found = list(self._client.iter_skills(names=[name], validate=self.validate))
+            except Exception as e:
+                loaded[name] = (None, f"{type(e).__name__}: {e}")
+                continue
+            loaded[name] = (found[0] if found else None, None)
+        return loaded
+
+    def refresh(self, names: Optional[Iterable[str]] = None) -> RegistrySnapshot:
+        """Re-check *names* (default: every directory) and publish a new snapshot if needed."""
+        with self._lock:
+            if names is None:
+                candidates = set(self._listdir()) | set(self._dirs)
+            else:
+                candidates = {n for n in names if n and not n.startswith(".")}
+            changed: list[str] = []
+            removed: list[str] = []
+            stamps: dict[str, list[int]] = {}
+            for name in candidates:
+                stamp = self._stat(name)
+                if stamp is None:
+                    if name in self._dirs:
+                        removed.append(name)
+                elif name not in self._dirs or self._dirs[name][0] != stamp:
+                    stamps[name] = stamp
+                    changed.append(name)
+            if not changed and not removed:
+                return self._snapshot
+            for name in removed:
+                del self._dirs[name]
+            for name, (skill, error) in self._load(changed).items():
+                self._dirs[name] = (stamps[name], skill, error)
+            self._publish()
+            return self._snapshot
+
+    def _publish(self) -> None:
+        skills: dict[str, object] = {}
+        errors: dict[str, str] = {}
+        for name in sorted(self._dirs):
+            _, skill, error = self._dirs[name]
+            if error is not None:
+                errors[name] = error
+            elif skill is not None:
+                skills.setdefault(skill.name, skill)
+        self._snapshot = RegistrySnapshot(
+            self._snapshot.generation + 1, MappingProxyType(skills), MappingProxyType(errors)
+        )
+        with self._changed:
+            self._changed.notify_all()
+
+    def wait_for(self, generation: int, timeout: Optional[float] = None) -> RegistrySnapshot:
+        """Block until the snapshot generation reaches *generation* (or *timeout*)."""
+        with self._changed:
+            self._changed.wait_for(lambda: self._snapshot.generation >= generation, timeout)
+        return self._snapshot
+
+    # -- watching ----------------------------------------------------------
+
+    def _watch(self, name: str) -> None:
+        wd = self._inotify.add(self.skills_dir / name, _SKILL_MASK)
+        if wd is not None and wd != self._root_wd:
+            self._watches[wd] = name
+
+    def _start_inotify(self) -> bool:
+        if not self.use_inotify:
+            return False
+        try:
+            self._inotify = _Inotify()
+        except (OSError, AttributeError):
+            return False
+        self._root_wd = self._inotify.add(self.skills_dir, _ROOT_MASK)
+        if self._root_wd is None:
+            self._inotify.close()
+            self._inotify = None
+            return False
+        return True
+
+    def _run_inotify(self) -> None:
+        while not self._stop.is_set():
+            events = self._inotify.read(self.poll_interval)
+            if events is None:
+                return
+            if not events:
+                continue
+            self._stop.wait(DEBOUNCE_SECONDS)
+            more = self._inotify.read(0) or []
+            dirty: set[str] = set()
+            rescan = False
+            for wd, mask, name in events + more:
+                if mask & IN_Q_OVERFLOW:
+                    rescan = True
+                elif wd == self._root_wd:
+                    dirty.add(name)
+                    if mask & (IN_CREATE | IN_MOVED_TO) and not name.startswith("."):
+                        # watch before reloading so a SKILL.md written meanwhile is seen
+                        self._watch(name)
+                elif mask & IN_IGNORED:
+                    self._watches.pop(wd, None)
+                elif wd in self._watches:
+                    dirty.add(self._watches[wd])
+            self.refresh(None if rescan else dirty)
+
+    def _run_poll(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            self.refresh()
+
+    def start(self) -> "SkillRegistry":
+        """Load the registry and start following changes on a background thread."""
+        if self._thread is not None:
+            return self
+        self._stop.clear()
+        watching = self._start_inotify()
+        self.mode = "inotify" if watching else "poll"
+        if watching:
+            for name in self._listdir():
+                self._watch(name)
+        self.refresh()
+        self._thread = threading.Thread(
+            target=self._run_inotify if watching else self._run_poll,
+            name="skillhub-registry",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop following changes; the last snapshot stays readable."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+            self._watches.clear()
+
+    def __enter__(self) -> "SkillRegistry":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
@@ -0,0 +1,467 @@
+"""Remote index access and artifact installation for the skillhub CLI."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Mapping, Optional
+
+from client.defaults import DEFAULT_INDEX_URL, DEFAULT_MAX_AGE, default_cache_dir
+from client.download import DEFAULT_MAX_BYTES, DownloadError, download
+from client.extract import safe_extract
+from client.store import ArtifactStore
+from client.swap import fsync_tree, remove_later, swap_dir, sweep_stale
+
+# the SKILL.md ``name`` pattern in schemas/skill.schema.json
+SLUG_RE = re.compile(r"[a-z0-9][a-z0-9-]*")
+
+
+class RemoteError(Exception):
+    """Raised when the remote index cannot be fetched and no cached copy applies."""
+
+
+class InstallError(Exception):
+    """Raised when a skill artifact cannot be downloaded, verified or extracted."""
+
+
+@dataclass
+class InstallResult:
+    """Outcome of installing one index entry."""
+
+    slug: str
+    ok: bool
+    path: Optional[Path] = None
+    version: str = ""
+    sha256: str = ""
+    error: str = ""
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class IndexCache:
+    """index.json bodies stored with their ETag/Last-Modified validators.
+
+    Each URL maps to ``<key>.body`` (raw response) and ``<key>.meta.json``
+    (validators plus fetch time) under ``<cache_dir>/index/``.
+    """
+
+    def __init__(self, cache_dir: str | Path | None = None) -> None:
+        self.root = Path(cache_dir or default_cache_dir()) / "index"
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode()).hexdigest()[:32]
+        return self.root / f"{key}.body", self.root / f"{key}.meta.json"
+
+    def load(self, url: str) -> tuple[Optional[bytes], dict]:
+        """Return ``(body, meta)``; body is None when nothing usable is cached."""
+        body_path, meta_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None, {}
+        if not isinstance(meta, dict) or meta.get("url") != url:
+            return None, {}
+        return body, meta
+
+    def store(self, url: str, body: bytes, headers: Optional[Mapping[str, str]]) -> None:
+        body_path, meta_path = self._paths(url)
+        meta = {"url": url, "fetched_at": time.time()}
+        if headers is not None:
+            meta["etag"] = headers.get("ETag")
+            meta["last_modified"] = headers.get("Last-Modified")
+        _atomic_write(body_path, body)
+        _atomic_write(meta_path, json.dumps(meta).encode())
+
+    def touch(self, url: str, meta: dict) -> None:
+        """Mark a cached body as freshly revalidated."""
+        _, meta_path = self._paths(url)
+        _atomic_write(meta_path, json.dumps({**meta, "fetched_at": time.time()}).encode())
+
+    def _shard_path(self, sha256: str) -> Path:
+        return self.root / "shards" / f"{sha256}.json"
+
+    def load_shard(self, sha256: str) -> Optional[bytes]:
+        """Return a cached v2 shard; shards are immutable, so no revalidation is needed."""
+        try:
+            return self._shard_path(sha256).read_bytes()
+        except OSError:
+            return None
+
+    def store_shard(self, sha256: str, body: bytes) -> None:
+        _atomic_write(self._shard_path(sha256), body)
+
+
+def fetch_index(
+    url: str = DEFAULT_INDEX_URL,
+    *,
+    cache: Optional[IndexCache] = None,
+    max_age: float = DEFAULT_MAX_AGE,
+    offline: bool = False,
+) -> dict:
+    """Download and decode the remote index.json.
+
+    With a *cache*, a copy younger than *max_age* seconds is returned without
+    touching the network; older copies are revalidated with If-None-Match /
+    If-Modified-Since. *offline* serves the cached copy regardless of age. If
+    the network fails, a stale cached copy is used rather than failing.
+    """
+    if cache is None:
+        if offline:
+            raise RemoteError("offline mode requires the index cache")
+        with urllib.request.urlopen(url) as r:
+            return json.loads(r.read().decode())
+
+    body, meta = cache.load(url)
+    if body is not None and (offline or time.time() - meta.get("fetched_at", 0) < max_age):
+        return json.loads(body.decode())
+    if offline:
+        raise RemoteError(f"no cached index for {url} (offline)")
+
+    req = urllib.request.Request(url)
+    if body is not None:
+        if meta.get("etag"):
+            req.add_header("If-None-Match", meta["etag"])
+        if meta.get("last_modified"):
+            req.add_header("If-Modified-Since", meta["last_modified"])
+    try:
+        with urllib.request.urlopen(req) as r:
+            fresh = r.read()
+            headers = r.headers
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and body is not None:
+            cache.touch(url, meta)
+            return json.loads(body.decode())
+        if body is None:
+            raise
+        return json.loads(body.decode())
+    except OSError:
+        if body is None:
+            raise
+        return json.loads(body.decode())
+    idx = json.loads(fresh.decode())
+    cache.store(url, fresh, headers)
+    return idx
+
+
+class RemoteIndex:
+    """A fetched index in either format, read without caring which.
+
+    A version 1 index already holds every entry. For version 2 (see
+    :mod:`client.shards`) only the shards a lookup needs are downloaded,
+    verified against the root manifest, and cached by content hash.
+    """
+
+    def __init__(
+        self, root: dict, url: str = DEFAULT_INDEX_URL, cache: Optional[IndexCache] = None, offline: bool = False
+    ) -> None:
+        self.root = root
+        self.url = url
+        self.cache = cache
+        self.offline = offline
+        self.version = root.get("version", 1)
+        if self.version not in (1, 2):
+            raise RemoteError(f"unsupported index version {self.version!r} at {url}")
+        self._shards: dict[str, list[dict]] = {}
+
+    def search_index_url(self) -> str:
+        """Where the hub publishes its search index (see :mod:`client.search`)."""
+        from client.search import search_index_url
+
+        if self.root.get("search_index"):
+            return urllib.parse.urljoin(self.url, self.root["search_index"])
+        return search_index_url(self.url)
+
+    def _load_shard(self, key: str) -> list[dict]:
+        from client.shards import ShardError, parse_shard
+
+        info = self.root["shards"][key]
+        sha = info["sha256"]
+        body = self.cache.load_shard(sha) if self.cache is not None else None
+        if body is not None:
+            try:
+                return parse_shard(body, sha)
+            except ShardError:
+                pass  # damaged cache entry: fetch it again
+        if self.offline:
+            raise RemoteError(f"shard {key!r} of {self.url} is not cached (offline)")
+        with urllib.request.urlopen(urllib.parse.urljoin(self.url, info["path"])) as r:
+            body = r.read()
+        try:
+            entries = parse_shard(body, sha)
+        except ShardError as e:
+            raise RemoteError(f"shard {key!r}: {e}") from e
+        if self.cache is not None:
+            self.cache.store_shard(sha, body)
+        return entries
+
+    def _shards_for(self, keys: Iterable[str]) -> list[dict]:
+        keys = [k for k in dict.fromkeys(keys) if k in self.root["shards"]]
+        missing = [k for k in keys if k not in self._shards]
+        if len(missing) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(missing))) as ex:
+                self._shards.update(zip(missing, ex.map(self._load_shard, missing)))
+        elif missing:
+            self._shards[missing[0]] = self._load_shard(missing[0])
+        return [e for k in keys for e in self._shards[k]]
+
+    def entries(self, slugs: Optional[Iterable[str]] = None) -> list[dict]:
+        """Entries for *slugs* (unknown slugs are left out), or every entry."""
+        if self.version < 2:
+            everything = self.root.get("skills", [])
+            if slugs is None:
+                return list(everything)
+            wanted = set(slugs)
+            return [e for e in everything if e["slug"] in wanted]
+        from client.shards import shard_key
+
+        if slugs is None:
+            return self._shards_for(self.root["shards"])
+        wanted = set(slugs)
+        prefix_len = self.root.get("prefix_len", 1)
+        found = self._shards_for(shard_key(s, prefix_len) for s in sorted(wanted))
+        return [e for e in found if e["slug"] in wanted]
+
+    def entry(self, slug: str) -> Optional[dict]:
+        """The entry for *slug*, or None; fetches at most one shard."""
+        found = self.entries([slug])
+        return found[0] if found else None
+
+    def tagged(self, tag: str) -> list[dict]:
+        """Entries carrying *tag*; for v2, only shards the manifest lists for it are fetched."""
+        tag = tag.lower()
+        if self.version < 2:
+            candidates = self.root.get("skills", [])
+        else:
+            candidates = self._shards_for(self.root.get("tags", {}).get(tag, []))
+        return [e for e in candidates if tag in (str(t).lower() for t in e.get("tags") or [])]
+
+
+def open_index(
+    url: str = DEFAULT_INDEX_URL,
+    *,
+    cache: Optional[IndexCache] = None,
+    max_age: float = DEFAULT_MAX_AGE,
+    offline: bool = False,
+) -> RemoteIndex:
+    """Fetch the index (or a v2 root manifest) at *url*, as :func:`fetch_index` does."""
+    return RemoteIndex(fetch_index(url, cache=cache, max_age=max_age, offline=offline), url, cache, offline)
+
+
+def fetch_artifact(
+    entry: dict, store: ArtifactStore, max_bytes: int = DEFAULT_MAX_BYTES
+) -> tuple[Path, str]:
+    """Return a verified local copy of *entry*'s artifact and its SHA-256.
+
+    A store hit for the index's ``sha256`` skips the network entirely. Misses
+    are streamed into the store (hashing on the fly, resuming a previous
+    partial download of the same digest) and refused beyond *max_bytes*.
+    Concurrent fetches of the same digest wait for each other rather than
+    writing the same partial file.
+    """
+    expected = entry.get("sha256")
+    if not expected:
+        tmp = store.tempfile()
+        try:
+            digest = download(entry["download_url"], tmp, max_bytes=max_bytes)
+        except DownloadError as e:
+            tmp.unlink(missing_ok=True)
+            raise InstallError(str(e)) from e
+        return store.put(digest, tmp), digest
+    blob = store.get(expected)
+    if blob is not None:
+        return blob, expected
+    # concurrent fetches of one digest share its resumable .incoming file: one at a time
+    with store.incoming(expected):
+        blob = store.get(expected)
+        if blob is not None:
+            return blob, expected  # another downloader finished while we waited
+        tmp = store.tempfile(expected)
+        try:
+            digest = download(
+                entry["download_url"], tmp, expected_sha256=expected, max_bytes=max_bytes
+            )
+        except DownloadError as e:
+            raise InstallError(str(e)) from e
+        return store.put(digest, tmp), digest
+
+
+def check_slug(slug: object, skills_dir: Path) -> None:
+    """Reject an index slug that is not a skill name or would land outside *skills_dir*."""
+    if not isinstance(slug, str) or not SLUG_RE.fullmatch(slug):
+        raise InstallError(f"invalid slug {slug!r} in index")
+    root = Path(skills_dir).resolve()
+    if (root / slug).resolve().parent != root:
+        raise InstallError(f"slug {slug!r} resolves outside {skills_dir}")
+
+
+@dataclass
+class StagedSkill:
+    """An extracted skill tree waiting in a hidden work dir next to its target."""
+
+    slug: str
+    workdir: Path
+    tree: Path
+    sha256: str
+
+    def cleanup(self, wait: bool = True) -> None:
+        """Remove the work dir (and any displaced tree in it), optionally in the background."""
+        if wait:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+        else:
+            remove_later(self.workdir)
+
+
+def _stage_delta(entry: dict, skills_dir: Path) -> Optional[StagedSkill]:
+    """Stage an upgrade of an installed skill from changed zip members only.
+
+    Returns None whenever a delta is not possible (no range support, too much
+    changed, verification failure, ...) so the caller falls back to a full
+    download.
+    """
+    from client.delta import DeltaUnavailable, fetch_manifest, stage_delta
+
+    slug = entry["slug"]
+    try:
+        manifest = fetch_manifest(entry["manifest_url"], entry["manifest_sha256"])
+        digest = entry.get("sha256") or manifest["archive_sha256"]
+        if manifest["archive_sha256"] != digest:
+            return None  # manifest describes a different build than the one recorded
+        workdir, tree = stage_delta(
+            entry["download_url"], manifest, skills_dir / slug, skills_dir, slug
+        )
+    except (DeltaUnavailable, OSError, ValueError, KeyError):
+        return None
+    return StagedSkill(slug, workdir, tree, digest)
+
+
+def stage_entry(
+    entry: dict,
+    skills_dir: Path,
+    store: ArtifactStore,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> StagedSkill:
+    """Fetch and extract *entry* into a work dir inside *skills_dir*.
+
+    Staging on the target's filesystem lets the final swap be a rename; the
+    staged tree is fsynced before it is returned. When the skill is already
+    installed and the entry has a ``manifest_url`` and ``manifest_sha256``,
+    only changed files are fetched (see :mod:`client.delta`); an unverifiable
+    manifest is never used.
+    """
+    slug = entry["slug"]
+    check_slug(slug, skills_dir)
+    sweep_stale(skills_dir)
+    if entry.get("manifest_url") and entry.get("manifest_sha256") and (skills_dir / slug).is_dir():
+        staged = _stage_delta(entry, skills_dir)
+        if staged is not None:
+            try:
+                fsync_tree(staged.tree)
+            except BaseException:
+                staged.cleanup()
+                raise
+            return staged
+    archive, digest = fetch_artifact(entry, store, max_bytes)
+    skills_dir.mkdir(parents=True, exist_ok=True)
+    workdir = Path(tempfile.mkdtemp(prefix=f".staging-{slug}-", dir=skills_dir))
+    try:
+        extracted = workdir / "extracted"
+        extracted.mkdir()
+        try:
+            safe_extract(archive, extracted)
+        except Exception as e:
+            raise InstallError(f"Extraction failed: {e}") from e
+        top = sorted(p.name for p in extracted.iterdir())
+        if len(top) == 1 and top[0] == slug and (extracted / slug).is_dir():
+            tree = extracted / slug
+        else:
+            tree = extracted
+        fsync_tree(tree)
+    except BaseException:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise
+    return StagedSkill(slug, workdir, tree, digest)
+
+
+def swap_in(staged: StagedSkill, target_dir: Path) -> Optional[Path]:
+    """Atomically exchange *staged*'s tree into *target_dir*, returning the old tree.
+
+    The previous tree (if any) is moved into the work dir rather than deleted,
+    so the caller can roll back with :func:`roll_back` until it calls cleanup().
+    """
+    return swap_dir(staged.tree, target_dir, staged.workdir / "previous")
+
+
+def roll_back(staged: StagedSkill, target_dir: Path, backup: Optional[Path]) -> None:
+    """Undo :func:`swap_in`, restoring *backup* (or removing a fresh install)."""
+    discarded = staged.workdir / "discarded"
+    if backup is not None:
+        swap_dir(backup, target_dir, discarded)
+    elif os.path.lexists(target_dir):
+        os.rename(target_dir, discarded)
+
+
+def install_entry(
+    entry: dict,
+    skills_dir: Path,
+    store: Optional[ArtifactStore] = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> tuple[Path, str]:
+    """Download, verify and extract one index entry into skills_dir/<slug>.
+
+    Returns the installed path and the artifact's SHA-256.
+    """
+    store = store or ArtifactStore(default_cache_dir() / "artifacts")
+    staged = stage_entry(entry, skills_dir, store, max_bytes)
+    target_dir = skills_dir / staged.slug
+    try:
+        swap_in(staged, target_dir)
+    except BaseException:
+        staged.cleanup()
+        raise
+    staged.cleanup(wait=False)
+    return target_dir, staged.sha256
+
+
+def install_many(
+    entries: Iterable[dict],
+    skills_dir: Path,
+    jobs: int = 4,
+    store: Optional[ArtifactStore] = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> list[InstallResult]:
+    """Install *entries* on a bounded thread pool; results keep the input order."""
+    entries = list(entries)
+    store = store or ArtifactStore(default_cache_dir() / "artifacts")
+
+    def run(entry: dict) -> InstallResult:
+        slug = entry["slug"]
+        try:
+            path, digest = install_entry(entry, skills_dir, store, max_bytes)
+        except Exception as e:
+            return InstallResult(slug, False, error=str(e))
+        return InstallResult(slug, True, path, version=entry.get("version", ""), sha256=digest)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(entries) or 1))) as ex:
+        return list(ex.map(run, entries))
@@ -0,0 +1,260 @@
+"""BM25 full-text and tag search over the skill index.
+
+``search-index.json`` sits next to ``index.json`` and is rebuilt whenever the
+index is (``scripts/pack_skill.py --all``). It holds an inverted index over
+each skill's name, tags, description and SKILL.md body, so a query touches
+only the posting lists of its own terms — no scan of the catalog and no
+frontmatter parsing.
+
+Format (version 1)::
+
+    {"version": 1, "k1": 1.2, "b": 0.75, "scale": 1000,
+     "docs":  [[slug, name, version, description], ...],
+     "tags":  {"github": [0, 2], ...},
+     "terms": {"review": [0, 1834, 2, 702], ...}}
+
+``terms`` maps each token, in sorted order, to a flat list of
+``doc-id delta, impact`` pairs, where the impact is the token's BM25 score
+for that skill times ``scale``, rounded. Scoring is done when the index is
+built, so a query only adds integers. A field's tokens count
+:data:`FIELD_WEIGHTS` times, which ranks a name hit above a body hit.
+
+A query does not walk whole posting lists. Each list it touches is decoded
+once into impact order and kept, and the top *limit* are found with the
+threshold algorithm: the lists are read in step from their highest impacts,
+and reading stops as soon as the impacts still unread cannot add up to more
+than the current *limit*-th best score.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import re
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+SEARCH_INDEX_NAME = "search-index.json"
+FORMAT_VERSION = 1
+FIELD_WEIGHTS = {"name": 3, "tags": 2, "description": 1, "body": 1}
+K1 = 1.2
+B = 0.75
+SCALE = 1000
+# a query token missing from the vocabulary matches at most this many terms it prefixes
+MAX_PREFIX_TERMS = 32
+# decoded posting lists kept per loaded index
+POSTINGS_CACHE_SIZE = 1024
+
+_TOKEN = re.compile("[0-9a-z]+|[\u3400-\u9fff\uf900-\ufaff]")
+
+
+class SearchHit(NamedTuple):
+    slug: str
+    score: float
+    name: str
+    version: str
+    description: str
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase alphanumeric runs; CJK ideographs are one token each."""
+    return _TOKEN.findall(text.lower())
+
+
+def build_search_index(docs: Iterable[dict]) -> dict:
+    """Build the search index from index.json-style entries.
+
+    Each entry needs ``slug`` and may carry ``name``, ``version``,
+    ``description``, ``tags`` and ``body`` (the SKILL.md markdown).
+    """
+    rows: list[list] = []
+    lengths: list[int] = []
+    tags: dict[str, list[int]] = {}
+    postings: dict[str, list[tuple[int, int]]] = {}
+    for doc_id, entry in enumerate(sorted(docs, key=lambda e: e["slug"])):
+        tf: dict[str, int] = {}
+        length = 0
+        entry_tags = [str(t).lower() for t in entry.get("tags") or []]
+        fields = {
+            "name": f"{entry['slug']} {entry.get('name', '')}",
+            "tags": " ".join(entry_tags),
+            "description": entry.get("description") or "",
+            "body": entry.get("body") or "",
+        }
+        for field, text in fields.items():
+            weight = FIELD_WEIGHTS[field]
+            for token in tokenize(text):
+                tf[token] = tf.get(token, 0) + weight
+                length += weight
+        for tag in dict.fromkeys(entry_tags):
+            tags.setdefault(tag, []).append(doc_id)
+        for token, freq in tf.items():
+            postings.setdefault(token, []).append((doc_id, freq))
+        rows.append([entry["slug"], entry.get("name", ""), entry.get("version", ""), entry.get("description", "")])
+        lengths.append(length)
+
+    n = len(rows)
+    avgdl = (sum(lengths) / n if n else 0.0) or 1.0
+    terms: dict[str, list[int]] = {}
+    for token in sorted(postings):
+        docs_with = postings[token]
+        idf = math.log(1 + (n - len(docs_with) + 0.5) / (len(docs_with) + 0.5))
+        flat, prev = [], 0
+        for doc_id, freq in docs_with:
+            norm = K1 * (1 - B + B * lengths[doc_id] / avgdl)
+            flat += (doc_id - prev, max(1, round(SCALE * idf * freq * (K1 + 1) / (freq + norm))))
+            prev = doc_id
+        terms[token] = flat
+    return {
+        "version": FORMAT_VERSION,
+        "k1": K1,
+        "b": B,
+        "scale": SCALE,
+        "docs": rows,
+        "tags": dict(sorted(tags.items())),
+        "terms": terms,
+    }
+
+
+def index_documents(index: dict, skills_dir: Optional[Path] = None) -> list[dict]:
+    """index.json entries, each with its SKILL.md ``body`` when *skills_dir* has one."""
+    from client.frontmatter import read_body
+
+    docs = []
+    for entry in index.get("skills", []):
+        doc = dict(entry)
+        if skills_dir is not None:
+            skill_md = Path(skills_dir) / entry["slug"] / "SKILL.md"
+            if skill_md.is_file():
+                doc["body"] = read_body(skill_md)
+        docs.append(doc)
+    return docs
+
+
+def search_index_path(index_path: Path) -> Path:
+    return Path(index_path).with_name(SEARCH_INDEX_NAME)
+
+
+def search_index_url(index_url: str) -> str:
+    """The search index URL for an index.json URL: same directory, sibling file."""
+    return index_url.rsplit("/", 1)[0] + "/" + SEARCH_INDEX_NAME
+
+
+def write_search_index(index_path: Path, skills_dir: Optional[Path] = None) -> Path:
+    """Rebuild ``search-index.json`` next to *index_path*; return its path."""
+    index = json.loads(Path(index_path).read_text(encoding="utf-8"))
+    data = build_search_index(index_documents(index, skills_dir))
+    out = search_index_path(index_path)
+    out.write_text(
+        json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n", encoding="utf-8"
+    )
+    return out
+
+
+class SearchIndex:
+    """A loaded search index; :meth:`search` ranks skills with BM25."""
+
+    def __init__(self, data: dict) -> None:
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"unsupported search index version {data.get('version')!r}")
+        self.docs: list[list] = data["docs"]
+        self.tags: dict[str, list[int]] = data["tags"]
+        self.terms: dict[str, list[int]] = data["terms"]
+        self.scale = data.get("scale", SCALE)
+        self._vocab: Optional[list[str]] = None
+        self._postings: dict[str, tuple[list[tuple[int, int]], dict[int, int]]] = {}
+
+    @classmethod
+    def load(cls, path: str | Path) -> "SearchIndex":
+        return cls(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def _expand(self, token: str) -> list[str]:
+        if token in self.terms:
+            return [token]
+        if self._vocab is None:
+            # written in sorted order, so no sort is needed
+            self._vocab = list(self.terms)
+        found = []
+        i = bisect_left(self._vocab, token)
+        while i < len(self._vocab) and self._vocab[i].startswith(token) and len(found) < MAX_PREFIX_TERMS:
+            found.append(self._vocab[i])
+            i += 1
+        return found
+
+    def _decoded(self, term: str) -> tuple[list[tuple[int, int]], dict[int, int]]:
+        """``([(impact, doc_id)] by impact descending, {doc_id: impact})`` for *term*."""
+        cached = self._postings.get(term)
+        if cached is None:
+            flat = self.terms[term]
+            impacts: dict[int, int] = {}
+            doc_id = 0
+            for i in range(0, len(flat), 2):
+                doc_id += flat[i]
+                impacts[doc_id] = flat[i + 1]
+            ranked = sorted(((v, d) for d, v in impacts.items()), key=lambda p: (-p[0], p[1]))
+            cached = (ranked, impacts)
+            if len(self._postings) >= POSTINGS_CACHE_SIZE:
+                self._postings.clear()
+            self._postings[term] = cached
+        return cached
+
+    def _hit(self, doc_id: int, score: int) -> SearchHit:
+        slug, name, version, description = self.docs[doc_id]
+        return SearchHit(slug, score / self.scale, name, version, description)
+
+    def search(self, query: str, tags: Iterable[str] = (), limit: int = 10) -> list[SearchHit]:
+        """The *limit* best matches for *query* among skills carrying every tag in *tags*.
+
+        With an empty query, every skill with those tags is returned by slug.
+        Ties are broken by slug.
+        """
+        if limit <= 0:
+            return []
+        allowed: Optional[set[int]] = None
+        for tag in tags:
+            ids = set(self.tags.get(tag.lower(), ()))
+            allowed = ids if allowed is None else allowed & ids
+            if not allowed:
+                return []
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            if allowed is None:
+                return []
+            return [self._hit(d, 0) for d in sorted(allowed)[:limit]]
+
+        # a term reached through several query tokens counts once per token
+        weights: dict[str, int] = {}
+        for token in tokens:
+            for term in self._expand(token):
+                weights[term] = weights.get(term, 0) + 1
+        lists = [(*self._decoded(term), w) for term, w in weights.items()]
+        getters = [(imp.get, w) for _, imp, w in lists]
+
+        # min-heap of the best (score, -doc_id) so far; its root is the one to beat
+        best: list[tuple[int, int]] = []
+        seen: set[int] = set()
+        depth = 0
+        while True:
+            bound = 0
+            for ranked, _, w in lists:
+                if depth >= len(ranked):
+                    continue
+                impact, doc_id = ranked[depth]
+                bound += impact * w
+                if doc_id in seen or (allowed is not None and doc_id not in allowed):
+                    continue
+                seen.add(doc_id)
+                score = 0
+                for get, k in getters:
+                    score += get(doc_id, 0) * k
+                if len(best) < limit:
+                    heapq.heappush(best, (score, -doc_id))
+                elif (score, -doc_id) > best[0]:
+                    heapq.heapreplace(best, (score, -doc_id))
+            # a skill not seen yet scores at most *bound*
+            if not bound or (len(best) == limit and best[0][0] > bound):
+                break
+            depth += 1
+        return [self._hit(-d, s) for s, d in sorted(best, reverse=True)]
@@ -0,0 +1,127 @@
+"""Index format v2: a small root manifest plus content-addressed shards.
+
+The flat ``index.json`` (version 1) must be downloaded and parsed whole even
+to find one slug. Version 2 splits the same entries into shards keyed by
+slug prefix; the root manifest lists each shard's path, SHA-256 and size,
+and which shards hold each tag::
+
+    {"version": 2, "updated_at": "...", "count": 120,
+     "shard_by": "prefix", "prefix_len": 1,
+     "shards": {"p": {"path": "shards/3f2a9c0d1e4b5a67.json", "sha256": "3f2a...", "count": 9}},
+     "tags": {"github": ["p"]}, "search_index": "../search-index.json"}
+
+Shard files are named after their content hash, so a client can cache them
+forever and only ever re-downloads the root.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+INDEX_V2 = 2
+DEFAULT_PREFIX_LEN = 1
+ROOT_NAME = "root.json"
+SHARD_DIR = "shards"
+
+
+class ShardError(ValueError):
+    """Raised when a shard does not match the checksum in the root manifest."""
+
+
+def shard_key(slug: str, prefix_len: int = DEFAULT_PREFIX_LEN) -> str:
+    """The shard holding *slug*: its first *prefix_len* characters, ``_`` for non-alphanumerics."""
+    return "".join(c if c.isascii() and c.isalnum() else "_" for c in slug[:prefix_len].lower()) or "_"
+
+
+def _dumps(data: dict) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode()
+
+
+def build_shards(index: dict, prefix_len: int = DEFAULT_PREFIX_LEN) -> tuple[dict, dict[str, bytes]]:
+    """Split a version 1 *index* into ``(root manifest, {relative path: shard bytes})``."""
+    groups: dict[str, list[dict]] = {}
+    for entry in index.get("skills", []):
+        groups.setdefault(shard_key(entry["slug"], prefix_len), []).append(entry)
+
+    shards: dict[str, dict] = {}
+    files: dict[str, bytes] = {}
+    tags: dict[str, set[str]] = {}
+    for key in sorted(groups):
+        entries = sorted(groups[key], key=lambda e: e["slug"])
+        body = _dumps({"version": INDEX_V2, "shard": key, "skills": entries})
+        sha = hashlib.sha256(body).hexdigest()
+        path = f"{SHARD_DIR}/{sha[:16]}.json"
+        files[path] = body
+        shards[key] = {"path": path, "sha256": sha, "count": len(entries)}
+        for entry in entries:
+            for tag in entry.get("tags") or []:
+                tags.setdefault(str(tag).lower(), set()).add(key)
+
+    root = {
+        "version": INDEX_V2,
+        "updated_at": index.get("updated_at", ""),
+        "count": sum(s["count"] for s in shards.values()),
+        "shard_by": "prefix",
+        "prefix_len": prefix_len,
+        "shards": shards,
+        "tags": {t: sorted(keys) for t, keys in sorted(tags.items())},
+    }
+    return root, files
+
+
+def _replace(path: Path, data: bytes) -> None:
+    """Write *data* to a temp file beside *path*, then rename it over *path*."""
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write_shards(
+    index_path: Path,
+    out_dir: Path,
+    prefix_len: int = DEFAULT_PREFIX_LEN,
+    search_index: Optional[Path] = None,
+) -> Path:
+    """Write *out_dir*/root.json and its shards from *index_path*; drop stale shards.
+
+    A *search_index* file is linked from the root by its path relative to *out_dir*.
+    """
+    index = json.loads(Path(index_path).read_text(encoding="utf-8"))
+    root, files = build_shards(index, prefix_len)
+    out_dir = Path(out_dir)
+    if search_index is not None:
+        root["search_index"] = Path(os.path.relpath(search_index, out_dir)).as_posix()
+    (out_dir / SHARD_DIR).mkdir(parents=True, exist_ok=True)
+    for rel, body in files.items():
+        path = out_dir / rel
+        if not path.exists():
+            _replace(path, body)
+    root_path = out_dir / ROOT_NAME
+    # shards first, then the root, then cleanup, each file renamed into place whole:
+    # a reader never sees a truncated root or one naming a missing shard
+    _replace(root_path, (json.dumps(root, indent=2, ensure_ascii=False) + "\n").encode())
+    for stale in (out_dir / SHARD_DIR).glob("*.json"):
+        if f"{SHARD_DIR}/{stale.name}" not in files:
+            os.unlink(stale)
+    return root_path
+
+
+def parse_shard(body: bytes, sha256: str) -> list[dict]:
+    """Verify *body* against the manifest checksum and return its entries."""
+    actual = hashlib.sha256(body).hexdigest()
+    if actual != sha256:
+        raise ShardError(f"shard checksum mismatch: expected {sha256}, got {actual}")
+    return json.loads(body.decode())["skills"]
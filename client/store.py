@@ -0,0 +1,200 @@
+"""Content-addressed stores: downloaded artifacts (with an LRU size cap) and skill trees."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: no cross-process download lock
+    fcntl = None
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+# partial downloads older than this are assumed abandoned and removed by gc()
+STALE_INCOMING_SECONDS = 24 * 3600
+
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+@dataclass
+class StoreStats:
+    """Summary of the artifact store's contents."""
+
+    root: Path
+    count: int
+    total_bytes: int
+    max_bytes: int
+
+
+class ArtifactStore:
+    """Downloaded artifacts stored as ``<root>/<sha[:2]>/<sha>``.
+
+    Blobs are only added after their digest has been verified, via an atomic
+    rename, so a present blob is trusted. Hits bump the blob's mtime, which is
+    the recency used for LRU eviction once the store exceeds *max_bytes*.
+    """
+
+    def __init__(self, root: str | Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    def _blob(self, sha256: str) -> Path:
+        if not _SHA256_RE.match(sha256):
+            raise ValueError(f"not a sha256 hex digest: {sha256!r}")
+        return self.root / sha256[:2] / sha256
+
+    def get(self, sha256: str) -> Optional[Path]:
+        """Return the blob path for *sha256* (marking it recently used), or None."""
+        blob = self._blob(sha256)
+        try:
+            os.utime(blob)
+        except FileNotFoundError:
+            return None
+        return blob
+
+    def put(self, sha256: str, src: str | Path) -> Path:
+        """Move the verified file *src* into the store and return its blob path."""
+        blob = self._blob(sha256)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(src, blob)
+        self.gc(keep=blob)
+        return blob
+
+    def tempfile(self, sha256: Optional[str] = None) -> Path:
+        """Return a path on the store's filesystem to download into.
+
+        With a known *sha256* the path is stable, so an interrupted download can
+        be resumed by a later run; hold :meth:`incoming` while writing to it.
+        Otherwise it is a fresh unique file.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        if sha256:
+            return self.root / f".incoming-{self._blob(sha256).name}"
+        fd, tmp = tempfile.mkstemp(prefix=".incoming-", dir=self.root)
+        os.close(fd)
+        return Path(tmp)
+
+    @contextmanager
+    def incoming(self, sha256: str) -> Iterator[None]:
+        """Hold the download lock for *sha256*.
+
+        Threads and processes fetching the same digest queue here, so only one
+        writes (or resumes) its ``.incoming-`` file at a time; the others should
+        re-check :meth:`get` once they get the lock.
+        """
+        if fcntl is None:
+            yield
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / f".incoming-{self._blob(sha256).name}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _blobs(self) -> list[tuple[float, int, Path]]:
+        found = []
+        if not self.root.is_dir():
+            return found
+        for sub in self.root.iterdir():
+            if not sub.is_dir():
+                continue
+            for blob in sub.iterdir():
+                try:
+                    st = blob.stat()
+                except FileNotFoundError:
+                    continue
+                found.append((st.st_mtime, st.st_size, blob))
+        return found
+
+    def stats(self) -> StoreStats:
+        blobs = self._blobs()
+        return StoreStats(self.root, len(blobs), sum(size for _, size, _ in blobs), self.max_bytes)
+
+    def gc(self, max_bytes: Optional[int] = None, keep: Optional[Path] = None) -> list[Path]:
+        """Evict least-recently-used blobs until the store fits in *max_bytes*.
+
+        *keep* is never evicted (the blob a caller is about to use). Returns the
+        evicted paths.
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        if self.root.is_dir():
+            cutoff = time.time() - STALE_INCOMING_SECONDS
+            for tmp in self.root.glob(".incoming-*"):
+                try:
+                    if tmp.stat().st_mtime < cutoff:
+                        tmp.unlink()
+                except FileNotFoundError:
+                    pass
+        blobs = sorted(self._blobs())
+        total = sum(size for _, size, _ in blobs)
+        evicted: list[Path] = []
+        for _, size, blob in blobs:
+            if total <= limit:
+                break
+            if blob == keep:
+                continue
+            try:
+                blob.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted.append(blob)
+        return evicted
+
+
+def tree_digest(source: str | Path) -> str:
+    """SHA-256 over a directory's relative paths, exec bits and file contents."""
+    source = Path(source)
+    h = hashlib.sha256()
+    for path in sorted(p for p in source.rglob("*") if p.is_file()):
+        h.update(path.relative_to(source).as_posix().encode() + b"\0")
+        h.update(b"x" if os.stat(path).st_mode & 0o111 else b"-")
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class TreeStore:
+    """Read-only skill trees stored once as ``<root>/<digest>/``, shared by installs.
+
+    Files are made read-only on ingest so that trees hard-linked or
+    symlinked into many target directories cannot be edited through one of
+    them. Directories stay writable by the owner so entries can be removed.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def ingest(self, source: str | Path) -> Path:
+        """Copy *source* into the store unless an identical tree is already there."""
+        digest = tree_digest(source)
+        tree = self.root / digest
+        if tree.is_dir():
+            return tree
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=f".incoming-{digest[:12]}-", dir=self.root))
+        try:
+            shutil.copytree(source, tmp, dirs_exist_ok=True)
+            for path in tmp.rglob("*"):
+                if path.is_file():
+                    os.chmod(path, 0o555 if path.stat().st_mode & 0o111 else 0o444)
+            os.rename(tmp, tree)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not tree.is_dir():
+                raise
+            # a concurrent ingest of the same tree won the rename
+        return tree
@@ -0,0 +1,150 @@
+"""Crash-safe directory swaps: fsync a staged tree, then exchange it into place.
+
+On Linux the swap is a single ``renameat2(RENAME_EXCHANGE)``, so the target
+path always names a complete tree — readers see either the old or the new
+one, never a gap. Elsewhere (or on filesystems without exchange support) it
+falls back to two renames, leaving a window of one syscall where the target
+is missing. Displaced trees are removed on a background thread.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import errno
+import os
+import shutil
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+AT_FDCWD = -100
+RENAME_EXCHANGE = 1 << 1
+# staging dirs older than this are leftovers of a crashed run
+STALE_STAGING_SECONDS = 3600
+
+_UNSUPPORTED = {errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP}
+
+_pending: set[threading.Thread] = set()
+_pending_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _renameat2():
+    try:
+        fn = ctypes.CDLL(None, use_errno=True).renameat2
+    except (AttributeError, OSError):
+        return None
+    fn.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+    fn.restype = ctypes.c_int
+    return fn
+
+
+def exchange(a: str | Path, b: str | Path) -> bool:
+    """Atomically swap the paths *a* and *b*. Returns False if not supported here."""
+    fn = _renameat2()
+    if fn is None:
+        return False
+    if fn(AT_FDCWD, os.fsencode(a), AT_FDCWD, os.fsencode(b), RENAME_EXCHANGE) == 0:
+        return True
+    err = ctypes.get_errno()
+    if err in _UNSUPPORTED:
+        return False
+    raise OSError(err, os.strerror(err), str(a), None, str(b))
+
+
+def _fsync_path(path: str | Path, directory: bool = False) -> None:
+    fd = os.open(path, os.O_RDONLY | (getattr(os, "O_DIRECTORY", 0) if directory else 0))
+    try:
+        os.fsync(fd)
+    except OSError as e:
+        # some filesystems (and all directories on Windows) refuse fsync
+        if e.errno not in (errno.EINVAL, errno.EBADF, errno.EACCES):
+            raise
+    finally:
+        os.close(fd)
+
+
+def fsync_tree(root: str | Path) -> None:
+    """Flush every regular file and directory under *root* to disk."""
+    root = Path(root)
+    if root.is_symlink():
+        return
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if not os.path.islink(path):
+                _fsync_path(path)
+        _fsync_path(dirpath, directory=True)
+
+
+def swap_dir(new: Path, target: Path, backup: Path) -> Optional[Path]:
+    """Move the fully written tree *new* to *target*.
+
+    Any existing *target* ends up at *backup* (which must not exist) and that
+    path is returned; None means there was nothing to displace. The parent
+    directory is fsynced so the swap survives a crash.
+    """
+    if os.path.lexists(target):
+        if exchange(new, target):
+            os.rename(new, backup)
+        else:
+            os.rename(target, backup)
+            try:
+                os.rename(new, target)
+            except BaseException:
+                os.rename(backup, target)
+                raise
+        displaced: Optional[Path] = backup
+    else:
+        os.rename(new, target)
+        displaced = None
+    _fsync_path(target.parent, directory=True)
+    return displaced
+
+
+def remove_later(path: Path) -> threading.Thread:
+    """Delete *path* on a background thread so callers don't wait on rmtree.
+
+    The thread is not a daemon: the interpreter finishes the removal before
+    exiting. Anything left by a crash is swept by :func:`sweep_stale`.
+    """
+
+    def run() -> None:
+        try:
+            shutil.rmtree(path, ignore_errors=True)
+        finally:
+            with _pending_lock:
+                _pending.discard(thread)
+
+    thread = threading.Thread(target=run, name=f"skillhub-gc-{path.name}")
+    with _pending_lock:
+        _pending.add(thread)
+    thread.start()
+    return thread
+
+
+def wait_for_gc(timeout: Optional[float] = None) -> None:
+    """Block until every removal started by :func:`remove_later` has finished."""
+    with _pending_lock:
+        threads = list(_pending)
+    for thread in threads:
+        thread.join(timeout)
+
+
+def sweep_stale(parent: Path, prefix: str = ".staging-", max_age: float = STALE_STAGING_SECONDS) -> None:
+    """Remove ``<prefix>*`` work dirs in *parent* abandoned by crashed runs."""
+    cutoff = time.time() - max_age
+    try:
+        entries = list(os.scandir(parent))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        if not entry.name.startswith(prefix):
+            continue
+        try:
+            if entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,135 @@
+"""Incremental, transactional updates of installed skills against the remote index."""
+
+from __future__ import annotations
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from client.download import DEFAULT_MAX_BYTES
+from client.lockfile import LockFile
+from client.remote import StagedSkill, roll_back, stage_entry, swap_in
+from client.store import ArtifactStore
+
+_SEMVER_RE = re.compile(r"^v?(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:-([0-9A-Za-z.-]+))?(?:\+.*)?$")
+
+
+def version_key(version: str) -> tuple:
+    """Sort key following semver precedence; unparseable versions sort lowest."""
+    m = _SEMVER_RE.match(version.strip())
+    if not m:
+        return ((-1,), 0, ())
+    core = tuple(int(g or 0) for g in m.group(1, 2, 3))
+    pre = m.group(4)
+    if pre is None:
+        return (core, 1, ())
+    ids = tuple((0, int(p), "") if p.isdigit() else (1, 0, p) for p in pre.split("."))
+    return (core, 0, ids)
+
+
+@dataclass
+class PlannedUpdate:
+    """One installed skill whose index entry differs from the lockfile."""
+
+    slug: str
+    installed_version: str
+    entry: dict
+
+    @property
+    def remote_version(self) -> str:
+        return self.entry.get("version", "")
+
+    @property
+    def reason(self) -> str:
+        if self.installed_version != self.remote_version:
+            return "version"
+        return "checksum"
+
+
+def plan_updates(
+    installed: dict[str, dict[str, str]], index: dict, only: Optional[Iterable[str]] = None
+) -> list[PlannedUpdate]:
+    """Diff lockfile entries against *index* by semver and sha256.
+
+    A skill is updated when the index has a newer version, or the same version
+    with a different artifact checksum (a re-published build). Older index
+    versions are never installed over newer local ones.
+    """
+    wanted = set(only) if only is not None else None
+    by_slug = {s["slug"]: s for s in index.get("skills", [])}
+    plan: list[PlannedUpdate] = []
+    for slug, locked in sorted(installed.items()):
+        if wanted is not None and slug not in wanted:
+            continue
+        entry = by_slug.get(slug)
+        if entry is None:
+            continue
+        local_v, remote_v = locked.get("version", ""), entry.get("version", "")
+        newer = version_key(remote_v) > version_key(local_v)
+        same = version_key(remote_v) == version_key(local_v)
+        rebuilt = same and entry.get("sha256") and entry["sha256"] != locked.get("checksum")
+        if newer or rebuilt:
+            plan.append(PlannedUpdate(slug, local_v, entry))
+    return plan
+
+
+class UpdateError(Exception):
+    """Raised when an update transaction fails; no installed skill was changed."""
+
+
+def apply_updates(
+    plan: list[PlannedUpdate],
+    skills_dir: Path,
+    lockfile: LockFile,
+    store: ArtifactStore,
+    jobs: int = 4,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> None:
+    """Stage every update, swap them all in, then record them in one lockfile write.
+
+    Downloads and extraction happen in parallel into work dirs next to the
+    targets. Only when every skill staged cleanly are the trees renamed into
+    place; any failure during staging or swapping restores the previous trees
+    and raises :class:`UpdateError`.
+    """
+    if not plan:
+        return
+    staged: list[StagedSkill] = []
+    errors: list[str] = []
+
+    def stage(item: PlannedUpdate) -> Optional[StagedSkill]:
+        try:
+            return stage_entry(item.entry, skills_dir, store, max_bytes)
+        except Exception as e:
+            errors.append(f"{item.slug}: {e}")
+            return None
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(plan)))) as ex:
+            staged = [s for s in ex.map(stage, plan) if s is not None]
+        if errors:
+            raise UpdateError("; ".join(sorted(errors)))
+
+        swapped: list[tuple[StagedSkill, Optional[Path]]] = []
+        try:
+            for s in staged:
+                swapped.append((s, swap_in(s, skills_dir / s.slug)))
+            lockfile.add_entries(
+                {
+                    item.slug: {"version": item.remote_version, "checksum": s.sha256}
+                    for item, s in zip(plan, staged)
+                }
+            )
+        except Exception as e:
+            for s, backup in reversed(swapped):
+                roll_back(s, skills_dir / s.slug, backup)
+            raise UpdateError(f"swap failed, rolled back: {e}") from e
+    except BaseException:
+        for s in staged:
+            s.cleanup()
+        raise
+    # the displaced trees are only garbage now; readers already see the new ones
+    for s in staged:
+        s.cleanup(wait=False)
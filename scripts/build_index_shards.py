@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Build the sharded (version 2) index from the flat index.json.
+
+Usage:
+    python scripts/build_index_shards.py [--index index.json] [--out index] [--prefix-len 1]
+
+Writes ``<out>/root.json`` and ``<out>/shards/<hash>.json``; shards no longer
+referenced are removed. Clients read it with
+``skillhub --index-url <base>/index/root.json``. ``index.json`` itself is left
+untouched, so version 1 clients keep working.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from client.search import search_index_path  # noqa: E402
+from client.shards import DEFAULT_PREFIX_LEN, write_shards  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the sharded index from index.json.")
+    parser.add_argument("--index", type=Path, default=REPO_ROOT / "index.json")
+    parser.add_argument("--out", type=Path, default=REPO_ROOT / "index")
+    parser.add_argument(
+        "--prefix-len",
+        type=int,
+        default=DEFAULT_PREFIX_LEN,
+        help="Slug characters per shard key; raise it as the catalog grows.",
+    )
+    args = parser.parse_args()
+    if args.prefix_len < 1:
+        parser.error("--prefix-len must be at least 1")
+    if not args.index.exists():
+        print(f"{args.index} does not exist.")
+        sys.exit(2)
+
+    search = search_index_path(args.index)
+    root_path = write_shards(args.index, args.out, args.prefix_len, search if search.exists() else None)
+    root = json.loads(root_path.read_text(encoding="utf-8"))
+    print(f"Wrote {root_path}: {root['count']} skills in {len(root['shards'])} shard(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,413 @@
 #!/usr/bin/env python3
-"""Package a skill folder into a .zip artifact and print its SHA-256 checksum.
+"""Package skill folders into reproducible .zip artifacts and print their SHA-256 checksums.
 
 Usage:
-    python scripts/pack_skill.py skills/example-skill
+    python scripts/pack_skill.py skills/example-skill [--compression auto]
+    python scripts/pack_skill.py --all [--jobs N] [--force] [--out dist]
+
+Archives are byte-reproducible: members are sorted, timestamps are pinned to
+1980-01-01 and permissions are normalised to 0644/0755, so unchanged content
+always yields the same checksum. ``--all`` packs every skill under
+``skills/`` in parallel, skips skills whose input content hash matches the
+previous build, and rewrites ``releases/sha.txt`` and the ``sha256`` fields of
+``index.json`` in one pass, then rebuilds ``search-index.json`` and the sharded ``index/`` beside it.
+
+Compression is ``auto`` (per file: store already-compressed extensions and
+files that deflate poorly, deflate the rest), ``stored``, ``deflate[:LEVEL]``
+or ``zstd[:LEVEL]`` (a ``.tar.zst`` artifact; needs the optional
+``zstandard`` package). A skill can pin its own choice with a ``pack:
+{compression: ...}`` frontmatter key; ``--compression`` overrides it.
 """
 
 from __future__ import annotations
 
+import argparse
 import hashlib
+import json
+import io
+import os
+import re
 import sys
+import tarfile
 import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+MANIFEST_VERSION = 1
+REPO_ROOT = Path(__file__).resolve().parent.parent
+FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+EXCLUDED_NAMES = {"__pycache__", ".DS_Store"}
+STATE_FILE = ".pack-state.json"
+
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from client.frontmatter import FrontmatterError, load_frontmatter  # noqa: E402
+from client.search import write_search_index  # noqa: E402
+from client.shards import write_shards  # noqa: E402
+
+DEFAULT_COMPRESSION = "auto"
+DEFAULT_DEFLATE_LEVEL = 6
+DEFAULT_ZSTD_LEVEL = 10
+# formats that are already compressed: deflating them only burns CPU on both ends
+STORED_EXTENSIONS = {
+    ".7z", ".avif", ".br", ".bz2", ".gif", ".gz", ".jpeg", ".jpg", ".mp3", ".mp4",
+    ".ogg", ".pdf", ".png", ".webm", ".webp", ".whl", ".woff", ".woff2", ".xz", ".zip", ".zst",
+}
+# files this small gain nothing from deflate once per-member headers are counted
+MIN_DEFLATE_SIZE = 128
+# store a file unless deflate saves at least 10% on a sample of it
+MIN_DEFLATE_SAVING = 0.10
+RATIO_SAMPLE_BYTES = 64 * 1024
+
+_COMPRESSION_RE = re.compile(r"^(auto|stored|deflate|zstd)(?::(\d+))?$")
+
+
+def parse_compression(spec: str) -> tuple[str, int | None]:
+    """Parse ``auto``, ``stored``, ``deflate[:0-9]`` or ``zstd[:1-22]`` into (method, level)."""
+    m = _COMPRESSION_RE.match(spec)
+    if not m:
+        raise ValueError(f"invalid compression {spec!r}")
+    method, level = m.group(1), m.group(2)
+    if level is None:
+        return method, {"deflate": DEFAULT_DEFLATE_LEVEL, "zstd": DEFAULT_ZSTD_LEVEL}.get(method)
+    if method in ("auto", "stored"):
+        raise ValueError(f"{method} takes no level")
+    lvl = int(level)
+    if (method == "deflate" and lvl > 9) or (method == "zstd" and not 1 <= lvl <= 22):
+        raise ValueError(f"level {lvl} out of range for {method}")
+    return method, lvl
+
+
+def skill_compression(skill_dir: Path) -> str:
+    """Return the skill's ``pack.compression`` frontmatter setting, or the default."""
+    try:
+        meta = load_frontmatter(skill_dir / "SKILL.md")
+    except (OSError, FrontmatterError):
+        return DEFAULT_COMPRESSION
+    pack_cfg = meta.get("pack")
+    if isinstance(pack_cfg, dict) and isinstance(pack_cfg.get("compression"), str):
+        return pack_cfg["compression"]
+    return DEFAULT_COMPRESSION
+
+
+def choose_member_compression(name: str, data: bytes, method: str) -> int:
+    """Pick ZIP_STORED or ZIP_DEFLATED for one file under *method*."""
+    if method == "stored":
+        return zipfile.ZIP_STORED
+    if method == "deflate":
+        return zipfile.ZIP_DEFLATED
+    if Path(name).suffix.lower() in STORED_EXTENSIONS or len(data) < MIN_DEFLATE_SIZE:
+        return zipfile.ZIP_STORED
+    sample = data[:RATIO_SAMPLE_BYTES]
+    if len(zlib.compress(sample, 1)) > len(sample) * (1 - MIN_DEFLATE_SAVING):
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
 
-def pack(skill_dir: Path) -> Path:
-    """Create a zip of *skill_dir* and return the archive path."""
+def archive_path(skill_dir: Path, out_dir: Path, method: str) -> Path:
+    """Return where *skill_dir* is packed for *method* (``.zip`` or ``.tar.zst``)."""
+    suffix = ".tar.zst" if method == "zstd" else ".zip"
+    return out_dir / f"{skill_dir.name}{suffix}"
+
+
+def artifact_format(archive: Path) -> str:
+    """Return the release format recorded for *archive*: ``zip`` or ``tar.zst``."""
+    return "tar.zst" if archive.name.endswith(".tar.zst") else "zip"
+
+
+def _skill_files(skill_dir: Path) -> list[Path]:
+    """Return the files to pack, sorted by their archive path."""
+    files = [
+        f
+        for f in skill_dir.rglob("*")
+        if f.is_file() and not EXCLUDED_NAMES.intersection(f.relative_to(skill_dir).parts)
+    ]
+    return sorted(files, key=lambda f: f.relative_to(skill_dir).as_posix())
+
+
+def _normalized_mode(path: Path) -> int:
+    return 0o755 if os.stat(path).st_mode & 0o111 else 0o644
+
+
+def input_hash(skill_dir: Path, compression: str = DEFAULT_COMPRESSION) -> str:
+    """Hash of everything that determines the archive: paths, modes, contents, compression."""
+    skill_dir = skill_dir.resolve()
+    h = hashlib.sha256(f"v{MANIFEST_VERSION}\n{compression}\n".encode())
+    for f in _skill_files(skill_dir):
+        rel = f.relative_to(skill_dir).as_posix()
+        h.update(f"{rel}\0{_normalized_mode(f):o}\0{checksum(f)}\n".encode())
+    return h.hexdigest()
+
+
+def _pack_zip(skill_dir: Path, archive: Path, method: str, level: int | None) -> None:
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        for file in _skill_files(skill_dir):
+            name = file.relative_to(skill_dir.parent).as_posix()
+            data = file.read_bytes()
+            info = zipfile.ZipInfo(name, FIXED_DATE_TIME)
+            info.create_system = 3  # unix, so external_attr carries the mode
+            info.external_attr = (0o100000 | _normalized_mode(file)) << 16
+            compress_type = choose_member_compression(name, data, method)
+            zf.writestr(
+                info,
+                data,
+                compress_type=compress_type,
+                compresslevel=level if compress_type == zipfile.ZIP_DEFLATED else None,
+            )
+
+
+def _pack_tar_zst(skill_dir: Path, archive: Path, level: int | None) -> None:
+    try:
+        import zstandard
+    except ImportError as e:
+        raise RuntimeError("zstd compression requires: pip install zstandard") from e
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w", format=tarfile.PAX_FORMAT) as tf:
+        for file in _skill_files(skill_dir):
+            data = file.read_bytes()
+            info = tarfile.TarInfo(file.relative_to(skill_dir.parent).as_posix())
+            info.size = len(data)
+            info.mode = _normalized_mode(file)
+            info.mtime = 0
+            info.uid = info.gid = 0
+            info.uname = info.gname = ""
+            tf.addfile(info, io.BytesIO(data))
+    cctx = zstandard.ZstdCompressor(level=level or DEFAULT_ZSTD_LEVEL)
+    archive.write_bytes(cctx.compress(buf.getvalue()))
+
+
+def pack(skill_dir: Path, out_dir: Path | None = None, compression: str | None = None) -> Path:
+    """Create a reproducible archive of *skill_dir* and return its path.
+
+    The archive is written to *out_dir* (default: next to the skill folder).
+    *compression* defaults to the skill's ``pack.compression`` setting, else
+    ``auto``. Zip archives also get a per-file manifest.
+    """
     skill_dir = skill_dir.resolve()
     if not skill_dir.is_dir():
         raise FileNotFoundError(f"Not a directory: {skill_dir}")
 
-    archive_name = f"{skill_dir.name}.zip"
-    archive_path = skill_dir.parent / archive_name
+    method, level = parse_compression(compression or skill_compression(skill_dir))
+    archive = archive_path(skill_dir, out_dir.resolve() if out_dir else skill_dir.parent, method)
+    archive.parent.mkdir(parents=True, exist_ok=True)
+
+    if method == "zstd":
+        _pack_tar_zst(skill_dir, archive, level)
+        return archive
+    _pack_zip(skill_dir, archive, method, level)
+    write_manifest(archive, skill_dir)
+    return archive
 
-    with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as zf:
-        for file in sorted(skill_dir.rglob("*")):
-            if file.is_file():
-                zf.write(file, file.relative_to(skill_dir.parent))
 
-    return archive_path
+def manifest_path(archive: Path) -> Path:
+    """Return the per-file manifest path that accompanies *archive*."""
+    return archive.with_name(archive.name.removesuffix(".zip") + ".manifest.json")
+
+
+def write_manifest(archive: Path, skill_dir: Path) -> Path:
+    """Write ``<skill>.manifest.json`` describing every file in *archive*.
+
+    Each entry records the file's SHA-256, size and mode plus the byte span of
+    its local zip record, so clients can range-fetch only changed members.
+    """
+    with zipfile.ZipFile(archive) as zf:
+        infos = sorted(zf.infolist(), key=lambda i: i.header_offset)
+        ends = [i.header_offset for i in infos[1:]] + [zf.start_dir]
+        files = {}
+        for info, end in zip(infos, ends):
+            rel = Path(info.filename).relative_to(skill_dir.name).as_posix()
+            data = zf.read(info)
+            files[rel] = {
+                "sha256": hashlib.sha256(data).hexdigest(),
+                "size": info.file_size,
+                "mode": (info.external_attr >> 16) & 0o777,
+                "member": info.filename,
+                "offset": info.header_offset,
+                "length": end - info.header_offset,
+                "compress_type": info.compress_type,
+                "compress_size": info.compress_size,
+            }
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "skill": skill_dir.name,
+        "archive_sha256": checksum(archive),
+        "files": dict(sorted(files.items())),
+    }
+    out = manifest_path(archive)
+    out.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    return out
 
 
 def checksum(path: Path) -> str:
     """Return the SHA-256 hex digest of a file."""
     h = hashlib.sha256()
     with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
             h.update(chunk)
     return h.hexdigest()
 
 
+def _remove_stale_artifacts(name: str, archive: Path) -> None:
+    """Delete *name*'s artifacts beside *archive* left over from another format."""
+    out_dir = archive.parent
+    keep = {archive, manifest_path(archive)} if archive.name.endswith(".zip") else {archive}
+    for stale in (out_dir / f"{name}.zip", out_dir / f"{name}.tar.zst", out_dir / f"{name}.manifest.json"):
+        if stale not in keep:
+            stale.unlink(missing_ok=True)
+
+
+def _pack_one(
+    skill_dir: Path, digest: str, out_dir: Path, compression: str | None
+) -> tuple[str, dict[str, str]]:
+    archive = pack(skill_dir, out_dir, compression)
+    manifest = manifest_path(archive)
+    _remove_stale_artifacts(skill_dir.name, archive)
+    return skill_dir.name, {
+        "input": digest,
+        "format": artifact_format(archive),
+        "sha256": checksum(archive),
+        "manifest_sha256": checksum(manifest) if manifest.exists() else "",
+    }
+
+
+def pack_all(
+    skills_root: Path,
+    out_dir: Path,
+    jobs: int | None = None,
+    force: bool = False,
+    compression: str | None = None,
+) -> dict[str, dict[str, str]]:
+    """Pack every skill under *skills_root* into *out_dir*, skipping unchanged ones.
+
+    Returns ``{name: {"sha256", "manifest_sha256", "format", "input", "status"}}``
+    where status is ``packed`` or ``unchanged``. Build state is kept in
+    ``out_dir/.pack-state.json``. *compression* overrides each skill's setting.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    state_path = out_dir / STATE_FILE
+    try:
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        state = {}
+
+    skill_dirs = sorted(
+        d for d in skills_root.iterdir()
+        if d.is_dir() and not d.name.startswith(".") and (d / "SKILL.md").exists()
+    )
+    results: dict[str, dict[str, str]] = {}
+    todo: list[tuple[Path, str]] = []
+    for d in skill_dirs:
+        spec = compression or skill_compression(d)
+        digest = input_hash(d, spec)
+        prev = state.get(d.name, {})
+        archive = archive_path(d, out_dir, parse_compression(spec)[0])
+        if (
+            not force
+            and prev.get("input") == digest
+            and archive.exists()
+            and (archive.name.endswith(".tar.zst") or manifest_path(archive).exists())
+            and checksum(archive) == prev.get("sha256")
+        ):
+            results[d.name] = {**prev, "status": "unchanged"}
+        else:
+            todo.append((d, digest))
+
+    n = len(todo)
+    if jobs == 1 or n <= 1:
+        packed = [_pack_one(d, digest, out_dir, compression) for d, digest in todo]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as ex:
+            packed = list(ex.map(_pack_one, *zip(*todo), [out_dir] * n, [compression] * n))
+    for name, info in packed:
+        results[name] = {**info, "status": "packed"}
+
+    results = dict(sorted(results.items()))
+    state = {name: {k: v for k, v in r.items() if k != "status"} for name, r in results.items()}
+    state_path.write_text(json.dumps(state, indent=2) + "\n", encoding="utf-8")
+    return results
+
+
+def write_release_metadata(
+    results: dict[str, dict[str, str]], sha_file: Path, index_path: Path
+) -> None:
+    """Rewrite *sha_file* and the release fields of matching *index_path* entries.
+
+    Zip artifacts also get ``manifest_url`` (next to ``download_url``) and
+    ``manifest_sha256``; entries without a manifest lose both.
+    """
+    sha_file.parent.mkdir(parents=True, exist_ok=True)
+    sha_file.write_text(
+        "".join(f"{name} {r['sha256']}\n" for name, r in results.items()), encoding="utf-8"
+    )
+    if not index_path.exists():
+        return
+    index = json.loads(index_path.read_text(encoding="utf-8"))
+    for entry in index.get("skills", []):
+        r = results.get(entry.get("slug"))
+        if r is None:
+            continue
+        entry["sha256"] = r["sha256"]
+        entry["format"] = r.get("format", "zip")
+        if entry.get("download_url"):
+            # a skill that switched format is published under the new file name
+            base = entry["download_url"].rsplit("/", 1)[0]
+            entry["download_url"] = f"{base}/{entry['slug']}.{entry['format']}"
+        if r.get("manifest_sha256") and entry.get("download_url"):
+            # published beside the artifact; enables delta upgrades (client.delta)
+            entry["manifest_url"] = f"{base}/{entry['slug']}.manifest.json"
+            entry["manifest_sha256"] = r["manifest_sha256"]
+        else:
+            entry.pop("manifest_url", None)
+            entry.pop("manifest_sha256", None)
+    index_path.write_text(json.dumps(index, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
 def main() -> None:
-    if len(sys.argv) != 2:
-        print("Usage: python scripts/pack_skill.py <skill-directory>")
+    parser = argparse.ArgumentParser(description="Package skills into zip artifacts.")
+    parser.add_argument("skill_dir", nargs="?", type=Path, help="Skill directory to pack.")
+    parser.add_argument("--all", action="store_true", help="Pack every skill under --skills-dir.")
+    parser.add_argument("--skills-dir", type=Path, default=REPO_ROOT / "skills")
+    parser.add_argument("--out", type=Path, default=REPO_ROOT / "dist", help="Output directory for --all.")
+    parser.add_argument("--jobs", type=int, default=None, help="Parallel packers (default: CPU count).")
+    parser.add_argument("--force", action="store_true", help="Repack even unchanged skills.")
+    parser.add_argument("--sha-file", type=Path, default=REPO_ROOT / "releases" / "sha.txt")
+    parser.add_argument("--index", type=Path, default=REPO_ROOT / "index.json")
+    parser.add_argument(
+        "--compression",
+        default=None,
+        help="auto | stored | deflate[:0-9] | zstd[:1-22] (default: per-skill setting, else auto).",
+    )
+    args = parser.parse_args()
+    if args.compression:
+        try:
+            parse_compression(args.compression)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.all:
+        results = pack_all(args.skills_dir, args.out, args.jobs, args.force, args.compression)
+        for name, r in results.items():
+            print(f"  {r['status']:>9}  {name}  {r['sha256']}")
+        write_release_metadata(results, args.sha_file, args.index)
+        print(f"Wrote {args.sha_file}" + (f" and updated {args.index}" if args.index.exists() else ""))
+        if args.index.exists():
+            search = write_search_index(args.index, args.skills_dir)
+            print(f"Wrote {search}")
+            print(f"Wrote {write_shards(args.index, args.index.with_name('index'), search_index=search)}")
+        return
+
+    if args.skill_dir is None:
+        print("Usage: python scripts/pack_skill.py <skill-directory> | --all")
         sys.exit(2)
 
-    skill_dir = Path(sys.argv[1])
-    archive = pack(skill_dir)
+    archive = pack(args.skill_dir, compression=args.compression)
     sha = checksum(archive)
-    print(f"Packed: {archive}")
+    print(f"Packed: {archive} ({artifact_format(archive)})")
     print(f"SHA-256: {sha}")
+    if manifest_path(archive).exists():
+        print(f"Manifest: {manifest_path(archive)} (sha256 {checksum(manifest_path(archive))})")
 
 
 if __name__ == "__main__":
@@ -3,82 +3,295 @@
 
 Usage:
     python scripts/validate_skill.py skills/example-skill/SKILL.md
+    python scripts/validate_skill.py --all [--jobs 8] [--json report.json] [--junit report.xml]
 """
 
 from __future__ import annotations
 
+import argparse
+import hashlib
 import json
+import os
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import Callable, Iterable, Optional
+from xml.etree import ElementTree as ET
 
 try:
     import jsonschema
 except Exception:
     jsonschema = None
 
-SCHEMA_PATH = Path(__file__).resolve().parent.parent / "schemas" / "skill.schema.json"
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCHEMA_PATH = REPO_ROOT / "schemas" / "skill.schema.json"
+DEFAULT_CACHE = REPO_ROOT / ".validate-cache.json"
+BACKENDS = ("auto", "fastjsonschema", "jsonschema", "basic")
+BASIC_REQUIRED = ("name", "version", "author", "entrypoint", "tags")
+
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from client.frontmatter import FrontmatterError, load_frontmatter  # noqa: E402
 
 
 def extract_frontmatter(skill_md: Path) -> dict:
-    """Parse YAML frontmatter from a SKILL.md file using PyYAML."""
-    import yaml
-    text = skill_md.read_text(encoding="utf-8")
-    if not text.startswith("---"):
-        raise ValueError(f"{skill_md}: missing YAML frontmatter delimiter.")
-    parts = text.split("---", 2)
-    if len(parts) < 3:
-        raise ValueError(f"{skill_md}: malformed frontmatter.")
-    fm_text = parts[1]
-    data = yaml.safe_load(fm_text)
-    if not isinstance(data, dict):
-        raise ValueError(f"{skill_md}: frontmatter did not parse to a mapping")
-    return data
-
-
-def validate(skill_md: Path) -> bool:
-    """Return True if the frontmatter is valid; print errors otherwise."""
-    meta = extract_frontmatter(skill_md)
-
-    # If jsonschema is not installed (CI or restricted env), perform a basic required-field check.
-    if jsonschema is None:
-        missing = [k for k in ("name", "version", "author", "entrypoint", "tags") if k not in (meta or {})]
-        if missing:
-            for m in missing:
-                print(f"  ERROR [missing]: required field '{m}' is missing")
-            return False
-        print(f"  OK: {skill_md} basic validation passed (jsonschema not available).")
-        return True
+    """Parse YAML frontmatter from a SKILL.md file, stopping at the closing delimiter."""
+    return load_frontmatter(skill_md)
+
+
+@lru_cache(maxsize=None)
+def load_schema() -> tuple[str, dict]:
+    """Return ``(sha256, schema)`` for the schema file, read once per process."""
+    raw = SCHEMA_PATH.read_bytes()
+    return hashlib.sha256(raw).hexdigest(), json.loads(raw)
+
+
+def resolve_backend(backend: str = "auto") -> str:
+    """Map ``auto`` to jsonschema (or basic without it); check others are importable.
+
+    fastjsonschema is opt-in only: it does not implement draft 2020-12 and stops
+    at the first error, so it may not agree with jsonschema on every file.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend {backend!r}; expected one of {BACKENDS}")
+    if backend == "fastjsonschema":
+        import fastjsonschema  # noqa: F401
+
+        return "fastjsonschema"
+    if backend in ("auto", "jsonschema") and jsonschema is not None:
+        return "jsonschema"
+    if backend == "jsonschema":
+        raise ImportError("jsonschema is not installed")
+    return "basic"
+
+
+@lru_cache(maxsize=None)
+def compiled_validator(backend: str = "auto") -> Callable[[dict], list[str]]:
+    """Compile the schema once per process; the result maps frontmatter to error lines."""
+    backend = resolve_backend(backend)
+    _, schema = load_schema()
+
+    if backend == "fastjsonschema":
+        import fastjsonschema
+
+        check = fastjsonschema.compile(schema)
+
+        def run(meta: dict) -> list[str]:
+            try:
+                check(meta)
+            except fastjsonschema.JsonSchemaValueException as e:
+                loc = ".".join(str(p) for p in e.path[1:]) or "(root)"
+                return [f"ERROR [{loc}]: {e.message}"]
+            return []
+
+        return run
+
+    if backend == "jsonschema":
+        validator = jsonschema.Draft202012Validator(schema)
+
+        def run(meta: dict) -> list[str]:
+            errors = sorted(validator.iter_errors(meta), key=lambda e: list(e.path))
+            return [
+                f"ERROR [{'.'.join(str(p) for p in e.absolute_path) or '(root)'}]: {e.message}"
+                for e in errors
+            ]
+
+        return run
+
+    # jsonschema not installed (CI or restricted env): basic required-field check
+    def run(meta: dict) -> list[str]:
+        return [
+            f"ERROR [missing]: required field '{k}' is missing"
+            for k in BASIC_REQUIRED
+            if k not in (meta or {})
+        ]
+
+    return run
+
+
+def check_file(skill_md: Path, backend: str = "auto") -> list[str]:
+    """Return the error lines for *skill_md* (empty when valid)."""
+    try:
+        meta = extract_frontmatter(skill_md)
+    except (OSError, FrontmatterError) as e:
+        return [f"ERROR [frontmatter]: {e}"]
+    return compiled_validator(backend)(meta)
 
-    schema = json.loads(SCHEMA_PATH.read_text(encoding="utf-8"))
-    validator = jsonschema.Draft202012Validator(schema)
-    errors = sorted(validator.iter_errors(meta), key=lambda e: list(e.path))
 
+def validate(skill_md: Path, backend: str = "auto") -> bool:
+    """Return True if the frontmatter is valid; print errors otherwise."""
+    errors = check_file(skill_md, backend)
+    for err in errors:
+        print(f"  {err}")
     if errors:
-        for err in errors:
-            loc = ".".join(str(p) for p in err.absolute_path) or "(root)"
-            print(f"  ERROR [{loc}]: {err.message}")
         return False
-
-    print(f"  OK: {skill_md} is valid.")
+    if resolve_backend(backend) == "basic":
+        print(f"  OK: {skill_md} basic validation passed (jsonschema not available).")
+    else:
+        print(f"  OK: {skill_md} is valid.")
     return True
 
 
-def main() -> None:
-    if len(sys.argv) < 2:
-        print("Usage: python scripts/validate_skill.py <SKILL.md> [SKILL.md ...]")
-        sys.exit(2)
-
-    all_ok = True
-    for path_str in sys.argv[1:]:
-        p = Path(path_str)
-        if not p.exists():
-            print(f"  SKIP: {p} does not exist.")
-            all_ok = False
+def _content_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _check_one(args: tuple[str, str]) -> tuple[str, list[str]]:
+    path, backend = args
+    return path, check_file(Path(path), backend)
+
+
+def load_cache(path: Optional[Path], schema_sha: str) -> dict[str, dict]:
+    """Return cached ``{path: {sha256, errors}}`` results, dropped if *schema_sha* changed."""
+    if path is None:
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("schema_sha256") != schema_sha:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def save_cache(path: Path, schema_sha: str, files: dict[str, dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"schema_sha256": schema_sha, "files": files}, f, sort_keys=True)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def validate_all(
+    paths: Iterable[Path],
+    jobs: Optional[int] = None,
+    backend: str = "auto",
+    cache_path: Optional[Path] = None,
+) -> dict[str, dict]:
+    """Validate many SKILL.md files, returning ``{path: {ok, errors, cached}}`` in input order.
+
+    Files whose content hash matches *cache_path* (for the same schema) are not
+    re-validated. The rest are checked on a process pool whose workers each
+    compile the schema once.
+    """
+    # backends word their errors differently, so each gets its own cache generation
+    schema_sha = f"{load_schema()[0]}:{resolve_backend(backend)}"
+    cached = load_cache(cache_path, schema_sha)
+    results: dict[str, dict] = {}
+    hashes: dict[str, str] = {}
+    todo: list[str] = []
+    for path in paths:
+        key = str(path)
+        try:
+            hashes[key] = _content_hash(path)
+        except OSError as e:
+            results[key] = {"ok": False, "errors": [f"ERROR [file]: {e}"], "cached": False}
             continue
-        if not validate(p):
-            all_ok = False
+        hit = cached.get(key)
+        if isinstance(hit, dict) and hit.get("sha256") == hashes[key]:
+            results[key] = {"ok": not hit["errors"], "errors": hit["errors"], "cached": True}
+        else:
+            results[key] = {}
+            todo.append(key)
+
+    if todo:
+        work = [(p, backend) for p in todo]
+        workers = min(jobs or os.cpu_count() or 1, len(todo))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                checked = list(ex.map(_check_one, work, chunksize=max(1, len(work) // (workers * 4))))
+        else:
+            checked = [_check_one(w) for w in work]
+        for path, errors in checked:
+            results[path] = {"ok": not errors, "errors": errors, "cached": False}
+
+    if cache_path is not None:
+        save_cache(
+            cache_path,
+            schema_sha,
+            {p: {"sha256": hashes[p], "errors": r["errors"]} for p, r in results.items() if p in hashes},
+        )
+    return results
+
+
+def write_json_report(results: dict[str, dict], path: Path) -> None:
+    failed = sum(1 for r in results.values() if not r["ok"])
+    report = {
+        "total": len(results),
+        "failed": failed,
+        "files": [{"path": p, **r} for p, r in results.items()],
+    }
+    path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+
+def write_junit_report(results: dict[str, dict], path: Path) -> None:
+    failed = sum(1 for r in results.values() if not r["ok"])
+    root = ET.Element("testsuites", tests=str(len(results)), failures=str(failed))
+    suite = ET.SubElement(
+        root, "testsuite", name="validate_skill", tests=str(len(results)), failures=str(failed), errors="0"
+    )
+    for p, r in results.items():
+        case = ET.SubElement(suite, "testcase", classname="skills", name=p)
+        if not r["ok"]:
+            failure = ET.SubElement(case, "failure", message=r["errors"][0])
+            failure.text = "\n".join(r["errors"])
+    tree = ET.ElementTree(root)
+    ET.indent(tree)
+    tree.write(path, encoding="utf-8", xml_declaration=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Validate SKILL.md frontmatter against the schema.")
+    parser.add_argument("paths", nargs="*", type=Path, metavar="SKILL.md")
+    parser.add_argument("--all", action="store_true", help="Validate every skill under --skills-dir.")
+    parser.add_argument("--skills-dir", type=Path, default=REPO_ROOT / "skills")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--backend", choices=BACKENDS, default="auto", help="Schema validator backend; auto uses jsonschema when installed.")
+    parser.add_argument("--cache", type=Path, default=DEFAULT_CACHE, help="Content-hash result cache.")
+    parser.add_argument("--no-cache", action="store_true", help="Re-validate every file.")
+    parser.add_argument("--json", type=Path, help="Write a JSON report to this path.")
+    parser.add_argument("--junit", type=Path, help="Write a JUnit XML report to this path.")
+    args = parser.parse_args()
+    try:
+        resolve_backend(args.backend)
+    except ImportError as e:
+        parser.error(str(e))
+
+    if not args.all:
+        if not args.paths:
+            print("Usage: python scripts/validate_skill.py <SKILL.md> [SKILL.md ...] | --all")
+            sys.exit(2)
+        all_ok = True
+        for p in args.paths:
+            if not p.exists():
+                print(f"  SKIP: {p} does not exist.")
+                all_ok = False
+                continue
+            if not validate(p, args.backend):
+                all_ok = False
+        sys.exit(0 if all_ok else 1)
 
-    sys.exit(0 if all_ok else 1)
+    paths = sorted(args.skills_dir.glob("*/SKILL.md")) + list(args.paths)
+    results = validate_all(paths, args.jobs, args.backend, None if args.no_cache else args.cache)
+    for p, r in results.items():
+        print(f"  {'OK' if r['ok'] else 'FAIL'}: {p}" + ("  (cached)" if r["cached"] else ""))
+        for err in r["errors"]:
+            print(f"    {err}")
+    if args.json:
+        write_json_report(results, args.json)
+    if args.junit:
+        write_junit_report(results, args.junit)
+    failed = sum(1 for r in results.values() if not r["ok"])
+    print(f"{len(results) - failed}/{len(results)} valid ({resolve_backend(args.backend)} backend)")
+    sys.exit(0 if not failed else 1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1 @@
+"""SkillHub server package — serves the local registry and index.json over HTTP."""
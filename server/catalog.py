@@ -0,0 +1,175 @@
+"""Serialized views of a registry snapshot, rebuilt once per generation."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import bisect
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Optional
+
+from client.models import Skill
+from client.registry import RegistrySnapshot, SkillRegistry
+from client.search import search_index_path
+from client.shards import ROOT_NAME, SHARD_DIR
+from server.responses import Precomputed
+
+FIELDS = tuple(Skill.model_fields)
+MAX_LIMIT = 1000
+# distinct (cursor, limit, fields) pages kept per generation
+PAGE_CACHE_SIZE = 4096
+# shard files are named by content hash (client.shards.build_shards)
+SHARD_NAME = re.compile(r"[0-9a-f]{16}\.json")
+
+
+class CatalogError(ValueError):
+    """Raised for a malformed cursor or unknown field names (HTTP 400)."""
+
+
+def encode_cursor(name: str) -> str:
+    return base64.urlsafe_b64encode(name.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded, altchars=b"-_", validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise CatalogError(f"invalid cursor {cursor!r}") from e
+
+
+def parse_fields(fields: Optional[str]) -> Optional[tuple[str, ...]]:
+    if not fields:
+        return None
+    wanted = tuple(sorted({f.strip() for f in fields.split(",") if f.strip()}))
+    unknown = [f for f in wanted if f not in FIELDS]
+    if unknown:
+        raise CatalogError(f"unknown field(s) {', '.join(unknown)}; choose from {', '.join(FIELDS)}")
+    return wanted or None
+
+
+class Catalog:
+    """Every response body for one snapshot generation.
+
+    The full listing and each skill's document are serialized when the
+    catalog is built; pages and field selections are serialized on first
+    request and memoized until the next generation replaces the catalog.
+    """
+
+    def __init__(self, snapshot: RegistrySnapshot) -> None:
+        self.generation = snapshot.generation
+        self.names = sorted(snapshot.skills)
+        self.records = {n: snapshot.skills[n].model_dump() for n in self.names}
+        self.full = Precomputed.json({"skills": [self.records[n] for n in self.names], "next_cursor": None})
+        self.skills = {n: Precomputed.json(self.records[n]) for n in self.names}
+        self._pages: dict[tuple, Precomputed] = {}
+        self._lock = threading.Lock()
+
+    def page(
+        self, limit: Optional[int] = None, cursor: Optional[str] = None, fields: Optional[str] = None
+    ) -> Precomputed:
+        """Skills sorted by name, after *cursor*, at most *limit*, restricted to *fields*."""
+        selected = parse_fields(fields)
+        if limit is None and cursor is None and selected is None:
+            return self.full
+        after = decode_cursor(cursor) if cursor else None
+        key = (limit, after, selected)
+        cached = self._pages.get(key)
+        if cached is not None:
+            return cached
+        start = bisect.bisect_right(self.names, after) if after is not None else 0
+        end = len(self.names) if limit is None else min(start + limit, len(self.names))
+        items = []
+        for name in self.names[start:end]:
+            record = self.records[name]
+            items.append(record if selected is None else {f: record[f] for f in selected})
+        next_cursor = encode_cursor(self.names[end - 1]) if end < len(self.names) and end > start else None
+        pre = Precomputed.json({"skills": items, "next_cursor": next_cursor})
+        with self._lock:
+            if len(self._pages) >= PAGE_CACHE_SIZE:
+                self._pages.clear()
+            self._pages[key] = pre
+        return pre
+
+
+class Hub:
+    """What the server serves: a live :class:`SkillRegistry` and the hub's published index files.
+
+    Besides index.json, the files published next to it are mirrored too: the
+    version 2 index (``index/root.json`` and its shards) and ``search-index.json``.
+    """
+
+    def __init__(
+        self, skills_dir: str | Path, index_path: Optional[str | Path] = None, *, watch: bool = True
+    ) -> None:
+        self.registry = SkillRegistry(skills_dir)
+        self.index_path = Path(index_path) if index_path else None
+        self.watch = watch
+        self._catalog: Optional[Catalog] = None
+        self._files: dict[Path, tuple[tuple[int, int], Precomputed]] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        if self.watch:
+            self.registry.start()
+        else:
+            self.registry.refresh()
+
+    def stop(self) -> None:
+        self.registry.stop()
+
+    def catalog(self) -> Catalog:
+        """The catalog for the current snapshot; a stale one is served while another rebuilds."""
+        snapshot = self.registry.snapshot
+        current = self._catalog
+        if current is not None and current.generation == snapshot.generation:
+            return current
+        if not self._lock.acquire(blocking=current is None):
+            return current
+        try:
+            if self._catalog is None or self._catalog.generation != snapshot.generation:
+                self._catalog = Catalog(snapshot)
+            return self._catalog
+        finally:
+            self._lock.release()
+
+    def _published(self, path: Path) -> Optional[Precomputed]:
+        """*path* as published, re-read only when its size or mtime changes."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._files.pop(path, None)
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._files.get(path)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, Precomputed.build(path.read_bytes()))
+            self._files[path] = cached
+        return cached[1]
+
+    def index(self) -> Optional[Precomputed]:
+        """index.json (version 1)."""
+        if self.index_path is None:
+            return None
+        return self._published(self.index_path)
+
+    def index_root(self) -> Optional[Precomputed]:
+        """The version 2 root manifest, ``index/root.json`` beside index.json."""
+        if self.index_path is None:
+            return None
+        return self._published(self.index_path.parent / "index" / ROOT_NAME)
+
+    def shard(self, name: str) -> Optional[Precomputed]:
+        """One version 2 shard; *name* must be a content-hash file name."""
+        if self.index_path is None or not SHARD_NAME.fullmatch(name):
+            return None
+        return self._published(self.index_path.parent / "index" / SHARD_DIR / name)
+
+    def search_index(self) -> Optional[Precomputed]:
+        """search-index.json beside index.json."""
+        if self.index_path is None:
+            return None
+        return self._published(search_index_path(self.index_path))
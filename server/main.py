@@ -0,0 +1,121 @@
+"""SkillHub HTTP server: the local registry and the published index files over REST.
+
+Usage:
+    python -m server.main [--host 127.0.0.1] [--port 8000] [--skills-dir skills] [--index index.json]
+
+``SKILLHUB_SKILLS_DIR`` and ``SKILLHUB_INDEX`` set the defaults, which is how
+``uvicorn server.main:app`` is configured.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+
+from server.catalog import MAX_LIMIT, CatalogError, Hub
+from server.responses import respond
+
+
+def create_app(
+    skills_dir: Optional[str | Path] = None,
+    index_path: Optional[str | Path] = None,
+    *,
+    watch: bool = True,
+) -> FastAPI:
+    """Build the app; with *watch* the registry follows changes to *skills_dir*."""
+    hub = Hub(
+        skills_dir or os.environ.get("SKILLHUB_SKILLS_DIR", "skills"),
+        index_path or os.environ.get("SKILLHUB_INDEX", "index.json"),
+        watch=watch,
+    )
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        hub.start()
+        try:
+            yield
+        finally:
+            hub.stop()
+
+    app = FastAPI(title="SkillHub", lifespan=lifespan)
+    app.state.hub = hub
+
+    # Handlers are plain functions on purpose: FastAPI runs them in its threadpool,
+    # so a catalog rebuild or a slow file read never blocks the event loop.
+
+    @app.get("/skills/")
+    def list_skills(
+        request: Request,
+        limit: Optional[int] = Query(None, ge=1, le=MAX_LIMIT, description="Page size."),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page."),
+        fields: Optional[str] = Query(None, description="Comma-separated fields to include."),
+    ) -> Response:
+        """List skills sorted by name; without parameters, the whole catalog."""
+        try:
+            pre = hub.catalog().page(limit, cursor, fields)
+        except CatalogError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        return respond(request, pre)
+
+    @app.get("/skills/{name}")
+    def get_skill(request: Request, name: str) -> Response:
+        pre = hub.catalog().skills.get(name)
+        if pre is None:
+            raise HTTPException(status_code=404, detail=f"skill {name!r} not found")
+        return respond(request, pre)
+
+    @app.get("/index.json")
+    def index_json(request: Request) -> Response:
+        """The hub's index.json, byte for byte, so other nodes can mirror from it."""
+        pre = hub.index()
+        if pre is None:
+            raise HTTPException(status_code=404, detail="no index.json configured")
+        return respond(request, pre)
+
+    @app.get("/index/root.json")
+    def index_root(request: Request) -> Response:
+        """The version 2 root manifest, so clients can use this hub as ``--index-url``."""
+        pre = hub.index_root()
+        if pre is None:
+            raise HTTPException(status_code=404, detail="no version 2 index published")
+        return respond(request, pre)
+
+    @app.get("/index/shards/{name}")
+    def index_shard(request: Request, name: str) -> Response:
+        pre = hub.shard(name)
+        if pre is None:
+            raise HTTPException(status_code=404, detail=f"shard {name!r} not found")
+        return respond(request, pre)
+
+    @app.get("/search-index.json")
+    def search_index(request: Request) -> Response:
+        pre = hub.search_index()
+        if pre is None:
+            raise HTTPException(status_code=404, detail="no search-index.json published")
+        return respond(request, pre)
+
+    return app
+
+
+app = create_app()
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the SkillHub registry over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--skills-dir", default=None)
+    parser.add_argument("--index", default=None)
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.skills_dir, args.index), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Pre-serialized HTTP bodies with strong ETags and pre-compressed variants."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:  # optional: pip install 'ching-tech-os-skillhub[br]'
+    brotli = None
+
+# bodies smaller than this are sent as-is: compression overhead outweighs the saving
+MIN_COMPRESS_BYTES = 512
+# strong validators must differ per content-coding (RFC 9110 §8.8.3)
+ETAG_SUFFIX = {"gzip": "-gz", "br": "-br"}
+CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+
+def dumps(data: Any) -> bytes:
+    """Compact, deterministic JSON, so equal data always yields the same ETag."""
+    return json.dumps(data, separators=(",", ":"), sort_keys=True, ensure_ascii=False).encode()
+
+
+@dataclass(frozen=True)
+class Precomputed:
+    """One response body, serialized and compressed once, served many times.
+
+    *etag* is the identity body's validator; :meth:`etag_for` gives each
+    compressed variant its own.
+    """
+
+    body: bytes
+    media_type: str = "application/json"
+    etag: str = ""
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, body: bytes, media_type: str = "application/json") -> "Precomputed":
+        encoded: dict[str, bytes] = {}
+        if len(body) >= MIN_COMPRESS_BYTES:
+            # mtime=0 keeps the gzip bytes reproducible
+            encoded["gzip"] = gzip.compress(body, compresslevel=6, mtime=0)
+            if brotli is not None:
+                encoded["br"] = brotli.compress(body, quality=5)
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        return cls(body, media_type, etag, encoded)
+
+    @classmethod
+    def json(cls, data: Any) -> "Precomputed":
+        return cls.build(dumps(data))
+
+    def etag_for(self, coding: Optional[str]) -> str:
+        if coding is None:
+            return self.etag
+        return self.etag[:-1] + ETAG_SUFFIX[coding] + '"'
+
+
+def _accepted(header: str) -> dict[str, float]:
+    accepted: dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def choose_encoding(header: Optional[str], available: dict[str, bytes]) -> Optional[str]:
+    """Pick ``br`` or ``gzip`` from *available* as allowed by Accept-Encoding."""
+    if not header or not available:
+        return None
+    accepted = _accepted(header)
+    for coding in ("br", "gzip"):
+        if coding in available and accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison (weak comparison, as RFC 9110 requires for GET)."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def respond(request: Request, pre: Precomputed) -> Response:
+    """Serve *pre* in the negotiated coding, answering 304 when the client has that variant."""
+    coding = choose_encoding(request.headers.get("accept-encoding"), pre.encoded)
+    etag = pre.etag_for(coding)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    body = pre.body
+    if coding is not None:
+        body = pre.encoded[coding]
+        headers["Content-Encoding"] = coding
+    return Response(content=body, media_type=pre.media_type, headers=headers)
@@ -0,0 +1,24 @@
+from pathlib import Path
+
+import pytest
+
+
+def _write_skill(root: Path, dirname: str, version: str = "1.0.0", body: str = "", **fields: str) -> Path:
+    d = Path(root) / dirname
+    d.mkdir(parents=True, exist_ok=True)
+    meta = {"name": dirname, "version": f'"{version}"', "description": "d", "author": "a", "entrypoint": "run.py"}
+    meta.update(fields)
+    text = "".join(f"{k}: {v}\n" for k, v in meta.items())
+    (d / "SKILL.md").write_text(f"---\n{text}---\n{body}", encoding="utf-8")
+    return d
+
+
+@pytest.fixture
+def write_skill():
+    """``write_skill(root, dirname, version="1.0.0", body="", **fields)`` writes root/dirname/SKILL.md.
+
+    *fields* are raw YAML values overriding the defaults: ``name`` (the
+    directory name), ``description``, ``author`` and ``entrypoint``.
+    Returns the skill directory.
+    """
+    return _write_skill
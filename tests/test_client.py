@@ -1,7 +1,10 @@
 import json
+import os
 from pathlib import Path
 import urllib.request
 
+import pytest
+
 
 from client.client import SkillHubClient
 
@@ -69,3 +72,208 @@ def test_install_and_validate(tmp_path):
     client = SkillHubClient(skills_dir=tmp_path / "installed_skills")
     report = client.validate_install()
     assert report.get(skill.name) is True
+
+
+def test_metadata_cache_reparses_only_changed(tmp_path, monkeypatch, write_skill):
+    import client.client as cc
+
+    for n in ("alpha", "beta", "gamma"):
+        write_skill(tmp_path, n)
+    calls = []
+    real = cc._parse_frontmatter
+    monkeypatch.setattr(cc, "_parse_frontmatter", lambda p: calls.append(p.parent.name) or real(p))
+
+    client = SkillHubClient(skills_dir=tmp_path)
+    assert [s.name for s in client.list_skills()] == ["alpha", "beta", "gamma"]
+    assert (tmp_path / ".skillhub-cache").exists()
+    assert len(calls) == 3
+
+    calls.clear()
+    assert len(client.list_skills()) == 3
+    assert calls == []
+
+    write_skill(tmp_path, "beta", version="2.0.0")
+    calls.clear()
+    skills = {s.name: s for s in client.list_skills()}
+    assert calls == ["beta"]
+    assert skills["beta"].version == "2.0.0"
+
+
+def test_metadata_cache_corrupt_and_disabled(tmp_path, write_skill):
+    write_skill(tmp_path, "alpha")
+    cache_file = tmp_path / ".skillhub-cache"
+    cache_file.write_text("{not json", encoding="utf-8")
+    assert [s.name for s in SkillHubClient(skills_dir=tmp_path).list_skills()] == ["alpha"]
+    assert json.loads(cache_file.read_text())["version"] == 1
+
+    cache_file.write_text(json.dumps({"version": 1, "entries": {"alpha": {
+        "stat": [0, 0, 0], "record": {"name": "bogus"}}}}), encoding="utf-8")
+    assert [s.name for s in SkillHubClient(skills_dir=tmp_path).list_skills()] == ["alpha"]
+
+    cache_file.unlink()
+    assert len(SkillHubClient(skills_dir=tmp_path, use_cache=False).list_skills()) == 1
+    assert not cache_file.exists()
+
+
+def test_get_skill_fast_path_and_index(tmp_path, monkeypatch, write_skill):
+    write_skill(tmp_path, "alpha")
+    renamed = write_skill(tmp_path, "dir-name")
+    text = (renamed / "SKILL.md").read_text().replace("name: dir-name", "name: other-name")
+    (renamed / "SKILL.md").write_text(text)
+
+    client = SkillHubClient(skills_dir=tmp_path)
+    scans = []
+    real = SkillHubClient.list_skills
+    monkeypatch.setattr(SkillHubClient, "list_skills", lambda self, **kw: scans.append(1) or real(self, **kw))
+
+    assert client.get_skill("alpha").name == "alpha"
+    assert scans == []
+
+    assert client.get_skill("other-name").name == "other-name"
+    assert client.get_skill("other-name").name == "other-name"
+    assert client.get_skill("missing") is None
+    assert len(scans) == 1
+
+    write_skill(tmp_path, "zeta")
+    os.utime(tmp_path, ns=(1, 1))
+    assert client.get_skill("missing") is None
+    assert len(scans) == 2
+
+
+def test_list_skills_parallel_matches_serial(tmp_path, write_skill):
+    for i in range(12):
+        write_skill(tmp_path, f"s{i:02d}", version=f"1.0.{i}")
+    serial = SkillHubClient(skills_dir=tmp_path, use_cache=False).list_skills()
+    threaded = SkillHubClient(skills_dir=tmp_path, use_cache=False, workers=4).list_skills()
+    procs = SkillHubClient(skills_dir=tmp_path, workers=2, pool="process").list_skills()
+    assert [s.model_dump() for s in threaded] == [s.model_dump() for s in serial]
+    assert [s.model_dump() for s in procs] == [s.model_dump() for s in serial]
+    assert [s.name for s in serial] == sorted(s.name for s in serial)
+    with pytest.raises(ValueError):
+        SkillHubClient(skills_dir=tmp_path, pool="fiber")
+
+
+@pytest.mark.parametrize("strategy", ["copy", "hardlink", "reflink", "symlink"])
+def test_install_strategies_share_store(tmp_path, strategy, write_skill):
+    from client.installer import SkillInstaller
+    from client.models import Skill
+
+    src = write_skill(tmp_path / "src", "shared")
+    (src / "run.py").write_text("print('hi')\n", encoding="utf-8")
+    os.chmod(src / "run.py", 0o755)
+    skill = Skill(name="shared", version="1.0.0", description="test", author="t", entrypoint="run.py")
+    store = tmp_path / "store"
+
+    dests = []
+    for tenant in ("a", "b", "c"):
+        installer = SkillInstaller(
+            target_dir=tmp_path / tenant, lockfile_path=tmp_path / tenant / "lock.json",
+            strategy=strategy, store_dir=store,
+        )
+        dests.append(installer.install(skill, src))
+
+    for dest in dests:
+        assert (dest / "run.py").read_text(encoding="utf-8") == "print('hi')\n"
+        assert os.access(dest / "run.py", os.X_OK)
+        assert SkillHubClient(skills_dir=dest.parent).validate_install() == {"shared": True}
+    if strategy == "copy":
+        assert not store.exists()
+        return
+    assert len([p for p in store.iterdir() if not p.name.startswith(".")]) == 1
+    stored = next(store.iterdir()) / "run.py"
+    if strategy == "hardlink":
+        assert all(os.path.samestat((d / "run.py").stat(), stored.stat()) for d in dests)
+    elif strategy == "symlink":
+        assert all(d.is_symlink() and (d / "run.py").resolve() == stored.resolve() for d in dests)
+    else:
+        (dests[0] / "run.py").write_text("changed\n", encoding="utf-8")
+        assert stored.read_text(encoding="utf-8") == "print('hi')\n"
+
+    installer.uninstall("shared")
+    assert not os.path.lexists(dests[-1]) and stored.exists()
+
+
+def test_install_rejects_unknown_strategy(tmp_path):
+    from client.installer import SkillInstaller
+
+    with pytest.raises(ValueError):
+        SkillInstaller(target_dir=tmp_path, strategy="teleport")
+
+
+def test_list_skills_records_match_models(tmp_path):
+    import shutil
+
+    from client.record import SkillRecord
+
+    shutil.copytree(REPO_ROOT / "skills", tmp_path / "skills")
+    for use_cache in (False, True, True):  # uncached, cache fill, cache hit
+        client = SkillHubClient(skills_dir=tmp_path / "skills", use_cache=use_cache)
+        records = client.list_skills(validate=False)
+        models = SkillHubClient(skills_dir=tmp_path / "skills", use_cache=False).list_skills()
+        assert records and all(isinstance(r, SkillRecord) for r in records)
+        assert [r._asdict() for r in records] == [m.model_dump() for m in models]
+        assert [r.to_skill() for r in records] == models
+
+
+def test_unvalidated_listing_does_not_poison_validated_cache(tmp_path):
+    from pydantic import ValidationError
+
+    from client.registry import SkillRegistry
+
+    bad = tmp_path / "bad"
+    bad.mkdir()
+    (bad / "SKILL.md").write_text(
+        '---\nname: bad\nversion: "1.0.0"\ndescription: d\nentrypoint: run.py\n---\n', encoding="utf-8"
+    )  # no author
+    records = SkillHubClient(skills_dir=tmp_path).list_skills(validate=False)
+    assert [r.author for r in records] == [""]
+
+    with pytest.raises(ValidationError):
+        SkillHubClient(skills_dir=tmp_path).list_skills()
+    snap = SkillRegistry(tmp_path).refresh()
+    assert "bad" in snap.errors and not snap.skills
+
+
+def test_iter_skills_streams_and_filters_before_parsing(tmp_path, monkeypatch, write_skill):
+    import client.client as cc
+
+    for n in ("alpha", "beta", "gamma", "delta"):
+        write_skill(tmp_path, n)
+    (tmp_path / "notes.txt").write_text("not a skill", encoding="utf-8")
+    calls = []
+    real = cc._parse_frontmatter
+    monkeypatch.setattr(cc, "_parse_frontmatter", lambda p: calls.append(p.parent.name) or real(p))
+    client = SkillHubClient(skills_dir=tmp_path, use_cache=False)
+
+    stats = []
+    real_stat = cc.os.stat
+    monkeypatch.setattr(
+        cc.os, "stat", lambda p, *a, **kw: stats.append(Path(p).parent.name) or real_stat(p, *a, **kw)
+    )
+    it = client.iter_skills()
+    assert next(it).name == "alpha"
+    assert calls == ["alpha"]  # nothing else read yet
+    assert stats == ["alpha"]  # ...or even stat'ed
+    it.close()
+    monkeypatch.setattr(cc.os, "stat", real_stat)
+
+    calls.clear()
+    assert [s.name for s in client.iter_skills(names=["gamma", "missing"])] == ["gamma"]
+    assert [s.name for s in client.iter_skills(pattern="*ta")] == ["beta", "delta"]
+    assert calls == ["gamma", "beta", "delta"]
+    assert list(client.iter_skills(tags=["nope"])) == []
+    repo = SkillHubClient(skills_dir=REPO_ROOT / "skills", use_cache=False)
+    assert [s.name for s in repo.iter_skills(tags=["example", "demo"])] == ["example-skill"]
+
+
+def test_list_cli_filters(tmp_path, monkeypatch, capsys, write_skill):
+    import sys
+
+    from client.client import main
+
+    write_skill(tmp_path, "alpha")
+    write_skill(tmp_path, "beta")
+    monkeypatch.setattr(sys, "argv", ["skillhub", "--skills-dir", str(tmp_path), "list", "--glob", "b*"])
+    main()
+    out = capsys.readouterr().out
+    assert "beta" in out and "alpha" not in out
@@ -0,0 +1,149 @@
+import hashlib
+import io
+import os
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from client.download import DownloadError, download
+from client.remote import fetch_artifact
+from client.store import ArtifactStore
+
+
+def synthetic_zip(size: int) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as zf:
+        zf.writestr("big/SKILL.md", "---\nname: big\n---\n")
+        zf.writestr("big/blob.bin", os.urandom(size))
+    return buf.getvalue()
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Serves one payload with Range support; can drop the first connection midway."""
+
+    payload = b""
+    drop_after = None
+    honour_range = True
+    range_offset = 0
+    chunk_delay = 0.0
+    seen: list = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        cls = type(self)
+        cls.seen.append(self.headers.get("Range"))
+        start = 0
+        rng = self.headers.get("Range")
+        if rng and cls.honour_range:
+            start = int(rng.split("=")[1].rstrip("-")) + cls.range_offset
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(cls.payload) - 1}/{len(cls.payload)}")
+        else:
+            self.send_response(200)
+        body = cls.payload[start:]
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if cls.drop_after is not None:
+            self.wfile.write(body[: cls.drop_after])
+            cls.drop_after = None
+            self.close_connection = True
+            return
+        if cls.chunk_delay:
+            for i in range(0, len(body), 256 * 1024):
+                self.wfile.write(body[i:i + 256 * 1024])
+                time.sleep(cls.chunk_delay)
+            return
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    RangeHandler.payload = synthetic_zip(6 * 1024 * 1024)
+    RangeHandler.drop_after = None
+    RangeHandler.honour_range = True
+    RangeHandler.range_offset = 0
+    RangeHandler.chunk_delay = 0.0
+    RangeHandler.seen = []
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}/big.zip"
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_download_hashes_while_streaming(server, tmp_path):
+    dest = tmp_path / "big.zip"
+    expected = hashlib.sha256(RangeHandler.payload).hexdigest()
+    assert download(server, dest, expected_sha256=expected) == expected
+    assert zipfile.ZipFile(dest).testzip() is None
+
+
+def test_download_resumes_after_dropped_connection(server, tmp_path):
+    dest = tmp_path / "big.zip"
+    RangeHandler.drop_after = 2 * 1024 * 1024
+    expected = hashlib.sha256(RangeHandler.payload).hexdigest()
+    assert download(server, dest, expected_sha256=expected) == expected
+    assert RangeHandler.seen == [None, f"bytes={2 * 1024 * 1024}-"]
+    assert dest.read_bytes() == RangeHandler.payload
+
+
+def test_download_resumes_partial_file_and_handles_ignored_range(server, tmp_path):
+    dest = tmp_path / "big.zip"
+    dest.write_bytes(RangeHandler.payload[:1000])
+    download(server, dest)
+    assert RangeHandler.seen == ["bytes=1000-"]
+    assert dest.read_bytes() == RangeHandler.payload
+
+    dest.write_bytes(RangeHandler.payload[:1000])
+    RangeHandler.honour_range = False
+    download(server, dest)
+    assert dest.read_bytes() == RangeHandler.payload
+
+
+def test_download_restarts_on_wrong_content_range(server, tmp_path):
+    dest = tmp_path / "big.zip"
+    dest.write_bytes(RangeHandler.payload[:1000])
+    RangeHandler.range_offset = 10  # answers 206 for bytes 1010- instead of 1000-
+    expected = hashlib.sha256(RangeHandler.payload).hexdigest()
+    assert download(server, dest, expected_sha256=expected) == expected
+    assert RangeHandler.seen == ["bytes=1000-", None]
+    assert dest.read_bytes() == RangeHandler.payload
+
+
+def test_download_limits_and_mismatch(server, tmp_path):
+    dest = tmp_path / "big.zip"
+    with pytest.raises(DownloadError, match="limit"):
+        download(server, dest, max_bytes=1024 * 1024)
+    assert not dest.exists()
+    with pytest.raises(DownloadError, match="mismatch"):
+        download(server, dest, expected_sha256="0" * 64)
+    assert not dest.exists()
+
+
+def test_concurrent_fetches_of_one_digest_download_once(server, tmp_path):
+    RangeHandler.chunk_delay = 0.01  # slow enough for the fetches to overlap
+    expected = hashlib.sha256(RangeHandler.payload).hexdigest()
+    store = ArtifactStore(tmp_path / "store")
+    entry = {"download_url": server, "sha256": expected}
+    results, errors = [], []
+
+    def fetch():
+        try:
+            results.append(fetch_artifact(entry, store))
+        except Exception as e:  # surfaced below
+            errors.append(e)
+
+    threads = [threading.Thread(target=fetch) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert {digest for _, digest in results} == {expected}
+    assert RangeHandler.seen == [None]  # the waiters found the blob instead of downloading
+    assert store.get(expected).read_bytes() == RangeHandler.payload
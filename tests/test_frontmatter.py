@@ -0,0 +1,35 @@
+from pathlib import Path
+
+import pytest
+
+from client.frontmatter import FrontmatterError, load_frontmatter, read_frontmatter_text
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_frontmatter_stops_before_body(tmp_path):
+    md = tmp_path / "SKILL.md"
+    # an undecodable body proves the extractor never reads past the closing delimiter
+    md.write_bytes(b"---\nname: x\nversion: \"1.0.0\"\n---\n" + b"\xff\xfe" * 100_000)
+    assert load_frontmatter(md) == {"name": "x", "version": "1.0.0"}
+
+
+def test_frontmatter_matches_split_parser():
+    import yaml
+
+    for md in sorted((REPO_ROOT / "skills").rglob("SKILL.md")):
+        text = md.read_text(encoding="utf-8")
+        assert load_frontmatter(md) == yaml.safe_load(text.split("---", 2)[1])
+
+
+def test_frontmatter_errors(tmp_path):
+    md = tmp_path / "SKILL.md"
+    md.write_text("# no frontmatter\n", encoding="utf-8")
+    with pytest.raises(FrontmatterError):
+        read_frontmatter_text(md)
+    md.write_text("---\nname: x\n", encoding="utf-8")
+    with pytest.raises(FrontmatterError, match="malformed"):
+        read_frontmatter_text(md)
+    md.write_text("---\n- a\n- b\n---\n", encoding="utf-8")
+    with pytest.raises(FrontmatterError, match="mapping"):
+        load_frontmatter(md)
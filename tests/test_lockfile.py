@@ -0,0 +1,105 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from client.lockfile import LockFile, SqliteLockFile, convert_lockfile, open_lockfile
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_batch_reads_and_writes_once(tmp_path, monkeypatch):
+    lock = LockFile(tmp_path / "skills-lock.json")
+    lock.add_entries({"seed": {"version": "1", "checksum": "c"}})
+    writes = []
+    real_write = LockFile._write
+    monkeypatch.setattr(LockFile, "_write", lambda self, data: writes.append(1) or real_write(self, data))
+
+    with lock.batch():
+        for i in range(100):
+            lock.add_entries({f"s{i}": {"version": "1.0.0", "checksum": str(i)}})
+        assert lock.remove("seed")
+        assert not lock.remove("missing")
+        with lock.batch():
+            lock.remove("s0")
+        assert "s0" not in lock.list_installed()
+    assert len(writes) == 1
+    installed = LockFile(lock.path).list_installed()
+    assert len(installed) == 99 and "seed" not in installed
+
+
+def test_batch_discards_changes_on_error(tmp_path):
+    lock = LockFile(tmp_path / "skills-lock.json")
+    lock.add_entries({"a": {"version": "1", "checksum": "c"}})
+    before = lock.path.read_text()
+    with pytest.raises(RuntimeError):
+        with lock.batch():
+            lock.remove("a")
+            raise RuntimeError("abort")
+    assert lock.path.read_text() == before
+
+
+WRITER = """
+import sys
+from client.lockfile import LockFile
+lock = LockFile(sys.argv[1])
+for i in range(int(sys.argv[3])):
+    if i % 5 == 0:
+        with lock.batch():
+            lock.add_entries({f"{sys.argv[2]}-{i}": {"version": "1", "checksum": "x"}})
+            lock.add_entries({f"{sys.argv[2]}-{i}b": {"version": "1", "checksum": "x"}})
+            lock.remove(f"{sys.argv[2]}-{i}b")
+    else:
+        lock.add_entries({f"{sys.argv[2]}-{i}": {"version": "1", "checksum": "x"}})
+"""
+
+
+def test_parallel_writer_processes_lose_nothing(tmp_path):
+    path = tmp_path / "skills-lock.json"
+    writers, per_writer = 8, 40
+    procs = [
+        subprocess.Popen([sys.executable, "-c", WRITER, str(path), f"w{n}", str(per_writer)], cwd=REPO_ROOT)
+        for n in range(writers)
+    ]
+    assert all(p.wait(timeout=120) == 0 for p in procs)
+    skills = json.loads(path.read_text())["skills"]
+    assert len(skills) == writers * per_writer
+    assert sorted(p.name for p in tmp_path.iterdir()) == [".skills-lock.json.lock", "skills-lock.json"]
+
+
+def test_sqlite_backend_matches_json_interface(tmp_path):
+    lock = open_lockfile(tmp_path / "skills-lock.sqlite")
+    assert isinstance(lock, SqliteLockFile)
+    lock.add_entries({f"s{i}": {"version": "1.0.0", "checksum": str(i)} for i in range(1000)})
+    assert lock.get("s7") == {"version": "1.0.0", "checksum": "7"}
+    assert lock.get("nope") is None
+    assert lock.remove("s7") and not lock.remove("s7")
+    with pytest.raises(RuntimeError):
+        with lock.batch():
+            lock.remove("s8")
+            raise RuntimeError("abort")
+    assert lock.get("s8") is not None
+    lock.close()
+    # detected by content, whatever the name
+    (tmp_path / "skills-lock.sqlite").rename(tmp_path / "renamed")
+    assert len(open_lockfile(tmp_path / "renamed").list_installed()) == 999
+
+
+def test_convert_json_to_sqlite_and_back(tmp_path, monkeypatch):
+    from client.client import main
+
+    src = LockFile(tmp_path / "skills-lock.json")
+    src.add_entries({"a": {"version": "1", "checksum": "x"}, "b": {"version": "2", "checksum": "y"}})
+    assert convert_lockfile(src.path, tmp_path / "lock.db") == 2
+    db = open_lockfile(tmp_path / "lock.db")
+    db.remove("a")
+    db.add_entries({"c": {"version": "3", "checksum": "z"}})
+
+    monkeypatch.setattr(sys, "argv", ["skillhub", "lockfile", "convert", str(tmp_path / "lock.db"), str(src.path)])
+    main()
+    assert json.loads(src.path.read_text())["skills"] == {
+        "b": {"version": "2", "checksum": "y"},
+        "c": {"version": "3", "checksum": "z"},
+    }
@@ -8,8 +8,11 @@ def test_pack_skill(tmp_path):
     pkg = __import__("importlib").machinery.SourceFileLoader("pack_skill", str(REPO_ROOT / "scripts" / "pack_skill.py")).load_module()
     archive = pkg.pack(REPO_ROOT / "skills" / "example-skill")
     assert archive.exists()
+    manifest = pkg.manifest_path(archive)
+    assert manifest.exists()
     # cleanup
     archive.unlink()
+    manifest.unlink()
 
 
 def test_validate_skill():
@@ -17,3 +20,191 @@ def test_validate_skill():
     # validate one SKILL.md
     ok = validator.validate(REPO_ROOT / "skills" / "example-skill" / "SKILL.md")
     assert ok
+
+
+def _load_pack():
+    import importlib.machinery
+
+    return importlib.machinery.SourceFileLoader(
+        "pack_skill", str(REPO_ROOT / "scripts" / "pack_skill.py")
+    ).load_module()
+
+
+def _make_skill(root: Path, name: str) -> Path:
+    d = root / name
+    (d / "scripts").mkdir(parents=True)
+    (d / "SKILL.md").write_text(f"---\nname: {name}\n---\n")
+    (d / "scripts" / "run.sh").write_text("#!/bin/sh\necho hi\n")
+    (d / "scripts" / "run.sh").chmod(0o775)
+    return d
+
+
+def test_pack_is_reproducible(tmp_path):
+    import os
+    import zipfile
+
+    pkg = _load_pack()
+    skill = _make_skill(tmp_path / "skills", "demo")
+    first = pkg.pack(skill, tmp_path / "out").read_bytes()
+    os.utime(skill / "SKILL.md", (1_700_000_000, 1_700_000_000))
+    (skill / "scripts" / "run.sh").chmod(0o700)
+    assert pkg.pack(skill, tmp_path / "out").read_bytes() == first
+
+    with zipfile.ZipFile(tmp_path / "out" / "demo.zip") as zf:
+        assert zf.namelist() == ["demo/SKILL.md", "demo/scripts/run.sh"]
+        assert (zf.getinfo("demo/scripts/run.sh").external_attr >> 16) & 0o777 == 0o755
+
+
+def test_pack_all_incremental(tmp_path):
+    import json
+
+    pkg = _load_pack()
+    skills = tmp_path / "skills"
+    for name in ("a", "b", "c"):
+        _make_skill(skills, name)
+    index = tmp_path / "index.json"
+    index.write_text(json.dumps({"version": 1, "skills": [
+        {"slug": "b", "sha256": "old", "download_url": "https://h/rel/b.zip"},
+    ]}))
+    sha_file = tmp_path / "releases" / "sha.txt"
+
+    results = pkg.pack_all(skills, tmp_path / "dist", jobs=2)
+    assert [r["status"] for r in results.values()] == ["packed"] * 3
+    pkg.write_release_metadata(results, sha_file, index)
+    assert sha_file.read_text().splitlines()[1] == f"b {results['b']['sha256']}"
+    entry = json.loads(index.read_text())["skills"][0]
+    assert entry["sha256"] == results["b"]["sha256"]
+    assert entry["manifest_url"] == "https://h/rel/b.manifest.json"
+    assert entry["manifest_sha256"] == pkg.checksum(tmp_path / "dist" / "b.manifest.json")
+
+    (skills / "b" / "SKILL.md").write_text("---\nname: b\nversion: 2\n---\n")
+    again = pkg.pack_all(skills, tmp_path / "dist", jobs=2)
+    assert {n: r["status"] for n, r in again.items()} == {
+        "a": "unchanged", "b": "packed", "c": "unchanged"
+    }
+    assert again["a"]["sha256"] == results["a"]["sha256"]
+    assert again["b"]["sha256"] != results["b"]["sha256"]
+
+
+def test_auto_compression_per_file(tmp_path):
+    import os
+    import zipfile
+
+    import pytest
+
+    pkg = _load_pack()
+    skill = _make_skill(tmp_path / "skills", "media")
+    (skill / "logo.png").write_bytes(b"\x89PNG" + b"x" * 5000)
+    (skill / "noise.bin").write_bytes(os.urandom(5000))
+    (skill / "prompt.md").write_text("compress me " * 500)
+    with zipfile.ZipFile(pkg.pack(skill, tmp_path / "out")) as zf:
+        types = {i.filename.split("/", 1)[1]: i.compress_type for i in zf.infolist()}
+    assert types["logo.png"] == zipfile.ZIP_STORED
+    assert types["noise.bin"] == zipfile.ZIP_STORED
+    assert types["SKILL.md"] == zipfile.ZIP_STORED  # below MIN_DEFLATE_SIZE
+    assert types["prompt.md"] == zipfile.ZIP_DEFLATED
+
+    (skill / "SKILL.md").write_text("---\nname: media\npack:\n  compression: stored\n---\n")
+    with zipfile.ZipFile(pkg.pack(skill, tmp_path / "out")) as zf:
+        assert {i.compress_type for i in zf.infolist()} == {zipfile.ZIP_STORED}
+    with zipfile.ZipFile(pkg.pack(skill, tmp_path / "out", "deflate:9")) as zf:
+        assert {i.compress_type for i in zf.infolist()} == {zipfile.ZIP_DEFLATED}
+
+    for bad in ("gzip", "deflate:12", "stored:1", "zstd:0"):
+        with pytest.raises(ValueError):
+            pkg.parse_compression(bad)
+
+
+def test_zstd_tar_roundtrip(tmp_path):
+    import pytest
+
+    pytest.importorskip("zstandard")
+    from client.client import safe_extract
+
+    pkg = _load_pack()
+    skill = _make_skill(tmp_path / "skills", "zs")
+    archive = pkg.pack(skill, tmp_path / "out", "zstd:3")
+    assert archive.name == "zs.tar.zst"
+    assert pkg.pack(skill, tmp_path / "out", "zstd:3").read_bytes() == archive.read_bytes()
+    extracted = safe_extract(archive, tmp_path / "x")
+    assert sorted(extracted) == ["zs/SKILL.md", "zs/scripts/run.sh"]
+    assert (tmp_path / "x" / "zs" / "scripts" / "run.sh").stat().st_mode & 0o111
+
+
+def test_format_switch_updates_url_and_drops_stale_artifacts(tmp_path):
+    import json
+
+    import pytest
+
+    pytest.importorskip("zstandard")
+    pkg = _load_pack()
+    skills = tmp_path / "skills"
+    _make_skill(skills, "z")
+    dist = tmp_path / "dist"
+    index = tmp_path / "index.json"
+    index.write_text(json.dumps({"version": 1, "skills": [{"slug": "z", "download_url": "https://h/rel/z.zip"}]}))
+
+    pkg.write_release_metadata(pkg.pack_all(skills, dist), tmp_path / "sha.txt", index)
+    assert (dist / "z.zip").exists() and (dist / "z.manifest.json").exists()
+
+    results = pkg.pack_all(skills, dist, compression="zstd")
+    pkg.write_release_metadata(results, tmp_path / "sha.txt", index)
+    assert sorted(p.name for p in dist.iterdir() if not p.name.startswith(".")) == ["z.tar.zst"]
+    entry = json.loads(index.read_text())["skills"][0]
+    assert entry["format"] == "tar.zst"
+    assert entry["download_url"] == "https://h/rel/z.tar.zst"
+    assert "manifest_url" not in entry and "manifest_sha256" not in entry
+
+
+def _load_validate():
+    import importlib.machinery
+
+    return importlib.machinery.SourceFileLoader(
+        "validate_skill", str(REPO_ROOT / "scripts" / "validate_skill.py")
+    ).load_module()
+
+
+def test_validate_all_reports_and_skips_unchanged(tmp_path, monkeypatch):
+    import json
+    import shutil
+    import xml.etree.ElementTree as ET
+
+    vs = _load_validate()
+    shutil.copytree(REPO_ROOT / "skills", tmp_path / "skills")
+    bad = tmp_path / "skills" / "broken"
+    bad.mkdir()
+    (bad / "SKILL.md").write_text("---\nname: Not Valid\n---\n", encoding="utf-8")
+    paths = sorted((tmp_path / "skills").glob("*/SKILL.md"))
+    cache = tmp_path / "cache.json"
+
+    results = vs.validate_all(paths, jobs=2, backend="jsonschema", cache_path=cache)
+    assert list(results) == [str(p) for p in paths]
+    assert [p for p, r in results.items() if not r["ok"]] == [str(bad / "SKILL.md")]
+    assert not any(r["cached"] for r in results.values())
+
+    checked = []
+    monkeypatch.setattr(vs, "_check_one", lambda w: checked.append(w[0]) or (w[0], vs.check_file(Path(w[0]), w[1])))
+    (bad / "SKILL.md").write_text("---\nname: still-bad\n---\n", encoding="utf-8")
+    again = vs.validate_all(paths, jobs=1, backend="jsonschema", cache_path=cache)
+    assert checked == [str(bad / "SKILL.md")]
+    assert sum(r["cached"] for r in again.values()) == len(paths) - 1
+    assert [r["ok"] for r in again.values()] == [r["ok"] for r in results.values()]
+
+    vs.write_json_report(again, tmp_path / "r.json")
+    vs.write_junit_report(again, tmp_path / "r.xml")
+    assert json.loads((tmp_path / "r.json").read_text())["failed"] == 1
+    suite = ET.parse(tmp_path / "r.xml").getroot().find("testsuite")
+    assert suite.get("tests") == str(len(paths)) and len(suite.findall("testcase/failure")) == 1
+
+
+def test_validate_backends_agree():
+    import importlib.util
+
+    vs = _load_validate()
+    backends = ["jsonschema"] + (["fastjsonschema"] if importlib.util.find_spec("fastjsonschema") else [])
+    for skill_md in sorted((REPO_ROOT / "skills").glob("*/SKILL.md")):
+        assert all(vs.check_file(skill_md, b) == [] for b in backends)
+    for b in backends:
+        assert vs.compiled_validator(b)({"name": "UPPER"})
+    # auto never silently switches to fastjsonschema
+    assert vs.resolve_backend("auto") == "jsonschema"
@@ -0,0 +1,49 @@
+import shutil
+import time
+
+import pytest
+
+from client.registry import SkillRegistry
+from client.swap import swap_dir
+
+
+@pytest.mark.parametrize("use_inotify", [True, False], ids=["inotify", "poll"])
+def test_registry_follows_changes(tmp_path, use_inotify, write_skill):
+    write_skill(tmp_path, "a")
+    with SkillRegistry(tmp_path, use_inotify=use_inotify, poll_interval=0.05) as reg:
+        if use_inotify and reg.mode != "inotify":
+            pytest.skip("inotify not available")
+        first = reg.snapshot
+        assert first.generation == 1 and list(first.skills) == ["a"]
+
+        write_skill(tmp_path, "b")
+        snap = reg.wait_for(2, timeout=5)
+        assert sorted(snap.skills) == ["a", "b"]
+        assert list(first.skills) == ["a"]  # old snapshots never change
+
+        time.sleep(0.01)
+        write_skill(tmp_path, "a", "2.0.0")
+        snap = reg.wait_for(snap.generation + 1, timeout=5)
+        assert snap.get("a").version == "2.0.0"
+
+        shutil.rmtree(tmp_path / "b")
+        snap = reg.wait_for(snap.generation + 1, timeout=5)
+        assert list(snap.skills) == ["a"]
+
+        # an installer-style atomic swap of the whole tree
+        staged = write_skill(tmp_path / ".staging-a-1", "new", "3.0.0", name="a")
+        swap_dir(staged, tmp_path / "a", tmp_path / ".staging-a-1" / "previous")
+        snap = reg.wait_for(snap.generation + 1, timeout=5)
+        assert snap.get("a").version == "3.0.0"
+    assert reg.snapshot is snap
+
+
+def test_registry_reports_invalid_skills_and_skips_unchanged(tmp_path, write_skill):
+    write_skill(tmp_path, "good")
+    write_skill(tmp_path, "bad", author="[1, 2]")
+    reg = SkillRegistry(tmp_path)
+    snap = reg.refresh()
+    assert list(snap.skills) == ["good"] and "bad" in snap.errors
+    assert reg.refresh() is snap  # nothing changed: no new generation
+    write_skill(tmp_path, "bad", author="fixed")
+    assert sorted(reg.refresh(["bad"]).skills) == ["bad", "good"]
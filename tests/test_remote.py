@@ -0,0 +1,433 @@
+import functools
+import hashlib
+import importlib.machinery
+import io
+import json
+import sys
+import threading
+import zipfile
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from client.client import SkillHubClient, main
+from client.remote import IndexCache, RemoteError, fetch_index, open_index
+from client.shards import write_shards
+from client.swap import wait_for_gc
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Static handler that also honours strong ETags and counts requests."""
+
+    requests: list = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_head(self):
+        QuietHandler.requests.append((self.path, self.headers.get("If-None-Match")))
+        path = Path(self.translate_path(self.path))
+        rng = self.headers.get("Range")
+        if rng and path.is_file():
+            QuietHandler.requests[-1] = (self.path, rng)
+            data = path.read_bytes()
+            start, _, end = rng.split("=")[1].partition("-")
+            end = int(end) if end else len(data) - 1
+            body = data[int(start):end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            return io.BytesIO(body)
+        if path.is_file():
+            etag = '"%s"' % hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return None
+            self._etag = etag
+        return super().send_head()
+
+    def end_headers(self):
+        etag = getattr(self, "_etag", None)
+        if etag:
+            self.send_header("ETag", etag)
+            self._etag = None
+        super().end_headers()
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("SKILLHUB_CACHE_DIR", str(tmp_path / "cache"))
+    QuietHandler.requests = []
+
+
+@pytest.fixture
+def http_root(tmp_path):
+    """Serve a temporary directory over HTTP; yields (root_dir, base_url)."""
+    root = tmp_path / "www"
+    root.mkdir()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=str(root)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield root, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_artifact(root: Path, slug: str, version: str = "1.0.0") -> dict:
+    archive = root / f"{slug}.zip"
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(
+            f"{slug}/SKILL.md",
+            f"---\nname: {slug}\nversion: \"{version}\"\ndescription: d\nauthor: a\n"
+            f"entrypoint: run.py\n---\n",
+        )
+        zf.writestr(f"{slug}/run.py", f"print('{slug} {version}')\n")
+    return {
+        "slug": slug,
+        "name": slug,
+        "version": version,
+        "description": "d",
+        "author": "a",
+        "sha256": hashlib.sha256(archive.read_bytes()).hexdigest(),
+    }
+
+
+def publish(root: Path, base: str, entries: list[dict]) -> str:
+    for e in entries:
+        e["download_url"] = f"{base}/{e['slug']}.zip"
+    (root / "index.json").write_text(json.dumps({"version": 1, "skills": entries}))
+    return f"{base}/index.json"
+
+
+def publish_sharded(root: Path, base: str, entries: list[dict]) -> str:
+    """Publish *entries* as a version 2 index; return the root manifest URL."""
+    publish(root, base, entries)
+    write_shards(root / "index.json", root / "index")
+    return f"{base}/index/root.json"
+
+
+def run_cli(monkeypatch, *argv) -> int:
+    monkeypatch.setattr(sys, "argv", ["skillhub", *argv])
+    try:
+        main()
+    except SystemExit as e:
+        return e.code or 0
+    return 0
+
+
+def test_install_many_concurrently(http_root, tmp_path, monkeypatch, capsys):
+    root, base = http_root
+    entries = [make_artifact(root, f"skill-{i}") for i in range(6)]
+    entries[3]["sha256"] = "0" * 64  # one corrupt artifact must not abort the rest
+    index_url = publish(root, base, entries)
+    monkeypatch.chdir(tmp_path)
+
+    code = run_cli(monkeypatch, "--index-url", index_url, "install", "--all", "--jobs", "3")
+    out = capsys.readouterr().out
+    assert code == 1
+    assert "FAILED skill-3: SHA256 mismatch" in out
+    for i in (0, 1, 2, 4, 5):
+        assert f"Installed skill-{i}" in out
+        assert (tmp_path / "skills" / f"skill-{i}" / "run.py").exists()
+    assert not (tmp_path / "skills" / "skill-3").exists()
+
+    lock = json.loads((tmp_path / "skills-lock.json").read_text())["skills"]
+    assert sorted(lock) == ["skill-0", "skill-1", "skill-2", "skill-4", "skill-5"]
+    assert lock["skill-0"]["checksum"] == entries[0]["sha256"]
+
+
+def test_parse_and_download_jobs_are_separate(http_root, tmp_path, monkeypatch):
+    import client.client as cc
+    import client.remote as remote
+
+    root, base = http_root
+    index_url = publish(root, base, [make_artifact(root, "a")])
+    monkeypatch.chdir(tmp_path)
+    seen = {}
+    real_init, real_install = cc.SkillHubClient.__init__, remote.install_many
+
+    def init(self, *args, **kw):
+        seen["workers"] = kw["workers"]
+        real_init(self, *args, **kw)
+
+    def install_many(*args, **kw):
+        seen["jobs"] = kw["jobs"]
+        return real_install(*args, **kw)
+
+    monkeypatch.setattr(cc.SkillHubClient, "__init__", init)
+    monkeypatch.setattr(remote, "install_many", install_many)
+    assert run_cli(monkeypatch, "--index-url", index_url, "--parse-jobs", "8", "install", "a") == 0
+    assert seen == {"workers": 8, "jobs": 4}
+    assert run_cli(monkeypatch, "--index-url", index_url, "install", "a", "--jobs", "2") == 0
+    assert seen == {"workers": 0, "jobs": 2}
+
+
+def test_install_named_slugs(http_root, tmp_path, monkeypatch, capsys):
+    root, base = http_root
+    index_url = publish(root, base, [make_artifact(root, "a"), make_artifact(root, "b")])
+    monkeypatch.chdir(tmp_path)
+
+    assert run_cli(monkeypatch, "--index-url", index_url, "install", "a", "b") == 0
+    assert (tmp_path / "skills" / "a" / "SKILL.md").exists()
+    assert (tmp_path / "skills" / "b" / "SKILL.md").exists()
+    assert run_cli(monkeypatch, "--index-url", index_url, "install", "nope") == 1
+    assert "not found in index" in capsys.readouterr().out
+
+
+def test_install_rejects_slugs_outside_skills_dir(http_root, tmp_path, monkeypatch, capsys):
+    root, base = http_root
+    good = make_artifact(root, "a")
+    evil = dict(make_artifact(root, "b"), slug="../escaped")
+    index_url = publish(root, base, [good, evil, dict(good, slug=str(tmp_path / "abs"))])
+    monkeypatch.chdir(tmp_path)
+
+    assert run_cli(monkeypatch, "--index-url", index_url, "install", "--all") == 1
+    out = capsys.readouterr().out
+    assert "FAILED ../escaped: invalid slug" in out
+    assert (tmp_path / "skills" / "a" / "SKILL.md").exists()
+    assert not (tmp_path / "escaped").exists() and not (tmp_path / "abs").exists()
+
+
+def test_index_cache_revalidates_with_etag(http_root, tmp_path):
+    root, base = http_root
+    index_url = publish(root, base, [make_artifact(root, "a")])
+    cache = IndexCache(tmp_path / "cache")
+
+    assert fetch_index(index_url, cache=cache)["skills"][0]["slug"] == "a"
+    assert fetch_index(index_url, cache=cache)["skills"][0]["slug"] == "a"
+    assert len(QuietHandler.requests) == 1  # second call served from cache within max-age
+
+    assert fetch_index(index_url, cache=cache, max_age=0)["skills"][0]["slug"] == "a"
+    assert len(QuietHandler.requests) == 2
+    assert QuietHandler.requests[-1][1] is not None  # conditional request, answered 304
+
+    publish(root, base, [make_artifact(root, "a"), make_artifact(root, "b")])
+    assert len(fetch_index(index_url, cache=cache, max_age=0)["skills"]) == 2
+    assert len(fetch_index(index_url, cache=cache, offline=True)["skills"]) == 2
+    assert len(QuietHandler.requests) == 3
+
+
+def test_index_cache_offline_and_stale_fallback(tmp_path):
+    cache = IndexCache(tmp_path / "cache")
+    url = "http://127.0.0.1:9/index.json"  # discard port: connection refused
+    with pytest.raises(RemoteError):
+        fetch_index(url, cache=cache, offline=True)
+    cache.store(url, b'{"version": 1, "skills": []}', None)
+    assert fetch_index(url, cache=cache, offline=True) == {"version": 1, "skills": []}
+    assert fetch_index(url, cache=cache, max_age=0) == {"version": 1, "skills": []}
+
+
+def test_reinstall_served_from_artifact_store(http_root, tmp_path, monkeypatch, capsys):
+    root, base = http_root
+    index_url = publish(root, base, [make_artifact(root, "a")])
+    monkeypatch.chdir(tmp_path)
+
+    assert run_cli(monkeypatch, "--index-url", index_url, "install", "a") == 0
+    downloads = [p for p, _ in QuietHandler.requests if p.endswith(".zip")]
+    assert len(downloads) == 1
+
+    (root / "a.zip").unlink()  # a store hit must not touch the network
+    assert run_cli(monkeypatch, "--index-url", index_url, "install", "a") == 0
+    assert [p for p, _ in QuietHandler.requests if p.endswith(".zip")] == downloads
+    assert (tmp_path / "skills" / "a" / "run.py").exists()
+
+    assert run_cli(monkeypatch, "cache", "stats") == 0
+    assert "entries: 1" in capsys.readouterr().out
+    assert run_cli(monkeypatch, "cache", "gc", "--max-mb", "0") == 0
+    assert "Evicted 1" in capsys.readouterr().out
+
+
+def test_version_key_ordering():
+    from client.update import version_key
+
+    ordered = ["0.9.9", "0.10.0-alpha", "0.10.0-alpha.2", "0.10.0-beta", "0.10.0", "1.0.0"]
+    assert sorted(ordered, key=version_key) == ordered
+
+
+def test_update_fetches_only_changed_skills(http_root, tmp_path, monkeypatch, capsys):
+    root, base = http_root
+    entries = [make_artifact(root, s) for s in ("a", "b", "c")]
+    index_url = publish(root, base, entries)
+    monkeypatch.chdir(tmp_path)
+    assert run_cli(monkeypatch, "--index-url", index_url, "install", "--all") == 0
+
+    assert run_cli(monkeypatch, "--index-url", index_url, "--max-age", "0", "update") == 0
+    assert "up to date" in capsys.readouterr().out
+
+    entries[1] = make_artifact(root, "b", version="1.1.0")
+    publish(root, base, entries)
+    QuietHandler.requests = []
+    assert run_cli(monkeypatch, "--index-url", index_url, "--max-age", "0", "update") == 0
+    out = capsys.readouterr().out
+    assert "b: 1.0.0 -> 1.1.0 (version)" in out
+    assert [p for p, _ in QuietHandler.requests if p.endswith(".zip")] == ["/b.zip"]
+    assert "1.1.0" in (tmp_path / "skills" / "b" / "run.py").read_text()
+    lock = json.loads((tmp_path / "skills-lock.json").read_text())["skills"]
+    assert lock["b"] == {"version": "1.1.0", "checksum": entries[1]["sha256"]}
+    wait_for_gc()
+    assert not list((tmp_path / "skills").glob(".staging-*"))
+
+
+def test_update_rolls_back_when_any_skill_fails(http_root, tmp_path, monkeypatch, capsys):
+    root, base = http_root
+    entries = [make_artifact(root, s) for s in ("a", "b")]
+    index_url = publish(root, base, entries)
+    monkeypatch.chdir(tmp_path)
+    assert run_cli(monkeypatch, "--index-url", index_url, "install", "--all") == 0
+    before = (tmp_path / "skills-lock.json").read_text()
+
+    entries = [make_artifact(root, "a", "2.0.0"), make_artifact(root, "b", "2.0.0")]
+    entries[1]["sha256"] = "f" * 64
+    publish(root, base, entries)
+    assert run_cli(monkeypatch, "--index-url", index_url, "--max-age", "0", "update") == 1
+    assert "nothing changed" in capsys.readouterr().out
+    assert "1.0.0" in (tmp_path / "skills" / "a" / "run.py").read_text()
+    assert (tmp_path / "skills-lock.json").read_text() == before
+    assert not list((tmp_path / "skills").glob(".staging-*"))
+
+
+def test_update_rolls_back_swapped_trees(http_root, tmp_path, monkeypatch):
+    import client.update as upd
+    from client.lockfile import LockFile
+    from client.store import ArtifactStore
+
+    root, base = http_root
+    entries = [make_artifact(root, s) for s in ("a", "b")]
+    index_url = publish(root, base, entries)
+    monkeypatch.chdir(tmp_path)
+    assert run_cli(monkeypatch, "--index-url", index_url, "install", "--all") == 0
+
+    new = [make_artifact(root, "a", "2.0.0"), make_artifact(root, "b", "2.0.0")]
+    publish(root, base, new)
+    lock = LockFile(tmp_path / "skills-lock.json")
+    plan = upd.plan_updates(lock.list_installed(), json.loads((root / "index.json").read_text()))
+    real_swap = upd.swap_in
+
+    def flaky_swap(staged, target):
+        if staged.slug == "b":
+            raise OSError("disk full")
+        return real_swap(staged, target)
+
+    monkeypatch.setattr(upd, "swap_in", flaky_swap)
+    with pytest.raises(upd.UpdateError, match="rolled back"):
+        upd.apply_updates(plan, tmp_path / "skills", lock, ArtifactStore(tmp_path / "store"))
+    assert "1.0.0" in (tmp_path / "skills" / "a" / "run.py").read_text()
+    assert lock.list_installed()["a"]["version"] == "1.0.0"
+
+
+def test_update_fetches_only_changed_members(http_root, tmp_path, monkeypatch, capsys, write_skill):
+    pack_skill = importlib.machinery.SourceFileLoader(
+        "pack_skill", str(Path(__file__).resolve().parent.parent / "scripts" / "pack_skill.py")
+    ).load_module()
+    root, base = http_root
+    src = root / "src" / "big"
+    (src / "assets").mkdir(parents=True)
+
+    def release(version: str) -> None:
+        write_skill(src.parent, "big", version)
+        archive = pack_skill.pack(src)
+        manifest = pack_skill.manifest_path(archive)
+        publish(root, base, [{
+            "slug": "big", "name": "big", "version": version, "description": "d", "author": "a",
+            "sha256": pack_skill.checksum(archive),
+            "manifest_url": f"{base}/src/big.manifest.json",
+            "manifest_sha256": pack_skill.checksum(manifest),
+        }])
+        (root / "index.json").write_text(
+            (root / "index.json").read_text().replace(f"{base}/big.zip", f"{base}/src/big.zip")
+        )
+
+    for i in range(8):
+        (src / "assets" / f"a{i}.bin").write_bytes(bytes([i]) * 50_000)
+    (src / "run.py").write_text("print(1)\n")
+    (src / "old.txt").write_text("gone soon\n")
+    release("1.0.0")
+    index_url = f"{base}/index.json"
+    monkeypatch.chdir(tmp_path)
+    assert run_cli(monkeypatch, "--index-url", index_url, "install", "big") == 0
+    installed = tmp_path / "skills" / "big"
+    inode = (installed / "assets" / "a0.bin").stat().st_ino
+
+    (src / "run.py").write_text("print(2)\n")
+    (src / "old.txt").unlink()
+    release("1.1.0")
+    QuietHandler.requests = []
+    assert run_cli(monkeypatch, "--index-url", index_url, "--max-age", "0", "update") == 0
+
+    zip_requests = [r for r in QuietHandler.requests if r[0].endswith(".zip")]
+    assert len(zip_requests) == 2  # SKILL.md and run.py, each via one Range request
+    assert all(r[1] and r[1].startswith("bytes=") for r in zip_requests)
+    assert (installed / "run.py").read_text() == "print(2)\n"
+    assert not (installed / "old.txt").exists()
+    assert (installed / "assets" / "a0.bin").stat().st_ino == inode
+    assert SkillHubClient(tmp_path / "skills").get_skill("big").version == "1.1.0"
+
+
+def test_delta_requires_manifest_checksum(http_root, tmp_path, monkeypatch):
+    import client.remote as remote
+    from client.store import ArtifactStore
+
+    root, base = http_root
+    entry = make_artifact(root, "a")
+    publish(root, base, [entry])
+    (tmp_path / "skills" / "a").mkdir(parents=True)
+    entry["manifest_url"] = f"{base}/a.manifest.json"  # no manifest_sha256: never trusted
+
+    def no_delta(*args):
+        raise AssertionError("took the delta path with an unverifiable manifest")
+
+    monkeypatch.setattr(remote, "_stage_delta", no_delta)
+    staged = remote.stage_entry(entry, tmp_path / "skills", ArtifactStore(tmp_path / "store"))
+    assert (staged.tree / "SKILL.md").exists()
+    staged.cleanup()
+
+
+def test_sharded_index_fetches_only_needed_shards(http_root, tmp_path, monkeypatch):
+    root, base = http_root
+    entries = [make_artifact(root, slug) for slug in ("alpha", "apex", "beta", "gamma")]
+    entries[2]["tags"] = ["Fast"]
+    url = publish_sharded(root, base, entries)
+    cache = IndexCache(tmp_path / "cache")
+
+    remote = open_index(url, cache=cache)
+    assert remote.version == 2
+    assert remote.entry("apex")["slug"] == "apex"
+    assert remote.entry("apricot") is None
+    shard_requests = [p for p, _ in QuietHandler.requests if "/shards/" in p]
+    assert len(shard_requests) == 1  # "a" shard only
+    assert [e["slug"] for e in remote.tagged("fast")] == ["beta"]
+    assert [e["slug"] for e in remote.entries()] == ["alpha", "apex", "beta", "gamma"]
+
+    # shards are cached by content hash: a fresh reader needs only the root
+    QuietHandler.requests.clear()
+    again = open_index(url, cache=cache, max_age=0)
+    assert len(again.entries()) == 4
+    assert not [p for p, _ in QuietHandler.requests if "/shards/" in p]
+    assert len(open_index(url, cache=cache, offline=True).entries(["gamma"])) == 1
+
+    # the CLI installs from a sharded index like from a flat one
+    monkeypatch.chdir(tmp_path)
+    assert run_cli(monkeypatch, "--index-url", url, "install", "gamma") == 0
+    assert (tmp_path / "skills" / "gamma" / "SKILL.md").exists()
+
+
+def test_sharded_index_rejects_tampered_shard(http_root, tmp_path):
+    root, base = http_root
+    url = publish_sharded(root, base, [make_artifact(root, "a")])
+    for shard in (root / "index" / "shards").glob("*.json"):
+        shard.write_text(shard.read_text().replace('"a"', '"evil"'))
+    with pytest.raises(RemoteError, match="checksum"):
+        open_index(url, cache=IndexCache(tmp_path / "cache")).entries()
+
+
+def test_flat_index_through_open_index(http_root, tmp_path):
+    root, base = http_root
+    url = publish(root, base, [make_artifact(root, "a"), make_artifact(root, "b")])
+    remote = open_index(url, cache=IndexCache(tmp_path / "cache"))
+    assert remote.version == 1
+    assert remote.entry("b")["slug"] == "b"
+    assert [e["slug"] for e in remote.entries(["b", "zzz"])] == ["b"]
@@ -0,0 +1,126 @@
+import json
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from client.frontmatter import read_body
+from client.search import (
+    SearchIndex,
+    build_search_index,
+    index_documents,
+    search_index_url,
+    tokenize,
+    write_search_index,
+)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+DOCS = [
+    {"slug": "pr-reviewer", "name": "PR Reviewer", "version": "1.0.0",
+     "description": "Review GitHub pull requests", "tags": ["github", "code-review"]},
+    {"slug": "image-gen", "name": "Image Gen", "version": "0.2.0",
+     "description": "Generate images with Gemini", "tags": ["ai-image", "gemini"],
+     "body": "Mentions github once in the body."},
+    {"slug": "erp", "name": "ERP", "version": "0.1.0",
+     "description": "ERPNext reports and inventory", "tags": ["erp"], "body": "圖片 不支援"},
+]
+
+
+@pytest.fixture
+def index():
+    # round-trip through JSON, as the client loads it
+    return SearchIndex(json.loads(json.dumps(build_search_index(DOCS))))
+
+
+def test_tokenize():
+    assert tokenize("PR-Reviewer: v1.2 審查") == ["pr", "reviewer", "v1", "2", "審", "查"]
+
+
+def test_bm25_ranks_name_and_tag_hits_first(index):
+    hits = index.search("github")
+    assert [h.slug for h in hits] == ["pr-reviewer", "image-gen"]
+    assert hits[0].score > hits[1].score > 0
+    assert hits[0].version == "1.0.0"
+
+
+def test_tag_filter_and_tag_only(index):
+    assert [h.slug for h in index.search("github", tags=["gemini"])] == ["image-gen"]
+    assert [h.slug for h in index.search("", tags=["GitHub"])] == ["pr-reviewer"]
+    assert index.search("github", tags=["gemini", "erp"]) == []
+    assert index.search("") == []
+
+
+def test_prefix_and_cjk(index):
+    assert [h.slug for h in index.search("invent")] == ["erp"]
+    assert [h.slug for h in index.search("圖片")] == ["erp"]
+    assert index.search("nothing-like-this") == []
+    assert len(index.search("github image erp", limit=2)) == 2
+
+
+def test_pruned_search_matches_exhaustive_scoring():
+    rng = random.Random(7)
+    words = "alpha beta gamma delta epsilon zeta eta theta".split()
+    docs = [
+        {"slug": f"s{i:03d}", "name": rng.choice(words), "tags": rng.sample(words[:3], 1),
+         "description": " ".join(rng.choices(words, k=8)), "body": " ".join(rng.choices(words, k=30))}
+        for i in range(300)
+    ]
+    index = SearchIndex(build_search_index(docs))
+    for _ in range(50):
+        query = " ".join(rng.sample(words, rng.randint(1, 4)))
+        tags = rng.choice([[], ["alpha"]])
+        allowed = None if not tags else set(index.tags["alpha"])
+        scores = {}
+        for token in dict.fromkeys(tokenize(query)):
+            doc_id = 0
+            flat = index.terms[token]
+            for i in range(0, len(flat), 2):
+                doc_id += flat[i]
+                if allowed is None or doc_id in allowed:
+                    scores[doc_id] = scores.get(doc_id, 0) + flat[i + 1]
+        expected = sorted(scores, key=lambda d: (-scores[d], d))[:5]
+        assert [h.slug for h in index.search(query, tags, limit=5)] == [docs[d]["slug"] for d in expected]
+
+
+def test_rejects_unknown_version():
+    with pytest.raises(ValueError):
+        SearchIndex({"version": 99})
+
+
+def test_write_search_index_reads_bodies(tmp_path):
+    skills = tmp_path / "skills"
+    (skills / "erp").mkdir(parents=True)
+    (skills / "erp" / "SKILL.md").write_text("---\nname: erp\n---\nquarterly ledger\n", encoding="utf-8")
+    index_path = tmp_path / "index.json"
+    index_path.write_text(json.dumps({"version": 1, "skills": DOCS}), encoding="utf-8")
+    out = write_search_index(index_path, skills)
+    assert out == tmp_path / "search-index.json"
+    assert [h.slug for h in SearchIndex.load(out).search("ledger")] == ["erp"]
+    assert read_body(skills / "erp" / "SKILL.md") == "quarterly ledger\n"
+
+
+def test_checked_in_search_index_is_current():
+    path = REPO_ROOT / "search-index.json"
+    if not path.exists():
+        pytest.skip("search-index.json not found")
+    index = json.loads((REPO_ROOT / "index.json").read_text(encoding="utf-8"))
+    expected = build_search_index(index_documents(index, REPO_ROOT / "skills"))
+    assert json.loads(path.read_text(encoding="utf-8")) == expected
+
+
+def test_search_index_url():
+    assert search_index_url("https://h/x/index.json") == "https://h/x/search-index.json"
+
+
+def test_cli_search_falls_back_to_index(tmp_path):
+    index_path = tmp_path / "index.json"
+    index_path.write_text(json.dumps({"version": 1, "skills": DOCS}), encoding="utf-8")
+    proc = subprocess.run(
+        [sys.executable, "-m", "client.client", "--index-url", index_path.as_uri(),
+         "--cache-dir", str(tmp_path / "cache"), "search", "pull", "requests"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    assert proc.stdout.split()[0] == "pr-reviewer"
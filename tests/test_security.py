@@ -58,3 +58,47 @@ def test_path_traversal(tmp_path):
     for e in extracted:
         resolved = (extract_dir / Path(e)).resolve()
         assert str(resolved).startswith(str(extract_dir.resolve())), "Path traversal detected"
+
+
+def test_extract_skips_symlinks_and_keeps_exec_bits(tmp_path):
+    import stat
+
+    from client.extract import extract_zip
+
+    archive = tmp_path / "links.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        link = zipfile.ZipInfo("skill/evil")
+        link.create_system = 3
+        link.external_attr = (stat.S_IFLNK | 0o777) << 16
+        zf.writestr(link, "/etc/passwd")
+        exe = zipfile.ZipInfo("skill/bin/run.sh")
+        exe.create_system = 3
+        exe.external_attr = (stat.S_IFREG | 0o755) << 16
+        zf.writestr(exe, "#!/bin/sh\n")
+        zf.writestr("skill/a/b/c/data.txt", "x")
+    out = tmp_path / "out"
+    assert sorted(extract_zip(archive, out)) == ["skill/a/b/c/data.txt", "skill/bin/run.sh"]
+    assert not (out / "skill" / "evil").exists()
+    assert (out / "skill" / "bin" / "run.sh").stat().st_mode & 0o100
+    assert not (out / "skill" / "a" / "b" / "c" / "data.txt").stat().st_mode & 0o100
+
+
+def test_extract_refuses_zip_bombs(tmp_path):
+    from client.extract import UnsafeArchiveError, extract_zip
+
+    bomb = tmp_path / "bomb.zip"
+    with zipfile.ZipFile(bomb, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("skill/zeros.bin", b"\0" * (8 * 1024 * 1024))
+    with pytest.raises(UnsafeArchiveError, match="ratio"):
+        extract_zip(bomb, tmp_path / "out")
+    assert not (tmp_path / "out").exists()
+
+    many = tmp_path / "many.zip"
+    with zipfile.ZipFile(many, "w") as zf:
+        for i in range(20):
+            zf.writestr(f"skill/{i}.txt", b"x" * 100)
+    with pytest.raises(UnsafeArchiveError, match="members"):
+        extract_zip(many, tmp_path / "out", max_members=10)
+    with pytest.raises(UnsafeArchiveError, match="expands"):
+        extract_zip(many, tmp_path / "out", max_total=1000)
+    assert len(extract_zip(many, tmp_path / "out")) == 20
@@ -0,0 +1,159 @@
+import gzip
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from client.shards import write_shards  # noqa: E402
+import server.catalog  # noqa: E402
+from server.main import create_app  # noqa: E402
+from server.responses import choose_encoding, etag_matches  # noqa: E402
+
+
+@pytest.fixture
+def hub(tmp_path, write_skill):
+    skills = tmp_path / "skills"
+    for name in ("alpha", "beta", "delta", "gamma"):
+        # descriptions long enough for the listing to be compressed
+        write_skill(skills, name, description="d" * 200)
+    index = tmp_path / "index.json"
+    index.write_text(json.dumps({"skills": [{"name": "alpha"}]}), encoding="utf-8")
+    app = create_app(skills, index)
+    with TestClient(app) as client:
+        yield client, app.state.hub, skills, index
+
+
+def test_list_etag_and_304(hub):
+    client, _, _, _ = hub
+    r = client.get("/skills/")
+    assert r.status_code == 200
+    assert [s["name"] for s in r.json()["skills"]] == ["alpha", "beta", "delta", "gamma"]
+    etag = r.headers["etag"]
+    assert etag.startswith('"') and r.headers["vary"] == "Accept-Encoding"
+
+    again = client.get("/skills/", headers={"If-None-Match": f'W/{etag}, "other"'})
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["etag"] == etag
+
+
+def test_gzip_is_precomputed(hub):
+    client, _, _, _ = hub
+    r = client.get("/skills/", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    raw = client.get("/skills/", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in raw.headers
+    assert r.json() == raw.json()
+    # each content-coding is a distinct representation with its own strong ETag
+    assert r.headers["etag"] != raw.headers["etag"]
+    assert r.headers["etag"].endswith('-gz"')
+    assert client.get(
+        "/skills/", headers={"Accept-Encoding": "gzip", "If-None-Match": r.headers["etag"]}
+    ).status_code == 304
+    assert client.get(
+        "/skills/", headers={"Accept-Encoding": "identity", "If-None-Match": r.headers["etag"]}
+    ).status_code == 200
+
+
+def test_pagination_and_fields(hub):
+    client, _, _, _ = hub
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, "fields": "name,version"}
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/skills/", params=params).json()
+        assert all(set(s) == {"name", "version"} for s in body["skills"])
+        seen += [s["name"] for s in body["skills"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == ["alpha", "beta", "delta", "gamma"]
+
+    assert client.get("/skills/", params={"fields": "name,bogus"}).status_code == 400
+    assert client.get("/skills/", params={"cursor": "!!!"}).status_code == 400
+    assert client.get("/skills/", params={"limit": 0}).status_code == 422
+
+
+def test_get_skill_and_404(hub):
+    client, _, _, _ = hub
+    assert client.get("/skills/beta").json()["name"] == "beta"
+    assert client.get("/skills/missing").status_code == 404
+
+
+def test_index_json_served_verbatim_and_reloaded(hub):
+    client, _, _, index = hub
+    r = client.get("/index.json")
+    assert r.content == index.read_bytes()
+    index.write_text(json.dumps({"skills": [{"name": "alpha"}, {"name": "beta"}]}), encoding="utf-8")
+    st = os.stat(index)
+    os.utime(index, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    r2 = client.get("/index.json", headers={"If-None-Match": r.headers["etag"]})
+    assert r2.status_code == 200 and len(r2.json()["skills"]) == 2
+
+
+def test_v2_index_and_search_index_mirrored(hub):
+    client, _, _, index = hub
+    assert client.get("/index/root.json").status_code == 404
+    index.write_text(json.dumps({"skills": [{"slug": "alpha", "tags": ["x"]}]}), encoding="utf-8")
+    search = index.with_name("search-index.json")
+    search.write_text('{"version": 1}', encoding="utf-8")
+    write_shards(index, index.parent / "index", search_index=search)
+
+    root = client.get("/index/root.json").json()
+    assert root["search_index"] == "../search-index.json"
+    shard = client.get(f"/index/{root['shards']['a']['path']}")
+    assert shard.status_code == 200 and shard.json()["skills"][0]["slug"] == "alpha"
+    assert client.get("/search-index.json").content == search.read_bytes()
+    assert client.get("/index/shards/..%2Froot.json").status_code == 404
+
+
+def test_catalog_follows_registry(hub, write_skill):
+    client, state, skills, _ = hub
+    etag = client.get("/skills/").headers["etag"]
+    generation = state.registry.generation
+    write_skill(skills, "epsilon")
+    state.registry.refresh()
+    assert state.registry.generation > generation
+    r = client.get("/skills/", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert "epsilon" in [s["name"] for s in r.json()["skills"]]
+
+
+def test_negotiation_helpers():
+    available = {"gzip": gzip.compress(b"x"), "br": b"y"}
+    assert choose_encoding("gzip, br", available) == "br"
+    assert choose_encoding("br;q=0, gzip", available) == "gzip"
+    assert choose_encoding("identity", available) is None
+    assert choose_encoding("*", {"gzip": b""}) == "gzip"
+    assert etag_matches("*", '"x"')
+    assert not etag_matches('"y"', '"x"')
+
+
+def test_rebuild_does_not_block_other_requests(hub, monkeypatch):
+    client, _, _, _ = hub
+    started, release = threading.Event(), threading.Event()
+    real = server.catalog.Catalog
+
+    class SlowCatalog(real):
+        def __init__(self, snapshot):
+            started.set()
+            release.wait(10)
+            super().__init__(snapshot)
+
+    monkeypatch.setattr(server.catalog, "Catalog", SlowCatalog)
+    with ThreadPoolExecutor(2) as pool:
+        listing = pool.submit(client.get, "/skills/")
+        try:
+            assert started.wait(5)
+            index = pool.submit(client.get, "/index.json")
+            assert index.result(timeout=5).status_code == 200
+            assert not listing.done()
+        finally:
+            release.set()
+        assert listing.result(timeout=10).status_code == 200
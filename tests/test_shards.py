@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from client.search import search_index_path
+from client.shards import ShardError, build_shards, parse_shard, shard_key, write_shards
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_shard_key():
+    assert shard_key("PR-reviewer") == "p"
+    assert shard_key("pr-reviewer", 3) == "pr_"
+    assert shard_key("") == "_"
+
+
+def test_build_shards_is_deterministic_and_complete():
+    index = {"version": 1, "updated_at": "t", "skills": [
+        {"slug": "beta", "tags": ["x"]}, {"slug": "alpha", "tags": ["X", "y"]}, {"slug": "able"},
+    ]}
+    root, files = build_shards(index)
+    assert root["count"] == 3 and sorted(root["shards"]) == ["a", "b"]
+    assert root["tags"] == {"x": ["a", "b"], "y": ["a"]}
+    shard = root["shards"]["a"]
+    assert [e["slug"] for e in parse_shard(files[shard["path"]], shard["sha256"])] == ["able", "alpha"]
+    assert build_shards(index) == (root, files)
+    with pytest.raises(ShardError):
+        parse_shard(files[shard["path"]] + b" ", shard["sha256"])
+
+
+def test_write_shards_prunes_stale(tmp_path):
+    index_path = tmp_path / "index.json"
+    index_path.write_text(json.dumps({"version": 1, "skills": [{"slug": "a", "version": "1"}]}))
+    old_root = write_shards(index_path, tmp_path / "index")
+    index_path.write_text(json.dumps({"version": 1, "skills": [{"slug": "a", "version": "2"}]}))
+    with open(old_root, "rb") as reader:
+        root_path = write_shards(index_path, tmp_path / "index")
+        # the root is renamed into place, never rewritten under an open reader
+        assert json.loads(reader.read())["shards"] != json.loads(root_path.read_text())["shards"]
+    root = json.loads(root_path.read_text())
+    assert [p.name for p in (tmp_path / "index" / "shards").iterdir()] == [
+        Path(root["shards"]["a"]["path"]).name
+    ]
+    assert sorted(p.name for p in (tmp_path / "index").iterdir()) == ["root.json", "shards"]
+
+
+def test_checked_in_shards_are_current():
+    root_path = REPO_ROOT / "index" / "root.json"
+    if not root_path.exists():
+        pytest.skip("index/root.json not found")
+    index = json.loads((REPO_ROOT / "index.json").read_text(encoding="utf-8"))
+    root = json.loads(root_path.read_text(encoding="utf-8"))
+    expected, files = build_shards(index, root["prefix_len"])
+    expected["search_index"] = "../" + search_index_path(REPO_ROOT / "index.json").name
+    assert root == expected
+    for rel, body in files.items():
+        assert (REPO_ROOT / "index" / rel).read_bytes() == body
@@ -0,0 +1,48 @@
+"""Startup budget: the CLI must not pull heavy modules it does not need."""
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# never needed to print help or list local skills
+NETWORK_AND_ARCHIVES = {
+    "urllib.request", "http.client", "zipfile", "tarfile", "ctypes", "sqlite3",
+    "concurrent.futures", "client.remote", "client.extract", "client.store", "client.swap",
+}
+
+
+def _importtime(*args: str, cwd: Path) -> set[str]:
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True,
+    )
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in proc.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+def imported_modules(*argv: str, cwd: Path) -> set[str]:
+    """Modules the CLI imports beyond what the bare interpreter loads (site, .pth hooks)."""
+    baseline = _importtime("-c", "pass", cwd=cwd)
+    return _importtime("-m", "client.client", *argv, cwd=cwd) - baseline
+
+
+def test_help_imports_nothing_heavy(tmp_path):
+    mods = imported_modules("--help", cwd=tmp_path)
+    assert not mods & (NETWORK_AND_ARCHIVES | {"pydantic", "yaml", "client.models"})
+
+
+def test_warm_list_skips_yaml_and_network(tmp_path):
+    shutil.copytree(REPO_ROOT / "skills", tmp_path / "skills")
+    cold = imported_modules("list", cwd=tmp_path)
+    assert "yaml" in cold
+    assert not cold & (NETWORK_AND_ARCHIVES | {"pydantic", "client.models"})
+    warm = imported_modules("list", cwd=tmp_path)
+    assert not warm & (NETWORK_AND_ARCHIVES | {"yaml", "pydantic", "client.models"})
@@ -0,0 +1,42 @@
+import hashlib
+import os
+
+import pytest
+
+from client.store import ArtifactStore
+
+
+def _put(store, tmp_path, data: bytes) -> str:
+    sha = hashlib.sha256(data).hexdigest()
+    src = tmp_path / f"src-{sha[:8]}"
+    src.write_bytes(data)
+    store.put(sha, src)
+    return sha
+
+
+def test_store_put_get(tmp_path):
+    store = ArtifactStore(tmp_path / "store")
+    sha = _put(store, tmp_path, b"hello")
+    blob = store.get(sha)
+    assert blob is not None and blob.read_bytes() == b"hello"
+    assert store.get("0" * 64) is None
+    with pytest.raises(ValueError):
+        store.get("../../etc/passwd")
+    st = store.stats()
+    assert (st.count, st.total_bytes) == (1, 5)
+
+
+def test_store_lru_eviction(tmp_path):
+    store = ArtifactStore(tmp_path / "store", max_bytes=25)
+    a = _put(store, tmp_path, b"a" * 10)
+    b = _put(store, tmp_path, b"b" * 10)
+    os.utime(store.get(a), (1, 1))
+    os.utime(store.get(b), (2, 2))
+    store.get(a)  # a is now the most recently used
+    c = _put(store, tmp_path, b"c" * 10)
+    assert store.get(b) is None
+    assert store.get(a) is not None and store.get(c) is not None
+
+    evicted = store.gc(max_bytes=0)
+    assert len(evicted) == 2
+    assert store.stats().count == 0
@@ -0,0 +1,78 @@
+import os
+import threading
+import time
+
+import pytest
+
+from client.swap import exchange, swap_dir, sweep_stale, wait_for_gc
+
+
+def _tree(path, text):
+    path.mkdir(parents=True)
+    (path / "SKILL.md").write_text(text, encoding="utf-8")
+    return path
+
+
+def test_swap_dir_never_leaves_a_gap(tmp_path):
+    target = _tree(tmp_path / "skill", "v0")
+    stop = threading.Event()
+    seen = []
+
+    def reader():
+        while not stop.is_set():
+            try:
+                seen.append((target / "SKILL.md").read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                seen.append(None)
+
+    t = threading.Thread(target=reader)
+    t.start()
+    try:
+        for i in range(1, 50):
+            new = _tree(tmp_path / f"new{i}", f"v{i}")
+            backup = swap_dir(new, target, tmp_path / f"old{i}")
+            assert backup is not None and (backup / "SKILL.md").read_text() == f"v{i - 1}"
+    finally:
+        stop.set()
+        t.join()
+    assert (target / "SKILL.md").read_text() == "v49"
+    if exchange(_tree(tmp_path / "pa", "a"), _tree(tmp_path / "pb", "b")):
+        # with RENAME_EXCHANGE the path is never missing; the rename fallback may blink
+        assert None not in seen
+
+
+def test_swap_dir_fresh_target(tmp_path):
+    new = _tree(tmp_path / "new", "v1")
+    assert swap_dir(new, tmp_path / "skill", tmp_path / "old") is None
+    assert (tmp_path / "skill" / "SKILL.md").read_text() == "v1"
+
+
+def test_installer_swaps_and_rolls_back(tmp_path, monkeypatch):
+    from client.installer import SkillInstaller
+    from client.lockfile import LockFile
+    from client.models import Skill
+
+    skill = Skill(name="s", version="1.0.0", description="d", author="a", entrypoint="SKILL.md")
+    installer = SkillInstaller(target_dir=tmp_path / "skills", lockfile_path=tmp_path / "lock.json")
+    dest = installer.install(skill, _tree(tmp_path / "v1", "v1"))
+
+    def boom(self, skill):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(LockFile, "add", boom)
+    with pytest.raises(OSError):
+        installer.install(skill, _tree(tmp_path / "v2", "v2"))
+    assert (dest / "SKILL.md").read_text() == "v1"
+    wait_for_gc()
+    assert [p.name for p in (tmp_path / "skills").iterdir()] == ["s"]
+
+
+def test_sweep_stale_removes_only_old_staging_dirs(tmp_path):
+    old = _tree(tmp_path / ".staging-a-1", "x")
+    fresh = _tree(tmp_path / ".staging-b-2", "x")
+    keep = _tree(tmp_path / "a", "x")
+    past = time.time() - 7200
+    os.utime(old, (past, past))
+    os.utime(keep, (past, past))
+    sweep_stale(tmp_path)
+    assert not old.exists() and fresh.exists() and keep.exists()